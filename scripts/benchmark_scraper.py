@@ -0,0 +1,119 @@
+import argparse
+import resource
+import sys
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import numpy as np
+import google_play_scraper.features.reviews as gps_reviews
+
+from src.task_1.async_scraper import AsyncScraper
+from src.task_1.scraper import Scraper
+from src.utils.playstore_stub import PlayStoreStub
+
+# --------------------------------
+# Scraper throughput benchmark against the local Play Store stand-in
+# --------------------------------
+
+
+class BenchConfig:
+    def __init__(self, num_apps):
+        """Config stand-in with num_apps synthetic apps."""
+        self.app_ids = {f"Bench Bank {i}": f"com.bench.app{i}" for i in range(num_apps)}
+
+    def get_app_ids(self):
+        return self.app_ids
+
+
+class TimedAsyncScraper(AsyncScraper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.page_latencies = []
+
+    async def fetch_page(self, *args, **kwargs):
+        start = time.perf_counter()
+        result = await super().fetch_page(*args, **kwargs)
+        self.page_latencies.append(time.perf_counter() - start)
+        return result
+
+
+def run_sequential(stub, config, num_reviews):
+    latencies = []
+    fetch = gps_reviews._fetch_review_items
+
+    def timed_fetch(*args, **kwargs):
+        start = time.perf_counter()
+        result = fetch(*args, **kwargs)
+        latencies.append(time.perf_counter() - start)
+        return result
+
+    scraper = Scraper(config)
+    with stub.redirect_google_play_scraper(), patch.object(gps_reviews, '_fetch_review_items', timed_fetch):
+        df = scraper.scrape_all_banks(num_reviews=num_reviews)
+    return df, latencies
+
+
+def run_concurrent(stub, config, num_reviews, args):
+    scraper = TimedAsyncScraper(
+        config, base_url=stub.url, page_size=args.page_size, max_connections=args.connections,
+        rate_per_host=args.rate, backoff=0.05
+    )
+    df = scraper.scrape_all_banks(num_reviews=num_reviews)
+    return df, scraper.page_latencies
+
+
+def measure(name, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    df, latencies = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p99 = np.percentile(latencies, 99) * 1000 if latencies else float('nan')
+    return {
+        'mode': name,
+        'reviews': len(df),
+        'seconds': round(elapsed, 2),
+        'reviews_per_sec': round(len(df) / elapsed, 1) if elapsed else 0.0,
+        'pages': len(latencies),
+        'p99_page_ms': round(p99, 1),
+        'peak_python_mb': round(peak / 2 ** 20, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs concurrent scraping offline.")
+    parser.add_argument('--apps', type=int, default=3)
+    parser.add_argument('--reviews', type=int, default=2000, help="reviews per app and language")
+    parser.add_argument('--corpus-size', type=int, default=1000000, help="reviews per app and language on the stub")
+    parser.add_argument('--latency', type=float, default=0.05, help="server latency per page in seconds")
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--page-size', type=int, default=200)
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--rate', type=float, default=0.0, help="per-host requests/sec for the concurrent path, 0 = unlimited")
+    parser.add_argument('--mode', choices=['both', 'sequential', 'concurrent'], default='both')
+    args = parser.parse_args(argv)
+
+    config = BenchConfig(args.apps)
+    results = []
+    with PlayStoreStub(corpus_size=args.corpus_size, latency=args.latency, latency_jitter=args.jitter,
+                       error_rate=args.error_rate, max_page_size=args.page_size) as stub:
+        if args.mode in ('both', 'sequential'):
+            results.append(measure('sequential', lambda: run_sequential(stub, config, args.reviews)))
+        if args.mode in ('both', 'concurrent'):
+            results.append(measure('concurrent', lambda: run_concurrent(stub, config, args.reviews, args)))
+
+    print("\n--- Scraper benchmark ---\n")
+    for result in results:
+        print(result)
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    divisor = 2 ** 20 if sys.platform == 'darwin' else 2 ** 10
+    print(f"Process peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor:.1f} MB")
+    return results
+
+
+if __name__ == "__main__":
+    main()
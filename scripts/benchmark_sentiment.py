@@ -0,0 +1,80 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from transformers import pipeline
+
+from src.task_2.sentiment_analyzer import MODEL_NAME, SentimentAnalyzer, sentiment_labels
+
+# --------------------------------
+# English sentiment benchmark: legacy per-row pipeline calls vs length-bucketed batches
+# --------------------------------
+
+PHRASES = [
+    "Great app, very helpful!", "Bad service, not happy.", "Good but could be better.",
+    "The app keeps crashing every time I try to transfer money to another bank account.",
+    "OTP not received", "Best banking app in Ethiopia, fast and easy to use for bills and airtime.",
+    "Can't login since the last update, please fix it as soon as possible.", "ok",
+]
+
+
+def legacy_score(sentiment_pipeline, texts):
+    """Per-row scoring of the original sentiment_analysis, kept for comparison.
+
+    The original also passed clean_up_tokenization_spaces=False, which current tokenizers reject.
+    """
+    def get_sentiment(text):
+        if not text or pd.isna(text) or text.strip() == '':
+            return {'label': 'neutral', 'score': 0.0}
+        try:
+            result = sentiment_pipeline(text[:512])[0]
+            score = result['score'] if result['label'] == 'POSITIVE' else -result['score']
+            label = 'positive' if score > 0.1 else 'negative' if score < -0.1 else 'neutral'
+            return {'label': label, 'score': score}
+        except Exception as e:
+            print(f"Sentiment error for English text '{text[:50]}...': {e}")
+            return {'label': 'neutral', 'score': 0.0}
+
+    results = pd.Series(texts).apply(get_sentiment)
+    return results.apply(lambda x: x['score']).to_numpy(dtype=np.float64)
+
+
+def make_english_reviews(n, seed=0):
+    """Synthetic English reviews of mixed lengths."""
+    rng = np.random.default_rng(seed)
+    phrases = np.array(PHRASES, dtype=object)
+    repeats = rng.integers(1, 4, n)
+    return np.array([' '.join([phrase] * r) for phrase, r in zip(phrases[rng.integers(0, len(phrases), n)], repeats)],
+                    dtype=object)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark per-row vs batched English sentiment scoring.")
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--model', default=MODEL_NAME, help="model name or local directory")
+    args = parser.parse_args(argv)
+
+    texts = make_english_reviews(args.rows)
+    analyzer = SentimentAnalyzer(batch_size=args.batch_size,
+                                 sentiment_pipeline=pipeline("sentiment-analysis", model=args.model, device=-1))
+
+    start = time.perf_counter()
+    legacy = legacy_score(analyzer.sentiment_pipeline, texts)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = analyzer.score_english(texts)
+    batched_seconds = time.perf_counter() - start
+
+    agreement = (sentiment_labels(legacy) == sentiment_labels(batched)).mean()
+    print(f"\n--- English sentiment benchmark ({args.rows} reviews, batch size {args.batch_size}) ---\n")
+    print(f"per-row: {legacy_seconds:.2f}s ({args.rows / legacy_seconds:.0f} reviews/s)")
+    print(f"batched: {batched_seconds:.2f}s ({args.rows / batched_seconds:.0f} reviews/s, "
+          f"{legacy_seconds / batched_seconds:.1f}x faster)")
+    print(f"Max score difference: {np.abs(legacy - batched).max():.2e}, label agreement: {agreement:.2%}")
+
+
+if __name__ == "__main__":
+    main()
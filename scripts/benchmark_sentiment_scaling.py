@@ -0,0 +1,67 @@
+import argparse
+import os
+import time
+
+from scripts.benchmark_sentiment import make_english_reviews
+from src.task_2.inference_backends import load_backend
+from src.task_2.sentiment_analyzer import MODEL_NAME, SentimentAnalyzer
+
+# --------------------------------
+# Sharded sentiment scaling benchmark: workers x torch threads per worker
+# --------------------------------
+
+
+def default_configs(cores):
+    """Worker/thread splits that use every core, from one wide process to one thread per process."""
+    configs = []
+    workers = 1
+    while workers <= cores:
+        configs.append((workers, max(1, cores // workers)))
+        workers *= 2
+    return configs
+
+
+def parse_configs(text):
+    """Parse 'WxT,WxT,...' into (workers, threads) pairs."""
+    return [tuple(int(part) for part in item.split('x')) for item in text.split(',') if item]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find the fastest workers x threads split for sentiment scoring.")
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--configs', default=None, help="e.g. 1x64,4x16,16x4,64x1 (default: powers of two over all cores)")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--shard-size', type=int, default=500)
+    parser.add_argument('--backend', choices=['torch', 'onnx'], default='torch')
+    parser.add_argument('--model', default=None, help="model name/directory (default: the hub model or models/onnx/...)")
+    args = parser.parse_args(argv)
+
+    source = args.model or (MODEL_NAME if args.backend == 'torch' else 'models/onnx/distilbert-sst2-int8')
+    cores = os.cpu_count() or 1
+    configs = parse_configs(args.configs) if args.configs else default_configs(cores)
+    # Distinct texts, so neither deduplication nor a cache hides model cost
+    texts = make_english_reviews(args.rows) + ' ' + [str(i) for i in range(args.rows)]
+
+    results = []
+    for workers, threads in configs:
+        backend = load_backend((args.backend, source), threads)
+        analyzer = SentimentAnalyzer(batch_size=args.batch_size, backend=backend, workers=workers,
+                                     threads_per_worker=threads, shard_size=args.shard_size)
+        start = time.perf_counter()
+        analyzer.score_english(texts)
+        seconds = time.perf_counter() - start
+        results.append({'workers': workers, 'threads': threads, 'seconds': round(seconds, 2),
+                        'reviews_per_sec': round(args.rows / seconds, 1)})
+        print(results[-1])
+
+    best = max(results, key=lambda result: result['reviews_per_sec'])
+    print(f"\n--- Sentiment scaling ({args.rows} reviews, {args.backend}, {cores} cores) ---\n")
+    for result in results:
+        print(result)
+    print(f"Fastest: --workers {best['workers']} --threads {best['threads']} "
+          f"({best['reviews_per_sec']} reviews/s, includes worker start-up and model loading)")
+    return results
+
+
+if __name__ == "__main__":
+    main()
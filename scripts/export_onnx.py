@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from transformers import pipeline
+
+from scripts.benchmark_sentiment import make_english_reviews
+from src.task_2.inference_backends import OnnxBackend, TorchBackend, accuracy_drift, export_onnx
+from src.task_2.sentiment_analyzer import MODEL_NAME, SentimentAnalyzer
+
+# --------------------------------
+# Export the sentiment model to quantized ONNX and check it against PyTorch
+# --------------------------------
+
+
+def load_held_out(path, rows, labels_column, seed=0):
+    """English reviews (and optional reference labels) to compare the backends on."""
+    if path and os.path.exists(path):
+        df = pd.read_csv(path, encoding='utf-8')
+        if 'language' in df.columns:
+            df = df[df['language'] == 'english']
+        df = df.sample(n=min(rows, len(df)), random_state=seed)
+        labels = df[labels_column].to_numpy(dtype=object) if labels_column else None
+        return df['review'].fillna('').astype(str).to_numpy(dtype=object), labels
+    print(f"No held-out file at {path}; using synthetic reviews.")
+    return make_english_reviews(rows, seed), None
+
+
+def timed_scores(analyzer, texts):
+    start = time.perf_counter()
+    analyzer.score_english(texts)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the sentiment model to ONNX and check accuracy drift.")
+    parser.add_argument('--model', default=MODEL_NAME, help="model name or local directory")
+    parser.add_argument('--output', default='models/onnx/distilbert-sst2-int8')
+    parser.add_argument('--no-quantize', action='store_true')
+    parser.add_argument('--held-out', default='data/processed/bank_reviews_cleaned.csv')
+    parser.add_argument('--labels-column', default=None, help="reference labels in the held-out file")
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--min-agreement', type=float, default=0.97)
+    args = parser.parse_args(argv)
+
+    torch_backend = TorchBackend(pipeline("sentiment-analysis", model=args.model, device=-1))
+    export_onnx(torch_backend.pipeline, args.output, quantize=not args.no_quantize)
+    reference = SentimentAnalyzer(backend=torch_backend)
+    candidate = SentimentAnalyzer(backend=OnnxBackend(args.output))
+
+    texts, labels = load_held_out(args.held_out, args.rows, args.labels_column)
+    report = accuracy_drift(reference, candidate, texts, labels)
+    report['torch_seconds'] = round(timed_scores(reference, texts), 2)
+    report['onnx_seconds'] = round(timed_scores(candidate, texts), 2)
+
+    print("\n--- ONNX accuracy drift ---\n")
+    for key, value in report.items():
+        print(f"{key}: {value}")
+    print(f"Speedup: {report['torch_seconds'] / max(report['onnx_seconds'], 1e-9):.1f}x")
+
+    if report['label_agreement'] < args.min_agreement:
+        print(f"Error: label agreement {report['label_agreement']:.2%} is below {args.min_agreement:.0%}.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
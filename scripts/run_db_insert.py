@@ -19,12 +19,18 @@ DB_PORT = 5432
 if __name__ == "__main__":
     print("\n--- Starting Database Insert ---\n")
 
-    # Load cleaned reviews
-    df = pd.read_csv("data/processed/bank_reviews_cleaned.csv")
-    print(f"Loaded {len(df)} cleaned reviews.")
-
-    # Initialize DatabaseManager
-    db_manager = DatabaseManager(DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT)
+    # Load scored reviews (with sentiment and, after run_theme_analysis, themes), else the cleaned reviews
+    input_path = "data/processed/sentiment_results.csv"
+    if not os.path.exists(input_path):
+        input_path = "data/processed/bank_reviews_cleaned.csv"
+    df = pd.read_csv(input_path)
+    print(f"Loaded {len(df)} reviews from {input_path}.")
+
+    # Initialize DatabaseManager: PostgreSQL, or an embedded SQLite file with --sqlite PATH (no server needed)
+    if '--sqlite' in sys.argv:
+        db_manager = DatabaseManager.sqlite(sys.argv[sys.argv.index('--sqlite') + 1])
+    else:
+        db_manager = DatabaseManager(DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT)
 
     # Create tables
     db_manager.create_tables()
@@ -32,9 +38,12 @@ if __name__ == "__main__":
     # Insert banks
     bank_id_map = db_manager.insert_banks(df['bank'].unique())
 
-    # Insert reviews
+    # Merge reviews on their natural key (safe to re-run: only new or changed rows are written)
     db_manager.insert_reviews(df, bank_id_map)
 
+    # Per-bank summary, aggregated in the database
+    print(db_manager.sentiment_summary().to_string(index=False))
+
     # Close connection
     db_manager.close()
 
@@ -1,5 +1,9 @@
+import sys
 from src.utils.data_handler import DataHandler
+from src.utils.raw_archive import RawArchive
+from src.utils.language_detector import LanguageDetector
 from src.task_1.preprocessor import Preprocessor
+from src.task_1.near_duplicates import NearDuplicateDetector
 
 # --------------------------------
 # Main section to run preprocessor
@@ -9,9 +13,17 @@ if __name__ == "__main__":
     print("\n--- Running Preprocessor ---\n")
 
     data_handler = DataHandler()
-    preprocessor = Preprocessor(data_handler)
+    # Persistent language cache shared with the sentiment stage (--workers N detects in N processes)
+    workers = int(sys.argv[sys.argv.index('--workers') + 1]) if '--workers' in sys.argv else 1
+    # --near-duplicates flag|collapse groups near-identical reviews (MinHash-LSH) before language detection
+    mode = sys.argv[sys.argv.index('--near-duplicates') + 1] if '--near-duplicates' in sys.argv else None
+    near_duplicates = NearDuplicateDetector(mode=mode) if mode else None
+    preprocessor = Preprocessor(data_handler, LanguageDetector(workers=workers), near_duplicates)
 
-    # Run Preprocessor main()
-    preprocessor.main()
+    # Run Preprocessor main() (--replay reads data/raw/archive instead of the raw CSVs,
+    # --memory-budget MB streams the inputs in chunks that fit the budget)
+    archive = RawArchive() if '--replay' in sys.argv else None
+    budget = float(sys.argv[sys.argv.index('--memory-budget') + 1]) if '--memory-budget' in sys.argv else None
+    preprocessor.main(archive=archive, memory_budget_mb=budget)
 
     print("\n--- Preprocessing completed ---\n")
@@ -0,0 +1,32 @@
+import asyncio
+import sys
+from src.task_2.sentiment_analyzer import SentimentAnalyzer
+from src.task_2.scoring_server import ScoringServer, ScoringService
+from src.utils.language_detector import LanguageDetector
+from src.utils.sentiment_cache import SentimentCache
+
+# --------------------------------
+# Long-running online sentiment scoring server
+# --------------------------------
+
+if __name__ == "__main__":
+    print("\n--- Starting sentiment scoring server ---\n")
+
+    def flag(name, default):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    # --backend onnx serves the int8 model exported by `python -m scripts.export_onnx`
+    backend = None
+    if flag('--backend', 'torch') == 'onnx':
+        from src.task_2.inference_backends import OnnxBackend
+        backend = OnnxBackend()
+    analyzer = SentimentAnalyzer(LanguageDetector(), sentiment_cache=SentimentCache(), backend=backend)
+
+    # --max-batch N --max-wait-ms MS: English requests arriving within MS milliseconds share one model batch
+    service = ScoringService(analyzer, max_batch_size=int(flag('--max-batch', 32)),
+                             max_wait_ms=float(flag('--max-wait-ms', 5)))
+    server = ScoringServer(service, host=flag('--host', '127.0.0.1'), port=int(flag('--port', 8000)))
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\n--- Scoring server stopped ---\n")
@@ -1,5 +1,9 @@
+import sys
 from src.utils.config import Config
 from src.task_1.scraper import Scraper
+from src.task_1.async_scraper import AsyncScraper
+from src.utils.watermark_store import WatermarkStore
+from src.utils.raw_archive import RawArchive
 
 # ------------------------
 # Main section to run scraper
@@ -11,14 +15,33 @@ if __name__ == "__main__":
     # Load config
     config = Config()
     
-    # Initialize scraper
-    scraper = Scraper(config)
-    
-    # Scrape all banks
-    df = scraper.scrape_all_banks(num_reviews=400)
+    # Every run appends its full raw payloads to one new archive segment
+    archive = RawArchive()
+
+    # Initialize scraper (--concurrent fetches every app/language stream at once)
+    if '--concurrent' in sys.argv:
+        scraper = AsyncScraper(config, archive=archive)
+    else:
+        scraper = Scraper(config, archive=archive)
     
-    # Save raw data
-    scraper.save_raw_data(df)
+    if '--incremental' in sys.argv:
+        # Delta scrape: only reviews newer than the saved watermarks, merged into the raw CSVs.
+        # --max-reviews caps each app/language stream per run (default 2000), so a first run backfills
+        # the history over several runs instead of paging through all of it at once.
+        max_reviews = int(sys.argv[sys.argv.index('--max-reviews') + 1]) if '--max-reviews' in sys.argv else 2000
+        store = WatermarkStore()
+        # A failed fetch raises here, before anything is committed
+        df = scraper.scrape_all_banks_incremental(store, max_reviews=max_reviews)
+        scraper.save_raw_data(df, merge=True)
+        # Only after the reviews are on disk do the watermarks advance
+        store.commit()
+    else:
+        # Scrape all banks
+        df = scraper.scrape_all_banks(num_reviews=400)
+
+        # Save raw data
+        scraper.save_raw_data(df)
+    archive.close()
     
     # EXTRA: display rows/columns per bank
     for bank in df['bank'].unique():
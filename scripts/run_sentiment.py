@@ -1,9 +1,27 @@
+import sys
 from src.task_2.sentiment_analyzer import SentimentAnalyzer
+from src.utils.language_detector import LanguageDetector
+from src.task_2.heavy_hitters import HeavyHitterSketches
+from src.task_2.sentiment_rollup import SentimentRollup
+from src.utils.sentiment_cache import SentimentCache
 
 def main():
     """Run the sentiment analysis pipeline."""
     print("Starting sentiment analysis process...")
-    analyzer = SentimentAnalyzer()
+    # --backend onnx scores with the int8 model written by `python -m scripts.export_onnx`
+    backend = None
+    if '--backend' in sys.argv and sys.argv[sys.argv.index('--backend') + 1] == 'onnx':
+        from src.task_2.inference_backends import OnnxBackend
+        backend = OnnxBackend()
+    # Scores persist in data/cache/sentiment_cache.sqlite, so reruns only score new review texts
+    # --workers N --threads T scores English reviews in N processes with T torch threads each
+    workers = int(sys.argv[sys.argv.index('--workers') + 1]) if '--workers' in sys.argv else 1
+    threads = int(sys.argv[sys.argv.index('--threads') + 1]) if '--threads' in sys.argv else None
+    # Aggregates and trends read the cube in data/cache/sentiment_rollup.sqlite, extended with each run's new reviews;
+    # new reviews also feed the n-gram sketches in data/cache/heavy_hitters.npz (query: python -m scripts.top_ngrams)
+    analyzer = SentimentAnalyzer(LanguageDetector(), sentiment_cache=SentimentCache(), backend=backend,
+                                 workers=workers, threads_per_worker=threads, rollup=SentimentRollup(),
+                                 heavy_hitters=HeavyHitterSketches())
     success = analyzer.main()
     if success:
         print("Process completed successfully.")
@@ -1,3 +1,4 @@
+import sys
 from src.task_2.theme_analyzer import ThemeAnalyzer
 
 # --------------------------------
@@ -8,6 +9,10 @@ if __name__ == "__main__":
     print("\n--- Running ThemeAnalyzer ---\n")
 
     analyzer = ThemeAnalyzer()
-    analyzer.run_pipeline()
+    # --streaming reads reviews in chunks into a fixed-size hashed feature space (for very large corpora)
+    # --discover N clusters reviews into N data-driven themes (TF-IDF -> LSA -> MiniBatchKMeans)
+    discover = int(sys.argv[sys.argv.index('--discover') + 1]) if '--discover' in sys.argv else None
+    # --trends updates per-bank daily n-gram counts in data/cache/complaint_trends.sqlite and flags spikes
+    analyzer.run_pipeline(streaming='--streaming' in sys.argv, discover=discover, trends='--trends' in sys.argv)
 
     print("\n--- ThemeAnalyzer finished ---\n")
@@ -0,0 +1,31 @@
+import argparse
+
+from src.task_2.heavy_hitters import HeavyHitterSketches
+
+# --------------------------------
+# Top n-grams from the heavy-hitter sketches, without scanning reviews
+# --------------------------------
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Top n-grams per bank / sentiment label / month range from sketches.")
+    parser.add_argument('--sketches', default='data/cache/heavy_hitters.npz')
+    parser.add_argument('--merge', nargs='*', default=[], help="other sketch files (e.g. from other workers) to merge in")
+    parser.add_argument('--bank', default=None)
+    parser.add_argument('--label', default=None, choices=['positive', 'negative', 'neutral'])
+    parser.add_argument('--start', default=None, help="first month, e.g. 2024-07")
+    parser.add_argument('--end', default=None, help="last month, e.g. 2024-09")
+    parser.add_argument('--top', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    sketches = HeavyHitterSketches.from_file(args.sketches)
+    for path in args.merge:
+        sketches.merge(HeavyHitterSketches.from_file(path))
+    top = sketches.top(args.top, bank=args.bank, label=args.label, start=args.start, end=args.end)
+    print(f"\n--- Top {args.top} n-grams (bank={args.bank}, label={args.label}, {args.start}..{args.end}) ---\n")
+    print(top.to_string(index=False))
+    return top
+
+
+if __name__ == "__main__":
+    main()
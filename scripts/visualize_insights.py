@@ -3,6 +3,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from wordcloud import WordCloud
 import os
+from src.task_2.sentiment_rollup import SentimentRollup
 
 plt.style.use('seaborn-v0_8-muted')
 
@@ -71,13 +72,23 @@ def plot_theme_bar_chart():
         plt.savefig(f"plots/themes_{bank_name.lower().replace(' ', '_')}.png")
         plt.close()
 
+def load_trend(df, rollup_path="data/cache/sentiment_rollup.sqlite"):
+    """Monthly mean sentiment and 95% CI per bank, read from the rollup cube (built from df if absent)."""
+    rollup = SentimentRollup(rollup_path if os.path.exists(rollup_path) else ':memory:')
+    if len(rollup) == 0:
+        rollup.update(df)
+    trend_df = rollup.query(['bank'], freq='M')
+    rollup.close()
+    return trend_df
+
 def plot_sentiment_trend(df):
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
-    trend_df = df.dropna(subset=['date']).copy()
-    trend_df['date'] = trend_df['date'].dt.to_period('M').dt.to_timestamp()
+    trend_df = load_trend(df)
 
     plt.figure(figsize=(10, 5))
-    sns.lineplot(data=trend_df, x='date', y='sentiment_score', hue='bank', marker="o")
+    sns.lineplot(data=trend_df, x='period', y='mean', hue='bank', marker="o", errorbar=None)
+    for bank, bank_df in trend_df.groupby('bank'):
+        ci = bank_df['ci95'].fillna(0)
+        plt.fill_between(bank_df['period'], bank_df['mean'] - ci, bank_df['mean'] + ci, alpha=0.2)
     plt.title("Monthly Sentiment Score Trend by Bank")
     plt.xlabel("Month")
     plt.ylabel("Average Sentiment Score")
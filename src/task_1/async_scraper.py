@@ -0,0 +1,216 @@
+import asyncio
+import http.client
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import pandas as pd
+from google_play_scraper import Sort
+from google_play_scraper.constants.request import Formats, PLAY_STORE_BASE_URL
+
+from src.task_1.scraper import REQUEST_HEADERS, Scraper, build_review_frame, parse_review_page
+
+REVIEWS_PATH = "/_/PlayStoreUi/data/batchexecute?hl={lang}&gl={country}"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+# ------------------------
+# Shared HTTP transport
+# ------------------------
+
+class PooledTransport:
+    def __init__(self, max_connections=16, timeout=30):
+        """Keep-alive HTTP(S) connection pool shared by every scrape task."""
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_connections)
+
+    def _acquire(self, scheme, netloc):
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop()
+        conn_cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return conn_cls(netloc, timeout=self.timeout)
+
+    def _release(self, scheme, netloc, conn):
+        with self._lock:
+            idle = self._idle.setdefault((scheme, netloc), [])
+            if len(idle) < self.max_connections:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _post(self, url, body, headers):
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else '')
+        conn = self._acquire(parts.scheme, parts.netloc)
+        try:
+            conn.request('POST', path, body=body, headers=headers)
+            response = conn.getresponse()
+            payload = response.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            raise
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(parts.scheme, parts.netloc, conn)
+        return response.status, payload.decode('utf-8')
+
+    async def post(self, url, body, headers):
+        """POST on a pooled connection without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._post, url, body, headers)
+
+    def close(self):
+        """Close idle connections and stop the worker threads."""
+        with self._lock:
+            for idle in self._idle.values():
+                for conn in idle:
+                    conn.close()
+            self._idle.clear()
+        self._executor.shutdown(wait=True)
+
+
+class RateLimiter:
+    def __init__(self, rate=10.0, burst=None):
+        """Token bucket applied separately to each host (rate in requests/sec, 0 disables)."""
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._buckets = {}
+
+    async def acquire(self, host):
+        """Wait until a request to host is allowed."""
+        if not self.rate:
+            return
+        while True:
+            # No await between read and update, so the event loop keeps this atomic
+            now = time.monotonic()
+            tokens, last = self._buckets.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens >= 1:
+                self._buckets[host] = (tokens - 1, now)
+                return
+            self._buckets[host] = (tokens, now)
+            await asyncio.sleep((1 - tokens) / self.rate)
+
+
+# ------------------------
+# AsyncScraper class
+# ------------------------
+
+class AsyncScraper(Scraper):
+    def __init__(self, config, base_url=PLAY_STORE_BASE_URL, languages=('en', 'am'), country='et',
+                 page_size=200, max_connections=16, rate_per_host=10.0, burst=None,
+                 max_retries=4, backoff=0.5, timeout=30, archive=None):
+        """Initialize a Scraper that fetches every (app, language) page stream concurrently."""
+        super().__init__(config, archive)
+        self.base_url = base_url.rstrip('/')
+        self.languages = tuple(languages)
+        self.country = country
+        self.page_size = page_size
+        self.max_connections = max_connections
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.transport = None
+        self.rate_limiter = None
+
+    def reviews_url(self, lang):
+        """Build the batchexecute reviews endpoint for a language."""
+        return self.base_url + REVIEWS_PATH.format(lang=lang, country=self.country)
+
+    async def fetch_page(self, app_id, lang, count, token=None):
+        """Fetch one page of reviews, retrying transient failures with exponential backoff."""
+        url = self.reviews_url(lang)
+        host = urlsplit(url).netloc
+        body = Formats.Reviews.build_body(app_id, Sort.NEWEST.value, count, 'null', 'null', token)
+
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire(host)
+            try:
+                status, text = await self.transport.post(url, body, REQUEST_HEADERS)
+            except (http.client.HTTPException, OSError) as e:
+                error = e
+            else:
+                if status == 200 and 'PlayGatewayError' not in text:
+                    return parse_review_page(text)
+                if status != 200 and status not in RETRY_STATUSES:
+                    raise RuntimeError(f"HTTP {status} from {url}")
+                error = f"HTTP {status}" if status != 200 else 'PlayGatewayError'
+
+            if attempt == self.max_retries:
+                raise RuntimeError(f"Giving up on {app_id} ({lang}) after {attempt + 1} attempts: {error}")
+            delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.0)
+            await asyncio.sleep(delay)
+
+    async def scrape_stream(self, app_id, app_name, lang, num_reviews):
+        """Page through one (app, language) stream until num_reviews or the last page."""
+        collected = []
+        token = None
+        try:
+            while len(collected) < num_reviews:
+                count = min(self.page_size, num_reviews - len(collected))
+                items, token = await self.fetch_page(app_id, lang, count, token)
+                self.archive_reviews(app_id, app_name, lang, items)
+                collected.extend(items)
+                if not items or token is None:
+                    break
+        except Exception as e:
+            print(f"Error scraping {app_name} {lang.upper()}: {e}")
+        print(f"--- {app_name} {lang.upper()}: {len(collected)} raw reviews ---")
+        return collected[:num_reviews]
+
+    async def scrape_apps(self, apps, num_reviews):
+        """Scrape {app_name: app_id} concurrently and return {app_name: raw reviews}."""
+        self.transport = PooledTransport(self.max_connections, self.timeout)
+        self.rate_limiter = RateLimiter(self.rate_per_host, self.burst)
+        try:
+            units = [(app_name, app_id, lang) for app_name, app_id in apps.items() for lang in self.languages]
+            results = await asyncio.gather(*[
+                self.scrape_stream(app_id, app_name, lang, num_reviews)
+                for app_name, app_id, lang in units
+            ])
+        finally:
+            self.transport.close()
+
+        # Keep the sequential ordering: apps in config order, languages in self.languages order
+        raw = {app_name: [] for app_name in apps}
+        for (app_name, _, _), collected in zip(units, results):
+            raw[app_name].extend(collected)
+        return raw
+
+    def scrape_reviews(self, app_id, app_name, num_reviews=400):
+        """Scrape all languages of one app concurrently."""
+        raw = asyncio.run(self.scrape_apps({app_name: app_id}, num_reviews))
+        df = build_review_frame(raw[app_name], app_name)
+        print(f"After deduplication: {len(df)} reviews.")
+        return df
+
+    def scrape_all_banks(self, num_reviews=400):
+        """Scrape every (app, language) stream at once and combine into a DataFrame."""
+        print(f"\nStarting concurrent scrape of {len(self.app_ids)} apps x {len(self.languages)} languages...")
+        raw = asyncio.run(self.scrape_apps(self.app_ids, num_reviews))
+
+        all_reviews = []
+        for app_name, combined in raw.items():
+            df = build_review_frame(combined, app_name)
+            print(f"{app_name}: {len(df)} reviews after deduplication.")
+            if not df.empty:
+                all_reviews.append(df)
+
+        if all_reviews:
+            combined_df = pd.concat(all_reviews, ignore_index=True)
+            print(f"\nTotal combined reviews: {len(combined_df)}")
+            return combined_df
+        else:
+            print("\nNo reviews were scraped.")
+            return pd.DataFrame()
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+from pandas.util import hash_array
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+ROLLING_BASE = np.uint64(1000003)
+MIX = np.uint64(0x9E3779B97F4A7C15)
+SEPARATOR = '\x00'
+
+
+def optimal_bands(threshold, num_perm):
+    """Choose (bands, rows) minimizing the summed false-positive and false-negative areas around threshold."""
+    best, best_error = (1, num_perm), float('inf')
+    s, step = np.linspace(0, 1, 201, retstep=True)
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            p = 1 - (1 - s ** rows) ** bands
+            # Riemann sums over the unit interval (np.trapz is gone in numpy 2)
+            false_positive = np.where(s < threshold, p, 0).sum() * step
+            false_negative = np.where(s >= threshold, 1 - p, 0).sum() * step
+            error = false_positive + false_negative
+            if error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+class NearDuplicateDetector:
+    def __init__(self, threshold=0.8, num_perm=128, shingle_size=5, min_length=20, mode='flag',
+                 block_size=50000, seed=1):
+        """MinHash signatures over character shingles with an LSH banding index.
+
+        mode='flag' adds near_dup_group / is_near_duplicate columns, mode='collapse' keeps only the first
+        review of each near-duplicate group. Reviews shorter than min_length are never grouped.
+        """
+        if mode not in ('flag', 'collapse'):
+            raise ValueError(f"mode must be 'flag' or 'collapse', got {mode!r}")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.min_length = min_length
+        self.mode = mode
+        self.block_size = block_size
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+
+        rng = np.random.RandomState(seed)
+        self.perm_a = rng.randint(1, int(MERSENNE_PRIME), size=num_perm).astype(np.uint64)
+        self.perm_b = rng.randint(0, int(MERSENNE_PRIME), size=num_perm).astype(np.uint64)
+
+    def _shingle_hashes(self, texts):
+        """Rolling hashes of every character shingle, plus the owning document of each shingle."""
+        k = self.shingle_size
+        texts = [text.ljust(k) for text in texts]  # Short texts still get one shingle
+        lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+        codes = np.frombuffer((SEPARATOR.join(texts) + SEPARATOR).encode('utf-32-le'), dtype=np.uint32)
+        codes = codes.astype(np.uint64)
+
+        # Polynomial hash of each length-k window, computed for all windows at once
+        n_windows = len(codes) - k + 1
+        hashes = np.zeros(n_windows, dtype=np.uint64)
+        for offset in range(k):
+            hashes = hashes * ROLLING_BASE + codes[offset:offset + n_windows]
+
+        # Windows that span a separator belong to no document
+        separators = np.concatenate([[0], np.cumsum(codes == 0)])
+        valid = separators[k:k + n_windows] - separators[:n_windows] == 0
+        starts = np.concatenate([[0], np.cumsum(lengths + 1)[:-1]])
+        doc_ids = np.searchsorted(starts, np.arange(n_windows), side='right') - 1
+        return hashes[valid] % MERSENNE_PRIME, doc_ids[valid]
+
+    def signatures(self, texts):
+        """MinHash signature matrix (len(texts) x num_perm) of the given texts."""
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint64)
+        for start in range(0, len(texts), self.block_size):
+            block = texts[start:start + self.block_size]
+            shingles, doc_ids = self._shingle_hashes(block)
+            offsets = np.searchsorted(doc_ids, np.arange(len(block)))
+            for i in range(self.num_perm):
+                permuted = (self.perm_a[i] * shingles + self.perm_b[i]) % MERSENNE_PRIME
+                signatures[start:start + len(block), i] = np.minimum.reduceat(permuted, offsets)
+        return signatures
+
+    def find_groups(self, texts, groups=None):
+        """Label each text with the position of the first text in its near-duplicate group.
+
+        groups (optional array of hashable group values, e.g. bank) restricts matches to the same group.
+        """
+        n = len(texts)
+        labels = np.arange(n)
+        eligible = np.flatnonzero(np.fromiter((len(text) >= self.min_length for text in texts), dtype=bool, count=n))
+        if len(eligible) < 2:
+            return labels
+
+        signatures = self.signatures([texts[i] for i in eligible])
+        group_hash = hash_array(np.asarray(groups, dtype=object)[eligible]) if groups is not None \
+            else np.zeros(len(eligible), dtype=np.uint64)
+
+        # Each band buckets reviews whose band slice (and group) collide; verify against the bucket leader
+        sources, targets = [], []
+        for band in range(self.bands):
+            keys = group_hash.copy()
+            for column in range(band * self.rows, (band + 1) * self.rows):
+                keys = (keys ^ signatures[:, column]) * MIX
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            is_leader = np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]])
+            leaders = order[np.flatnonzero(is_leader)[np.cumsum(is_leader) - 1]]
+            members = order[~is_leader]
+            leaders = leaders[~is_leader]
+            if len(members) == 0:
+                continue
+            similarity = (signatures[members] == signatures[leaders]).mean(axis=1)
+            verified = similarity >= self.threshold
+            sources.append(members[verified])
+            targets.append(leaders[verified])
+
+        if not sources or sum(len(s) for s in sources) == 0:
+            return labels
+
+        sources, targets = np.concatenate(sources), np.concatenate(targets)
+        graph = coo_matrix((np.ones(len(sources), dtype=np.int8), (sources, targets)), shape=(len(eligible),) * 2)
+        _, components = connected_components(graph, directed=False)
+
+        # The representative of each component is its first review in input order
+        first_in_component = pd.Series(eligible).groupby(components).transform('min').to_numpy()
+        labels[eligible] = first_in_component
+        return labels
+
+    def apply(self, df, text_column='review', group_column='bank'):
+        """Flag or collapse near-duplicate reviews in df according to self.mode."""
+        if df.empty:
+            if self.mode == 'flag':
+                df = df.assign(near_dup_group=pd.Series(dtype='int64'), is_near_duplicate=pd.Series(dtype=bool))
+            return df
+
+        texts = df[text_column].fillna('').astype(str).tolist()
+        groups = df[group_column].to_numpy() if group_column in df.columns else None
+        labels = self.find_groups(texts, groups)
+        is_duplicate = labels != np.arange(len(labels))
+        print(f"Near-duplicates: {is_duplicate.sum()} of {len(df)} reviews (threshold {self.threshold}).")
+
+        if self.mode == 'collapse':
+            return df[~is_duplicate]
+
+        # Group ids are the representative's text hash, so they stay stable across chunks and files
+        representative_text = np.asarray(texts, dtype=object)[labels]
+        df = df.copy()
+        df['near_dup_group'] = hash_array(representative_text, categorize=False).view(np.int64)
+        df['is_near_duplicate'] = is_duplicate
+        return df
@@ -1,49 +1,42 @@
+import numpy as np
 import pandas as pd
 import re
-from langdetect import detect, LangDetectException
-
-# Expand this list based on your real-world dataset
-KNOWN_SENTIMENT_WORDS = {
-    'good', 'bad', 'great', 'nice', 'love', 'hate', 'ok', 'perfect', 'poor', 'worst',
-    'Top', 'best', 'cool', 'sweet', 'fast', 'week', 'slow', 'buggy', 'fake', 'messy', 'Fine',
-    'Fair', 'Basic', 'አሪፍ', 'ጥሩ', 'በጣም ጥሩ', 'መልካም', 'መጥፎ', 'በጣም መጥፎ', 'ከፍተኛ', 'ምርጥ',
-    'አሪፍ', 'ቀርፋፋ', 'ደካማ', 'የውሸት', 'እሺ', 'ፍትሃዊ', 'መሠረታዊ'
-}
-
-def detect_language(text):
-    try:
-        if not text or pd.isna(text):
-            return 'unknown'
-
-        text_clean = text.strip().lower()
-        if not text_clean:
-            return 'unknown'
-
-        # If very short and not known sentiment word, ignore
-        if len(text_clean) < 5 and text_clean not in KNOWN_SENTIMENT_WORDS:
-            return 'unknown'
-
-        # Check for Amharic script
-        if re.search(r'[\u1200-\u137F]', text_clean):
-            amharic_chars = len(re.findall(r'[\u1200-\u137F]', text_clean))
-            if amharic_chars / len(text_clean) > 0.5:
-                return 'amharic'
-            else:
-                return 'bilingual'
-
-        # Fallback to langdetect
-        lang = detect(text_clean)
-        if lang == 'en':
-            return 'english'
-        return lang
-    except LangDetectException:
-        return 'unknown'
+from pandas.util import hash_array
+from src.utils.seen_keys import SeenKeyStore
+from src.utils.language_detector import LanguageDetector, detect_language, KNOWN_SENTIMENT_WORDS  # noqa: F401
+
+# Anything that is not a word character, whitespace or Ethiopic script
+NON_TEXT_PATTERN = re.compile(r'[^\w\s\u1200-\u137F]')
+
+# Streaming mode: rows sampled to estimate row size, peak copies of a chunk alive while
+# cleaning it, and the smallest chunk worth the per-chunk overhead
+SAMPLE_ROWS = 1000
+CLEANING_OVERHEAD = 6
+MIN_CHUNK_ROWS = 1000
+
+
+def _hash_values(values):
+    """Stable 64-bit hash per value, computed once per distinct value."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    return hash_array(np.asarray(uniques, dtype=str).astype(object), categorize=False)[codes]
+
+
+def dedupe_keys(review, date, bank):
+    """Combine hashes of normalized review, raw date and bank into one uint64 key per row."""
+    keys = hash_array(review, categorize=False)
+    keys = keys * np.uint64(0x9E3779B97F4A7C15) ^ _hash_values(date)
+    return keys * np.uint64(0xBF58476D1CE4E5B9) ^ _hash_values(bank)
 
 
 class Preprocessor:
-    def __init__(self, data_handler):
-        """Initialize Preprocessor with DataHandler."""
+    def __init__(self, data_handler, language_detector=None, near_duplicates=None):
+        """Initialize Preprocessor with DataHandler and a shared LanguageDetector (in-memory if None).
+
+        near_duplicates is an optional NearDuplicateDetector that flags or collapses near-duplicate reviews.
+        """
         self.data_handler = data_handler
+        self.language_detector = language_detector or LanguageDetector(cache_path=None)
+        self.near_duplicates = near_duplicates
 
     def load_data(self, input_paths):
         """Load raw review data from multiple CSV files."""
@@ -56,57 +49,142 @@ class Preprocessor:
             return pd.concat(dfs, ignore_index=True)
         return pd.DataFrame(columns=['review', 'rating', 'date', 'bank', 'source'])
 
-    def clean_data(self, df):
-        """Preprocess reviews: remove duplicates, handle missing data, normalize, detect language."""
-        # Create a copy
-        df = df.copy()
-
-        # Handle missing data
-        df.loc[:, 'review'] = df['review'].fillna('').astype(str)
-        df.loc[:, 'rating'] = df['rating'].fillna(0).astype(int)
-        df.loc[:, 'bank'] = df['bank'].fillna('Unknown')
-        df.loc[:, 'source'] = df['source'].fillna('Google Play')
-
-        # Normalize review text for duplicate detection
-        df.loc[:, 'review_normalized'] = df['review'].apply(
-            lambda x: re.sub(r'[^\w\s\u1200-\u137F]', '', x.lower().strip()) if x else ''
-        )
-
-        # Normalize bank
-        df.loc[:, 'bank'] = df['bank'].str.lower().str.strip()
-
-        # Remove duplicates
-        df = df.drop_duplicates(subset=['review_normalized', 'date', 'bank'], keep='first')
-
-        # Update review column
-        df.loc[:, 'review'] = df['review_normalized']
-        df = df.drop(columns=['review_normalized'])
-
-        # Normalize dates
-        df.loc[:, 'date'] = pd.to_datetime(df['date'], errors='coerce')
-
-        # Drop rows where date is invalid
-        df = df[df['date'].notnull()]
-
-        # Force datetime again to ensure .dt works
-        df.loc[:, 'date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
+    def load_archive(self, archive):
+        """Replay raw review payloads from a RawArchive without touching the network."""
+        dfs = [chunk for chunk in archive.replay()]
+        if dfs:
+            df = pd.concat(dfs, ignore_index=True)
+            print(f"Replayed {len(df)} reviews from {len(archive.segments())} archive segments.")
+            return df
+        return pd.DataFrame(columns=['review', 'rating', 'date', 'bank', 'source'])
 
-        # Filter out invalid ratings (must be 1-5)
-        df = df[df['rating'].between(1, 5)]
+    def normalize_reviews(self, df, seen=None):
+        """Vectorized cleaning: fill missing data, normalize text/bank/dates, drop duplicates and invalid rows.
+
+        seen is an optional SeenKeyStore that carries duplicate detection across chunks.
+        """
+        # Normalize the review text with pandas string methods and the precompiled pattern
+        review = (df['review'].fillna('').astype(str).str.lower().str.strip()
+                  .str.replace(NON_TEXT_PATTERN, '', regex=True).to_numpy(dtype=object))
+        rating = df['rating'].fillna(0).astype(int)
+        source = df['source'].fillna('Google Play')
+
+        # Banks are low-cardinality: normalize the distinct names and broadcast back through the codes
+        bank_codes, bank_names = pd.factorize(df['bank'].fillna('Unknown'))
+        bank_names = pd.Index(bank_names, dtype=object).str.lower().str.strip()
+        bank = bank_names.to_numpy()[bank_codes]
+
+        # Remove duplicates on a 64-bit hash of (normalized review, raw date, bank) instead of full strings
+        keys = dedupe_keys(review, df['date'], bank)
+        first = ~pd.Series(keys).duplicated(keep='first').to_numpy()
+        if seen is not None:
+            # Streaming mode: also drop rows whose key appeared in an earlier chunk
+            first[first] = seen.add_new(keys[first])
+        positions = np.flatnonzero(first)
+
+        # Parse dates in one pass over the deduplicated rows, then drop invalid dates and ratings
+        dates = pd.to_datetime(df['date'].iloc[positions], errors='coerce')
+        valid = dates.notna().to_numpy() & rating.iloc[positions].between(1, 5).to_numpy()
+        positions = positions[valid]
+        dates = dates[valid]
+
+        if dates.dtype.kind == 'M' and getattr(dates.dtype, 'tz', None) is None:
+            date_strings = np.datetime_as_string(dates.to_numpy().astype('datetime64[D]')).astype(object)
+        else:
+            date_strings = pd.to_datetime(dates).dt.strftime('%Y-%m-%d').to_numpy()
+
+        # Assemble the surviving rows once instead of copying the whole frame per step
+        cleaned = {col: df[col].iloc[positions].array for col in df.columns}
+        cleaned['review'] = review[positions]
+        cleaned['rating'] = rating.iloc[positions].to_numpy()
+        cleaned['bank'] = bank[positions]
+        cleaned['source'] = source.iloc[positions].to_numpy()
+        cleaned['date'] = date_strings
+        return pd.DataFrame(cleaned, index=df.index[positions])
+
+    def clean_data(self, df, seen=None, verbose=True):
+        """Preprocess reviews: remove duplicates, handle missing data, normalize, detect language."""
+        df = self.normalize_reviews(df, seen)
 
-        # Detect language
-        print("Detecting language...")
-        df['language'] = df['review'].apply(detect_language)
+        # Detect language (reuse an already complete language column)
+        if 'language' in df.columns and df['language'].notna().all():
+            if verbose:
+                print("Reusing existing language column.")
+        else:
+            if verbose:
+                print("Detecting language...")
+            df['language'] = self.language_detector.detect_series(df['review'])
 
         # Filter only selected languages
         df = df[df['language'].isin(['english', 'amharic', 'bilingual'])]
 
+        # Near-duplicate reviews (copy-paste spam, templated complaints) among the reviews that are kept,
+        # so every group's representative survives the language filter and can lend its sentiment
+        if self.near_duplicates is not None:
+            df = self.near_duplicates.apply(df)
+
         # Language distribution
-        print("\nLanguage distribution after filtering:")
-        print(df['language'].value_counts())
+        if verbose:
+            print("\nLanguage distribution after filtering:")
+            print(df['language'].value_counts())
 
         return df
 
+    def chunk_size_for_budget(self, sample, memory_budget_mb):
+        """Rows per chunk so that cleaning one chunk stays within memory_budget_mb."""
+        bytes_per_row = max(sample.memory_usage(deep=True).sum() / max(len(sample), 1), 1.0)
+        return max(MIN_CHUNK_ROWS, int(memory_budget_mb * 2 ** 20 / (bytes_per_row * CLEANING_OVERHEAD)))
+
+    def clean_stream(self, chunks, output_path, seen=None):
+        """Clean raw DataFrame chunks one at a time, appending each to output_path.
+
+        Duplicates are tracked across chunks in a SeenKeyStore, so only one chunk is ever in memory.
+        Returns (rows read, rows written, language counts).
+        """
+        own_seen = seen is None
+        if own_seen:
+            seen = SeenKeyStore()
+        rows_in = rows_out = 0
+        language_counts = pd.Series(dtype='int64')
+        try:
+            for i, chunk in enumerate(chunks):
+                cleaned = self.clean_data(chunk, seen=seen, verbose=False)
+                self.data_handler.append_csv(cleaned, output_path, header=(i == 0))
+                rows_in += len(chunk)
+                rows_out += len(cleaned)
+                language_counts = language_counts.add(cleaned['language'].value_counts(), fill_value=0)
+                print(f"Chunk {i + 1}: {len(chunk)} raw -> {len(cleaned)} cleaned (total {rows_out}/{rows_in})")
+        finally:
+            if own_seen:
+                seen.close()
+        return rows_in, rows_out, language_counts.astype('int64')
+
+    def preprocess_streaming(self, input_paths, output_path, memory_budget_mb=512, archive=None, seen_path=None):
+        """Preprocess arbitrarily large raw inputs (CSV paths or a RawArchive) within a memory budget."""
+        # A quarter of the budget goes to the SQLite page cache of the seen-key set
+        seen = SeenKeyStore(seen_path, cache_mb=memory_budget_mb / 4)
+        chunk_budget_mb = memory_budget_mb * 3 / 4
+
+        if archive is not None:
+            sample = next(archive.replay(chunk_size=SAMPLE_ROWS), pd.DataFrame())
+            chunk_size = self.chunk_size_for_budget(sample, chunk_budget_mb)
+            chunks = archive.replay(chunk_size=chunk_size)
+        else:
+            sample = next((c for path in input_paths for c in self.data_handler.iter_csv(path, SAMPLE_ROWS)),
+                          pd.DataFrame())
+            chunk_size = self.chunk_size_for_budget(sample, chunk_budget_mb)
+            chunks = (chunk for path in input_paths for chunk in self.data_handler.iter_csv(path, chunk_size))
+
+        print(f"Streaming preprocessing in chunks of {chunk_size} rows (budget {memory_budget_mb} MB)...")
+        try:
+            rows_in, rows_out, language_counts = self.clean_stream(chunks, output_path, seen)
+        finally:
+            seen.close()
+
+        print("\nLanguage distribution after filtering:")
+        print(language_counts)
+        print(f"Saved {rows_out} cleaned reviews (from {rows_in} raw) to {output_path}")
+        return rows_out > 0
 
     def save_cleaned_data(self, df, output_path='data/processed/bank_reviews_cleaned.csv'):
         """Save cleaned DataFrame to CSV."""
@@ -114,16 +192,25 @@ class Preprocessor:
         print(f"Saved {len(df)} cleaned reviews to {output_path}")
         return True
 
-    def main(self, output_path='data/processed/bank_reviews_cleaned.csv'):
-        """Run the preprocessing pipeline for bank reviews."""
+    def main(self, output_path='data/processed/bank_reviews_cleaned.csv', archive=None, memory_budget_mb=None):
+        """Run the preprocessing pipeline for bank reviews, optionally replaying a RawArchive.
+
+        With memory_budget_mb set, inputs are streamed in chunks instead of loaded at once.
+        """
         input_paths = [
             'data/raw/commercial_bank_of_ethiopia_reviews_raw.csv',
             'data/raw/bank_of_abyssinia_reviews_raw.csv',
             'data/raw/dashen_bank_reviews_raw.csv'
         ]
 
+        if memory_budget_mb is not None:
+            return self.preprocess_streaming(input_paths, output_path, memory_budget_mb, archive)
+
         print("Loading raw review data...")
-        df = self.load_data(input_paths)
+        if archive is not None:
+            df = self.load_archive(archive)
+        else:
+            df = self.load_data(input_paths)
         if df.empty:
             print("Error: No data loaded from input CSVs.")
             return False
@@ -1,16 +1,82 @@
+import json
 import pandas as pd
 from google_play_scraper import reviews, Sort
+from google_play_scraper.constants.element import ElementSpecs
+from google_play_scraper.constants.regex import Regex
+from google_play_scraper.constants.request import Formats
+from google_play_scraper.utils.request import post
 import os
 
+REVIEW_COLUMNS = ['review', 'rating', 'date', 'bank', 'source']
+REQUEST_HEADERS = {"content-type": "application/x-www-form-urlencoded"}
+
+
+def parse_review_page(text):
+    """Parse one batchexecute reviews response into (review dicts, continuation token)."""
+    match = json.loads(Regex.REVIEWS.findall(text)[0])
+    payload = json.loads(match[0][2])
+    try:
+        token = payload[-2][-1]
+    except (IndexError, KeyError, TypeError):
+        token = None
+    if isinstance(token, list):
+        token = None
+
+    if len(payload) == 0 or len(payload[0]) == 0:
+        return [], token
+
+    items = [
+        {k: spec.extract_content(review) for k, spec in ElementSpecs.Review.items()}
+        for review in payload[0]
+    ]
+    return items, token
+
+
+def fetch_review_page(app_id, lang, count, token=None, country='et'):
+    """Fetch one newest-first reviews page as (review dicts, next token or None at the end).
+
+    Unlike google_play_scraper.reviews(), which swallows fetch errors and reports them as the end
+    of the stream, failures raise here so an incremental scrape can tell the two apart.
+    """
+    url = Formats.Reviews.build(lang=lang, country=country)
+    body = Formats.Reviews.build_body(app_id, Sort.NEWEST.value, count, 'null', 'null', token)
+    return parse_review_page(post(url, body, REQUEST_HEADERS))
+
+
+def build_review_frame(raw_reviews, app_name):
+    """Project raw google-play-scraper review dicts onto the review columns and deduplicate."""
+    data = []
+    for review in raw_reviews:
+        content = review['content']
+        if content and content.strip():  # Skip empty reviews
+            data.append({
+                'review': content,
+                'rating': review['score'],
+                'date': review['at'].strftime('%Y-%m-%d'),
+                'bank': app_name,
+                'source': 'Google Play'
+            })
+
+    df = pd.DataFrame(data, columns=REVIEW_COLUMNS)
+
+    # Deduplicate
+    return df.drop_duplicates(subset=['review', 'date', 'bank'], keep='first')
+
 # ------------------------
 # Scraper class
 # ------------------------
 
 class Scraper:
-    def __init__(self, config):
-        """Initialize Scraper with app IDs from Config."""
+    def __init__(self, config, archive=None):
+        """Initialize Scraper with app IDs from Config and an optional RawArchive for full payloads."""
         self.config = config
         self.app_ids = self.config.get_app_ids()
+        self.archive = archive
+
+    def archive_reviews(self, app_id, app_name, lang, raw_reviews):
+        """Append full reviews() payloads to the raw archive, if one is configured."""
+        if self.archive is not None:
+            self.archive.append(app_id, app_name, lang, raw_reviews)
 
     def scrape_reviews(self, app_id, app_name, num_reviews=400):
         """Scrape reviews for a specific app from Google Play Store."""
@@ -33,25 +99,13 @@ class Scraper:
                 count=num_reviews
             )
 
+            self.archive_reviews(app_id, app_name, 'en', result_en)
+            self.archive_reviews(app_id, app_name, 'am', result_am)
+
             combined = result_en + result_am
             print(f"Combined total raw reviews: {len(combined)}")
 
-            data = []
-            for review in combined:
-                content = review['content']
-                if content and content.strip():  # Skip empty reviews
-                    data.append({
-                        'review': content,
-                        'rating': review['score'],
-                        'date': review['at'].strftime('%Y-%m-%d'),
-                        'bank': app_name,
-                        'source': 'Google Play'
-                    })
-
-            df = pd.DataFrame(data)
-
-            # Deduplicate
-            df = df.drop_duplicates(subset=['review', 'date', 'bank'], keep='first')
+            df = build_review_frame(combined, app_name)
             print(f"After deduplication: {len(df)} reviews.")
 
             return df
@@ -76,8 +130,104 @@ class Scraper:
             print("\nNo reviews were scraped.")
             return pd.DataFrame()
 
-    def save_raw_data(self, df, output_dir='data/raw', save_combined=True):
-        """Save scraped reviews to CSV files per bank + optional combined CSV."""
+    def _scrape_stream_incremental(self, app_id, app_name, lang, store, page_size, max_reviews):
+        """Page one language stream from newest until the watermark, checkpointing every page.
+
+        The stream is done (its head becomes the watermark on commit) only once it reaches the
+        watermark or its last page. Stopping at max_reviews pauses it: the next run resumes from
+        the saved token. A failed fetch raises and leaves the last checkpoint in place.
+        """
+        watermark = store.get_watermark(app_id, lang)
+        checkpoint = store.get_checkpoint(app_id, lang)
+
+        if checkpoint and checkpoint['done']:
+            print(f"{app_id} {lang.upper()}: already scraped, awaiting commit.")
+            return store.read_pending(app_id, lang)
+
+        head = None
+        token = None
+        if checkpoint:
+            print(f"{app_id} {lang.upper()}: resuming interrupted scrape.")
+            head = checkpoint['head']
+            token = checkpoint['token']
+        fetched = 0
+
+        while True:
+            result, token = fetch_review_page(app_id, lang, page_size, token)
+
+            if head is None and result:
+                head = {'review_id': result[0]['reviewId'], 'at': result[0]['at'].isoformat()}
+
+            new_reviews = []
+            reached_watermark = False
+            for review in result:
+                if watermark and (review['reviewId'] == watermark['review_id'] or review['at'] < watermark['at']):
+                    reached_watermark = True
+                    break
+                new_reviews.append(review)
+            fetched += len(new_reviews)
+            self.archive_reviews(app_id, app_name, lang, new_reviews)
+
+            done = reached_watermark or not result or token is None
+            paused = not done and max_reviews is not None and fetched >= max_reviews
+            store.checkpoint(app_id, lang, None if done else token, head, done, new_reviews, paused=paused)
+            if done or paused:
+                if paused:
+                    print(f"{app_id} {lang.upper()}: stopped at {max_reviews} reviews, the next run resumes here.")
+                break
+
+        return store.read_pending(app_id, lang)
+
+    def scrape_reviews_incremental(self, app_id, app_name, store, page_size=200, max_reviews=None):
+        """Scrape only reviews newer than the stored watermarks, resuming interrupted runs.
+
+        Call store.commit() after the returned reviews are saved to advance the watermarks. Fetch
+        errors propagate (after logging) so that a failed run is never committed.
+        """
+        try:
+            combined = []
+            for lang in ('en', 'am'):
+                print(f"\n--- Delta scraping {app_name} {lang.upper()} ---")
+                combined += self._scrape_stream_incremental(app_id, app_name, lang, store, page_size, max_reviews)
+            print(f"New raw reviews since last run: {len(combined)}")
+
+            df = build_review_frame(combined, app_name)
+            print(f"After deduplication: {len(df)} reviews.")
+            return df
+        except Exception as e:
+            print(f"Error scraping {app_name}: {e}")
+            raise
+
+    def scrape_all_banks_incremental(self, store, page_size=200, max_reviews=None):
+        """Delta-scrape all banks and combine the new reviews into a DataFrame."""
+        all_reviews = []
+        for app_name, app_id in self.app_ids.items():
+            print(f"\nStarting delta scrape for {app_name}...")
+            df = self.scrape_reviews_incremental(app_id, app_name, store, page_size, max_reviews)
+            if not df.empty:
+                all_reviews.append(df)
+
+        if all_reviews:
+            combined_df = pd.concat(all_reviews, ignore_index=True)
+            print(f"\nTotal new reviews: {len(combined_df)}")
+            return combined_df
+        else:
+            print("\nNo new reviews since last run.")
+            return pd.DataFrame(columns=REVIEW_COLUMNS)
+
+    def _write_raw_csv(self, df, path, merge):
+        if merge and os.path.exists(path):
+            existing = pd.read_csv(path, encoding='utf-8')
+            df = pd.concat([df, existing], ignore_index=True)
+            df = df.drop_duplicates(subset=['review', 'date', 'bank'], keep='first')
+        df.to_csv(path, index=False, encoding='utf-8')
+        return df
+
+    def save_raw_data(self, df, output_dir='data/raw', save_combined=True, merge=False):
+        """Save scraped reviews to CSV files per bank + optional combined CSV.
+
+        With merge=True the reviews are prepended to the existing files instead of replacing them.
+        """
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
         
@@ -86,13 +236,13 @@ class Scraper:
             for bank in df['bank'].unique():
                 bank_df = df[df['bank'] == bank]
                 bank_file = os.path.join(output_dir, f"{bank.lower().replace(' ', '_')}_reviews_raw.csv")
-                bank_df.to_csv(bank_file, index=False, encoding='utf-8')
+                bank_df = self._write_raw_csv(bank_df, bank_file, merge)
                 print(f"Saved {len(bank_df)} reviews to {bank_file}")
             
             # Optional: save combined CSV
             if save_combined:
                 combined_file = os.path.join(output_dir, "all_banks_reviews_raw.csv")
-                df.to_csv(combined_file, index=False, encoding='utf-8')
+                self._write_raw_csv(df, combined_file, merge)
                 print(f"\nSaved combined reviews CSV to {combined_file}")
             return True
         else:
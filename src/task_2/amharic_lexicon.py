@@ -0,0 +1,108 @@
+import hashlib
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from src.utils.trie_pattern import trie_pattern
+
+DEFAULT_LEXICON = os.path.join(os.path.dirname(__file__), 'lexicons', 'amharic_sentiment.csv')
+DOCUMENT_SEPARATOR = '\n'
+SENTIMENT, NEGATION_PRECEDES, NEGATION_FOLLOWS = 0, 1, 2
+
+# Amharic terms match inside words (prefixes and suffixes attach to stems); Latin terms need whole words
+LATIN_BOUNDARY = r'(?<![a-z]){}(?![a-z])'
+# Negation never reaches across punctuation (Latin or Ethiopic) or a clause-joining conjunction
+CLAUSE_BREAK = re.compile(r'[.,;:!?\n።፣፤፥፦፧]|(?<!\w)(?:but|however|although|though|and|ነገር ግን|ግን|እና)(?!\w)')
+
+
+def load_lexicon(path=DEFAULT_LEXICON):
+    """Read a term,weight,type CSV into (sentiment weights, preceding negators, following negators)."""
+    lexicon = pd.read_csv(path, encoding='utf-8', dtype={'term': str})
+    lexicon['term'] = lexicon['term'].str.strip().str.lower()
+    sentiment = lexicon[lexicon['type'] == 'sentiment']
+    weights = dict(zip(sentiment['term'], sentiment['weight'].astype(float)))
+    precedes = lexicon.loc[lexicon['type'] == 'negation_precedes', 'term'].tolist()
+    follows = lexicon.loc[lexicon['type'] == 'negation_follows', 'term'].tolist()
+    return weights, precedes, follows
+
+
+class LexiconScorer:
+    def __init__(self, lexicon_path=DEFAULT_LEXICON, negation_window=12):
+        """Weighted Amharic/bilingual sentiment lexicon compiled into one trie-shaped regex.
+
+        A negator flips only the nearest sentiment term on its side (after 'not', before 'አይደለም'),
+        and only within negation_window characters and the same clause: punctuation and
+        conjunctions such as 'but' or 'ግን' end its scope. fingerprint identifies the terms, weights and
+        window, so caches of lexicon scores can tell when they are stale.
+        """
+        self.weights, precedes, follows = load_lexicon(lexicon_path)
+        self.negation_window = negation_window
+        self.fingerprint = hashlib.sha1(
+            repr((sorted(self.weights.items()), sorted(precedes), sorted(follows), negation_window)).encode('utf-8')
+        ).hexdigest()[:12]
+        # Sentiment terms and negators share one automaton so each column is scanned once
+        self.kinds = {term: SENTIMENT for term in self.weights}
+        self.kinds.update({term: NEGATION_PRECEDES for term in precedes})
+        self.kinds.update({term: NEGATION_FOLLOWS for term in follows})
+        self.pattern = re.compile(LATIN_BOUNDARY.format(trie_pattern(self.kinds)))
+
+    def _negated(self, starts, ends, doc_ids, sentiment, negators, follows, breaks):
+        """Mask of sentiment matches flipped by a negator; matches are sorted by position."""
+        negated = np.zeros(len(starts), dtype=bool)
+        terms, neg = np.flatnonzero(sentiment), np.flatnonzero(negators)
+        if len(terms) == 0 or len(neg) == 0:
+            return negated
+        if follows:
+            # Nearest term ending at or before the negator's start
+            idx = np.searchsorted(ends[terms], starts[neg], side='right') - 1
+            found = idx >= 0
+            term = terms[np.maximum(idx, 0)]
+            gap_start, gap_end = ends[term], starts[neg]
+        else:
+            # Nearest term starting at or after the negator's end
+            idx = np.searchsorted(starts[terms], ends[neg], side='left')
+            found = idx < len(terms)
+            term = terms[np.minimum(idx, len(terms) - 1)]
+            gap_start, gap_end = ends[neg], starts[term]
+        same_clause = np.searchsorted(breaks, gap_start) == np.searchsorted(breaks, gap_end)
+        flips = found & (gap_end - gap_start <= self.negation_window) & (doc_ids[term] == doc_ids[neg]) & same_clause
+        negated[term[flips]] = True
+        return negated
+
+    def score_totals(self, texts):
+        """Net lexicon weight per text, scanning the whole column as one string."""
+        texts = [text.lower() if isinstance(text, str) else '' for text in texts]
+        totals = np.zeros(len(texts), dtype=np.float64)
+        if not texts:
+            return totals
+
+        # One regex pass over the joined column; match offsets map back to documents
+        lengths = np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=len(texts))
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        joined = DOCUMENT_SEPARATOR.join(texts)
+        matches = [(m.start(), m[0]) for m in self.pattern.finditer(joined)]
+        if not matches:
+            return totals
+
+        starts = np.fromiter((start for start, _ in matches), dtype=np.int64, count=len(matches))
+        codes, terms = pd.factorize(np.array([term for _, term in matches], dtype=object))
+        ends = starts + np.array([len(term) for term in terms], dtype=np.int64)[codes]
+        kinds = np.array([self.kinds[term] for term in terms], dtype=np.int8)[codes]
+        weights = np.array([self.weights.get(term, 0.0) for term in terms], dtype=np.float64)[codes]
+        doc_ids = np.searchsorted(offsets, starts, side='right') - 1
+
+        sentiment = kinds == SENTIMENT
+        negated = np.zeros(len(starts), dtype=bool)
+        if (kinds != SENTIMENT).any():
+            # Clause breaks are only needed to scope negators
+            breaks = np.fromiter((m.start() for m in CLAUSE_BREAK.finditer(joined)), dtype=np.int64)
+            for kind, follows in ((NEGATION_PRECEDES, False), (NEGATION_FOLLOWS, True)):
+                negated |= self._negated(starts, ends, doc_ids, sentiment, kinds == kind, follows, breaks)
+        weights = np.where(negated, -weights, weights)
+        return np.bincount(doc_ids[sentiment], weights=weights[sentiment], minlength=len(texts))
+
+    def score(self, texts):
+        """Signed sentiment scores in [-1, 1] (tanh of the net weight) for a column of reviews."""
+        return np.tanh(self.score_totals(texts))
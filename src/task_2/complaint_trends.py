@@ -0,0 +1,166 @@
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+from src.task_1.preprocessor import dedupe_keys
+
+
+class ComplaintTrends:
+    def __init__(self, trends_path='data/cache/complaint_trends.sqlite', ngram_range=(1, 3), stop_words='english'):
+        """Per-bank, per-day n-gram document frequencies, maintained incrementally in SQLite.
+
+        update() counts only reviews it has not seen (keyed by review, date and bank), vectorizing
+        just that batch, so a refresh costs time in the new data. emerging() compares a recent window
+        with the preceding baseline, reading only the days involved.
+        """
+        self.trends_path = trends_path
+        self.ngram_range = ngram_range
+        self.stop_words = stop_words
+        if trends_path != ':memory:':
+            os.makedirs(os.path.dirname(trends_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(trends_path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS ngram_docs (day TEXT NOT NULL, bank TEXT NOT NULL, ngram TEXT NOT NULL, "
+            "docs INTEGER NOT NULL, PRIMARY KEY (day, bank, ngram)) WITHOUT ROWID"
+        )
+        # Baseline lookups go by (bank, ngram) across days
+        self.conn.execute("CREATE INDEX IF NOT EXISTS ngram_docs_by_ngram ON ngram_docs (bank, ngram, day)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS day_docs (day TEXT NOT NULL, bank TEXT NOT NULL, docs INTEGER NOT NULL, "
+            "PRIMARY KEY (day, bank)) WITHOUT ROWID"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS reviews (key INTEGER PRIMARY KEY)")
+        self.conn.execute("CREATE TEMP TABLE batch (key INTEGER PRIMARY KEY)")
+        self.conn.commit()
+
+    def _new_rows(self, df):
+        """Mask of rows not counted before; records their keys in the current transaction."""
+        review = df['review'].fillna('').astype(str).to_numpy(dtype=object)
+        keys = dedupe_keys(review, df['date'].fillna(''), df['bank'].fillna('')).view(np.int64)
+        self.conn.execute("DELETE FROM batch")
+        self.conn.executemany("INSERT INTO batch VALUES (?)", ((key,) for key in np.unique(keys).tolist()))
+        existing = np.fromiter(
+            (row[0] for row in self.conn.execute("SELECT key FROM batch JOIN reviews USING (key)")),
+            dtype=np.int64
+        )
+        self.conn.execute("INSERT OR IGNORE INTO reviews SELECT key FROM batch")
+        first = ~pd.Series(keys).duplicated().to_numpy()
+        return first & ~np.isin(keys, existing)
+
+    def update(self, df):
+        """Count n-gram document frequencies of new reviews (review, bank, date) per bank and day.
+
+        Returns the number of reviews added; reviews without a valid date are skipped.
+        """
+        codes, dates = pd.factorize(df['date'].astype(str))
+        days = pd.to_datetime(pd.Series(dates), errors='coerce').dt.strftime('%Y-%m-%d').to_numpy()[codes]
+        df = df.assign(day=days)[pd.notna(days)]
+        if df.empty:
+            return 0
+        new = df[self._new_rows(df)]
+        if new.empty:
+            self.conn.commit()
+            return 0
+
+        group_codes, groups = pd.MultiIndex.from_arrays([new['bank'].astype(str), new['day']]).factorize()
+        self.conn.executemany(
+            "INSERT INTO day_docs VALUES (?, ?, ?) ON CONFLICT (day, bank) DO UPDATE SET docs = docs + excluded.docs",
+            ((day, bank, int(count)) for (bank, day), count in zip(groups, np.bincount(group_codes)))
+        )
+        try:
+            vectorizer = CountVectorizer(ngram_range=self.ngram_range, stop_words=self.stop_words, binary=True,
+                                         dtype=np.int32)
+            X = vectorizer.fit_transform(new['review'].fillna('').astype(str))
+        except ValueError:
+            # Nothing but stop words in this batch
+            self.conn.commit()
+            return len(new)
+
+        # One indicator product turns per-review presence into per-(bank, day) document counts
+        indicator = sparse.csr_matrix((np.ones(len(new), dtype=np.int32), (group_codes, np.arange(len(new)))),
+                                      shape=(len(groups), len(new)))
+        counts = (indicator @ X).tocoo()
+        ngrams = vectorizer.get_feature_names_out()
+        groups = list(groups)
+        self.conn.executemany(
+            "INSERT INTO ngram_docs VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (day, bank, ngram) DO UPDATE SET docs = docs + excluded.docs",
+            ((groups[g][1], groups[g][0], ngrams[f], count)
+             for g, f, count in zip(counts.row.tolist(), counts.col.tolist(), counts.data.tolist()))
+        )
+        self.conn.commit()
+        return len(new)
+
+    def latest_day(self):
+        row = self.conn.execute("SELECT MAX(day) FROM day_docs").fetchone()
+        return row[0]
+
+    def emerging(self, as_of=None, window_days=1, baseline_days=28, min_docs=5, min_ratio=3.0, min_z=3.0):
+        """N-grams whose document frequency in the window_days ending at as_of (latest day by default)
+        jumps above the rate of the preceding baseline_days, per bank.
+
+        expected = window reviews x (baseline docs + 1) / (baseline reviews + 1); an n-gram is flagged when
+        it appears in at least min_docs window reviews, window / expected >= min_ratio and the Poisson
+        z-score (window - expected) / sqrt(expected) >= min_z.
+        """
+        columns = ['bank', 'ngram', 'window_docs', 'baseline_docs', 'window_rate', 'baseline_rate', 'ratio', 'z']
+        as_of = as_of or self.latest_day()
+        if as_of is None:
+            return pd.DataFrame(columns=columns)
+        as_of = pd.Timestamp(as_of)
+        window_start = as_of - pd.Timedelta(days=window_days - 1)
+        baseline_start = window_start - pd.Timedelta(days=baseline_days)
+        baseline_end = window_start - pd.Timedelta(days=1)
+        window = (window_start.strftime('%Y-%m-%d'), as_of.strftime('%Y-%m-%d'))
+        baseline = (baseline_start.strftime('%Y-%m-%d'), baseline_end.strftime('%Y-%m-%d'))
+
+        totals = pd.read_sql_query(
+            "SELECT bank, SUM(CASE WHEN day >= ? THEN docs ELSE 0 END) AS window_reviews, "
+            "SUM(CASE WHEN day < ? THEN docs ELSE 0 END) AS baseline_reviews "
+            "FROM day_docs WHERE day BETWEEN ? AND ? GROUP BY bank",
+            self.conn, params=[window[0], window[0], baseline[0], window[1]]
+        )
+        counts = pd.read_sql_query(
+            "WITH win AS (SELECT bank, ngram, SUM(docs) AS window_docs FROM ngram_docs "
+            "WHERE day BETWEEN ? AND ? GROUP BY bank, ngram HAVING SUM(docs) >= ?) "
+            "SELECT win.bank, win.ngram, win.window_docs, COALESCE(SUM(base.docs), 0) AS baseline_docs "
+            "FROM win LEFT JOIN ngram_docs base ON base.bank = win.bank AND base.ngram = win.ngram "
+            "AND base.day BETWEEN ? AND ? GROUP BY win.bank, win.ngram",
+            self.conn, params=[*window, min_docs, *baseline]
+        )
+        if counts.empty:
+            return pd.DataFrame(columns=columns)
+
+        counts = counts.merge(totals, on='bank')
+        counts['window_rate'] = counts['window_docs'] / counts['window_reviews']
+        baseline_reviews = counts['baseline_reviews'].where(counts['baseline_reviews'] > 0)
+        counts['baseline_rate'] = counts['baseline_docs'] / baseline_reviews
+        expected = counts['window_reviews'] * (counts['baseline_docs'] + 1) / (counts['baseline_reviews'] + 1)
+        counts['ratio'] = counts['window_docs'] / expected
+        counts['z'] = (counts['window_docs'] - expected) / np.sqrt(expected)
+        flagged = counts[(counts['ratio'] >= min_ratio) & (counts['z'] >= min_z)]
+        return flagged.sort_values(['bank', 'z'], ascending=[True, False])[columns].reset_index(drop=True)
+
+    def prune(self, keep_days=365):
+        """Drop per-day counts older than keep_days before the latest day (review keys are kept)."""
+        latest = self.latest_day()
+        if latest is None:
+            return 0
+        cutoff = (pd.Timestamp(latest) - pd.Timedelta(days=keep_days)).strftime('%Y-%m-%d')
+        deleted = self.conn.execute("DELETE FROM ngram_docs WHERE day < ?", (cutoff,)).rowcount
+        self.conn.execute("DELETE FROM day_docs WHERE day < ?", (cutoff,))
+        self.conn.commit()
+        return deleted
+
+    def __len__(self):
+        """Number of reviews counted."""
+        return self.conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,154 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+
+from src.task_1.preprocessor import dedupe_keys
+from src.utils.seen_keys import SeenKeyStore
+from src.utils.sketches import CountMinSketch, SpaceSaving
+
+KEY_SEPARATOR = '\t'
+
+
+def normalize_bank(bank):
+    """Bank names as the preprocessor writes them (lowercased, stripped), so queries match either spelling."""
+    return str(bank).lower().strip()
+
+
+class HeavyHitterSketches:
+    def __init__(self, sketch_path='data/cache/heavy_hitters.npz', width=2 ** 13, depth=4, capacity=500,
+                 ngram_range=(1, 3), stop_words='english', seen_path=None):
+        """Count-Min + Space-Saving n-gram sketches per (bank, sentiment_label, month).
+
+        Each cell's memory is fixed (depth x width counters, capacity top-k entries) whatever the
+        history length, and cells merge across months, banks, labels or workers. Reviews already fed
+        are skipped through a SeenKeyStore (seen_path, next to sketch_path by default); their keys are
+        committed only by save(), after the sketches are written, so a crash in between recounts them
+        instead of losing them. Bank names are normalized like the preprocessor's.
+        """
+        self.sketch_path = sketch_path
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self.analyzer = CountVectorizer(ngram_range=ngram_range, stop_words=stop_words).build_analyzer()
+        self.count_min = {}
+        self.space_saving = {}
+        self.seen_path = seen_path
+        self.seen = None
+        if sketch_path and os.path.exists(sketch_path):
+            self.load(sketch_path)
+
+    def _cell(self, key):
+        if key not in self.count_min:
+            self.count_min[key] = CountMinSketch(self.width, self.depth)
+            self.space_saving[key] = SpaceSaving(self.capacity)
+        return self.count_min[key], self.space_saving[key]
+
+    def _new_rows(self, df):
+        if self.seen is None:
+            self.seen = SeenKeyStore(self.seen_path or (os.path.splitext(self.sketch_path)[0] + '_seen.sqlite'
+                                                        if self.sketch_path else None))
+        review = df['review'].fillna('').astype(str).to_numpy(dtype=object)
+        keys = dedupe_keys(review, df['date'].fillna(''), df['bank'].fillna(''))
+        first = ~pd.Series(keys).duplicated().to_numpy()
+        new = np.zeros(len(df), dtype=bool)
+        new[first] = self.seen.add_new(keys[first], commit=False)
+        return new
+
+    def update(self, df):
+        """Feed scored reviews (review, bank, sentiment_label, date) not seen before; returns how many."""
+        codes, dates = pd.factorize(df['date'].astype(str))
+        months = pd.to_datetime(pd.Series(dates), errors='coerce').dt.strftime('%Y-%m').to_numpy()[codes]
+        df = df.assign(month=months, bank=df['bank'].fillna('').map(normalize_bank))[pd.notna(months)]
+        if df.empty:
+            return 0
+        df = df[self._new_rows(df)]
+        for (bank, label, month), group in df.groupby(['bank', 'sentiment_label', 'month'], sort=False):
+            ngrams = pd.Series([ngram for review in group['review'].fillna('').astype(str)
+                                for ngram in self.analyzer(review)], dtype=object)
+            if ngrams.empty:
+                continue
+            counts = ngrams.value_counts(sort=False)
+            count_min, space_saving = self._cell((bank, label, month))
+            count_min.add(counts.index.to_numpy(), counts.to_numpy())
+            space_saving.add_counts(counts.index, counts.to_numpy())
+        return len(df)
+
+    def merge(self, other):
+        """Fold another collection (e.g. from another worker) into this one, cell by cell."""
+        for key in other.count_min:
+            count_min, space_saving = self._cell(key)
+            count_min.merge(other.count_min[key])
+            space_saving.merge(other.space_saving[key])
+        return self
+
+    def top(self, k=50, bank=None, label=None, start=None, end=None):
+        """Top-k n-grams over the cells matching bank / label and months start..end (inclusive, 'YYYY-MM').
+
+        count is the smaller of the Space-Saving and Count-Min estimates, both upper bounds;
+        count - error is a lower bound.
+        """
+        bank = normalize_bank(bank) if bank is not None else None
+        start = pd.Period(start, 'M').strftime('%Y-%m') if start else None
+        end = pd.Period(end, 'M').strftime('%Y-%m') if end else None
+        keys = [key for key in self.count_min
+                if (bank is None or key[0] == bank) and (label is None or key[1] == label)
+                and (start is None or key[2] >= start) and (end is None or key[2] <= end)]
+        if not keys:
+            return pd.DataFrame(columns=['ngram', 'count', 'error'])
+
+        count_min = CountMinSketch(self.width, self.depth)
+        space_saving = SpaceSaving(self.capacity)
+        for key in keys:
+            count_min.merge(self.count_min[key])
+            space_saving.merge(self.space_saving[key])
+        top = pd.DataFrame(space_saving.top(len(space_saving.counts)), columns=['ngram', 'count', 'error'])
+        top['count'] = np.minimum(top['count'], count_min.estimate(top['ngram'].to_numpy()))
+        top['error'] = np.minimum(top['error'], top['count'])
+        return top.sort_values(['count', 'ngram'], ascending=[False, True]).head(k).reset_index(drop=True)
+
+    def save(self, path=None):
+        """Write all cells to one .npz file (atomically), then commit the keys of the reviews they count."""
+        path = path or self.sketch_path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        keys = list(self.count_min)
+        meta = {
+            'width': self.width, 'depth': self.depth, 'capacity': self.capacity,
+            'keys': [KEY_SEPARATOR.join(key) for key in keys],
+            'space_saving': [[self.space_saving[key].counts, self.space_saving[key].errors] for key in keys],
+        }
+        tables = np.stack([self.count_min[key].table for key in keys]) if keys \
+            else np.zeros((0, self.depth, self.width), dtype=np.int64)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, meta=np.array(json.dumps(meta)), tables=tables)
+        os.replace(tmp_path, path)
+        if self.seen is not None:
+            self.seen.commit()
+        print(f"Saved {len(keys)} heavy-hitter sketch cells to {path}")
+
+    def load(self, path):
+        """Replace the cells with those saved at path."""
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            tables = data['tables']
+        self.width, self.depth, self.capacity = meta['width'], meta['depth'], meta['capacity']
+        self.count_min, self.space_saving = {}, {}
+        for i, (key, (counts, errors)) in enumerate(zip(meta['keys'], meta['space_saving'])):
+            key = tuple(key.split(KEY_SEPARATOR))
+            self.count_min[key] = CountMinSketch(self.width, self.depth, table=tables[i].copy())
+            self.space_saving[key] = SpaceSaving(self.capacity, counts, errors)
+        return self
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a saved collection without a default sketch_path (e.g. to merge it into another)."""
+        return cls(sketch_path=None).load(path)
+
+    def close(self):
+        """Close the seen-key store; keys of reviews fed since the last save() are dropped with them."""
+        if self.seen is not None:
+            self.seen.close()
+            self.seen = None
@@ -0,0 +1,144 @@
+import json
+import os
+
+import numpy as np
+import torch
+from transformers import AutoConfig, AutoTokenizer, pipeline
+
+from src.utils.sentiment_cache import model_revision
+
+ONNX_METADATA = 'onnx_export.json'
+
+
+def softmax(logits):
+    """Row-wise softmax of a logits matrix."""
+    shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return shifted / shifted.sum(axis=1, keepdims=True)
+
+
+class TorchBackend:
+    def __init__(self, sentiment_pipeline):
+        """Eager PyTorch inference through a transformers pipeline's model and tokenizer."""
+        self.pipeline = sentiment_pipeline
+        self.model = sentiment_pipeline.model
+        self.tokenizer = sentiment_pipeline.tokenizer
+        self.positive_id = self.model.config.label2id.get('POSITIVE', 1)
+        self.name = self.model.name_or_path
+        self.revision = model_revision(self.model)
+
+    def spec(self):
+        """(kind, source) from which load_backend() rebuilds this backend in another process."""
+        return ('torch', self.name)
+
+    def logits(self, input_ids, attention_mask):
+        """Logits for a padded batch of token ids."""
+        with torch.inference_mode():
+            logits = self.model(input_ids=torch.from_numpy(input_ids).to(self.model.device),
+                                attention_mask=torch.from_numpy(attention_mask).to(self.model.device)).logits
+        return logits.float().cpu().numpy()
+
+
+class OnnxBackend:
+    def __init__(self, model_dir='models/onnx/distilbert-sst2-int8', threads=None):
+        """ONNX Runtime CPU inference of a model exported with export_onnx().
+
+        threads caps ONNX Runtime's intra-op thread pool (default: one per core).
+        """
+        import onnxruntime as ort  # Optional dependency, only needed for this backend
+
+        with open(os.path.join(model_dir, ONNX_METADATA), encoding='utf-8') as f:
+            metadata = json.load(f)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(os.path.join(model_dir, metadata['file']), options,
+                                            providers=['CPUExecutionProvider'])
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.positive_id = AutoConfig.from_pretrained(model_dir).label2id.get('POSITIVE', 1)
+        self.name = metadata['model']
+        # Quantized scores differ slightly from the source model's, so they are cached separately
+        self.revision = f"{metadata['revision']}:onnx{'-int8' if metadata['quantized'] else ''}"
+        self.model_dir = model_dir
+
+    def spec(self):
+        """(kind, source) from which load_backend() rebuilds this backend in another process."""
+        return ('onnx', self.model_dir)
+
+    def logits(self, input_ids, attention_mask):
+        """Logits for a padded batch of token ids."""
+        return self.session.run(['logits'], {'input_ids': input_ids, 'attention_mask': attention_mask})[0]
+
+
+def load_backend(spec, threads=None):
+    """Build a CPU backend from a spec() tuple, limited to threads intra-op threads."""
+    kind, source = spec
+    if kind == 'onnx':
+        return OnnxBackend(source, threads=threads)
+    if threads:
+        torch.set_num_threads(threads)
+    return TorchBackend(pipeline("sentiment-analysis", model=source, device=-1))
+
+
+def export_onnx(sentiment_pipeline, output_dir='models/onnx/distilbert-sst2-int8', quantize=True, opset=14):
+    """Export a pipeline's sequence-classification model to ONNX, with dynamic int8 weight quantization.
+
+    The tokenizer, config and export metadata are saved alongside so OnnxBackend needs no PyTorch model.
+    """
+    model, tokenizer = sentiment_pipeline.model, sentiment_pipeline.tokenizer
+    os.makedirs(output_dir, exist_ok=True)
+    fp32_path = os.path.join(output_dir, 'model.onnx')
+
+    sample = tokenizer(['export sample'], return_tensors='pt')
+    model.eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            model, (sample['input_ids'], sample['attention_mask']), fp32_path,
+            input_names=['input_ids', 'attention_mask'], output_names=['logits'],
+            dynamic_axes={'input_ids': {0: 'batch', 1: 'sequence'},
+                          'attention_mask': {0: 'batch', 1: 'sequence'},
+                          'logits': {0: 'batch'}},
+            opset_version=opset
+        )
+
+    path = fp32_path
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        path = os.path.join(output_dir, 'model.int8.onnx')
+        quantize_dynamic(fp32_path, path, weight_type=QuantType.QInt8)
+
+    tokenizer.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+    metadata = {'model': model.name_or_path, 'revision': model_revision(model), 'quantized': quantize,
+                'file': os.path.basename(path)}
+    with open(os.path.join(output_dir, ONNX_METADATA), 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2)
+    print(f"Exported {model.name_or_path} to {path} ({os.path.getsize(path) / 2 ** 20:.1f} MB)")
+    return path
+
+
+def accuracy_drift(reference, candidate, texts, labels=None):
+    """Compare two SentimentAnalyzers' English scores on a held-out set.
+
+    labels (optional 'positive'/'negative'/'neutral' per text) adds each analyzer's accuracy.
+    """
+    from src.task_2.sentiment_analyzer import sentiment_labels
+
+    reference_scores = reference.score_english(texts)
+    candidate_scores = candidate.score_english(texts)
+    reference_labels = sentiment_labels(reference_scores)
+    candidate_labels = sentiment_labels(candidate_scores)
+    difference = np.abs(reference_scores - candidate_scores)
+
+    report = {
+        'reviews': len(texts),
+        'label_agreement': float((reference_labels == candidate_labels).mean()) if len(texts) else 1.0,
+        'max_score_diff': float(difference.max()) if len(texts) else 0.0,
+        'mean_score_diff': float(difference.mean()) if len(texts) else 0.0,
+    }
+    if labels is not None:
+        labels = np.asarray(labels, dtype=object)
+        report['reference_accuracy'] = float((reference_labels == labels).mean())
+        report['candidate_accuracy'] = float((candidate_labels == labels).mean())
+    return report
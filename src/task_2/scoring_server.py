@@ -0,0 +1,298 @@
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.task_1.preprocessor import NON_TEXT_PATTERN
+from src.task_2.sentiment_analyzer import sentiment_labels
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class LatencyTracker:
+    def __init__(self, window=10000):
+        """Rolling window of latencies in seconds, summarized as millisecond percentiles."""
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self):
+        if not self.samples:
+            return {'count': self.count, 'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'max_ms': None}
+        p50, p95, p99 = np.percentile(np.fromiter(self.samples, dtype=np.float64), [50, 95, 99]) * 1000
+        return {'count': self.count, 'p50_ms': round(p50, 2), 'p95_ms': round(p95, 2), 'p99_ms': round(p99, 2),
+                'max_ms': round(max(self.samples) * 1000, 2)}
+
+
+class MicroBatcher:
+    def __init__(self, score_batch, max_batch_size=32, max_wait_ms=5.0, executor=None):
+        """Collect concurrent submissions into batches for score_batch(list) -> list.
+
+        A batch runs when it holds max_batch_size items or its oldest item has waited max_wait_ms.
+        score_batch runs on executor (a dedicated thread by default) so the event loop stays responsive.
+        """
+        self.score_batch = score_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix='scoring')
+        self.pending = deque()
+        self.wakeup = None
+        self.task = None
+        self.max_queue_depth = 0
+        self.batches = 0
+        self.batched_items = 0
+        self.queue_wait = LatencyTracker()
+        self.batch_time = LatencyTracker()
+
+    @property
+    def queue_depth(self):
+        return len(self.pending)
+
+    def start(self):
+        """Start the batching loop on the running event loop."""
+        self.wakeup = asyncio.Event()
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the batching loop once in-flight batches are done."""
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        for _, future, _ in self.pending:
+            future.cancel()
+        self.pending.clear()
+
+    async def submit(self, item):
+        """Queue one item and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((item, future, time.perf_counter()))
+        self.max_queue_depth = max(self.max_queue_depth, len(self.pending))
+        self.wakeup.set()
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self.pending:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+
+            # Wait for a full batch, but never past the oldest item's deadline
+            deadline = self.pending[0][2] + self.max_wait
+            while len(self.pending) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            batch = [self.pending.popleft() for _ in range(min(self.max_batch_size, len(self.pending)))]
+            started = time.perf_counter()
+            for _, _, enqueued in batch:
+                self.queue_wait.record(started - enqueued)
+            try:
+                results = await loop.run_in_executor(self.executor, self.score_batch, [item for item, _, _ in batch])
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batch_time.record(time.perf_counter() - started)
+            self.batches += 1
+            self.batched_items += len(batch)
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def metrics(self):
+        return {
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'batches': self.batches,
+            'mean_batch_size': round(self.batched_items / self.batches, 2) if self.batches else None,
+            'queue_wait': self.queue_wait.summary(),
+            'batch_time': self.batch_time.summary(),
+        }
+
+
+class ScoringService:
+    def __init__(self, analyzer, max_batch_size=32, max_wait_ms=5.0):
+        """Per-review sentiment with the batch pipeline's routing: English model vs Amharic lexicon.
+
+        English reviews from concurrent requests share model batches through a MicroBatcher. Language
+        detection (langdetect plus its SQLite cache) and lexicon scoring also run off the event loop,
+        on a routing thread that takes whatever requests are queued as one batch without waiting.
+        """
+        self.analyzer = analyzer
+        self.batcher = MicroBatcher(self._score_english, max_batch_size, max_wait_ms)
+        self.router = MicroBatcher(self._route, max_batch_size, max_wait_ms=0,
+                                   executor=ThreadPoolExecutor(max_workers=1, thread_name_prefix='routing'))
+        self.latency = LatencyTracker()
+        self.routes = {'english': 0, 'amharic': 0, 'other': 0}
+
+    def _score_english(self, texts):
+        return self.analyzer.score_english(np.asarray(texts, dtype=object)).tolist()
+
+    def _route(self, items):
+        """(language, lexicon score or None) per (text, language or None), detecting missing languages in one call."""
+        texts = [text for text, _ in items]
+        languages = [language for _, language in items]
+        missing = [i for i, language in enumerate(languages) if not language]
+        if missing:
+            detected = self.analyzer.language_detector.detect_many([texts[i].strip() for i in missing])
+            for i, language in zip(missing, detected):
+                languages[i] = language if texts[i].strip() else 'unknown'
+        scores = [None] * len(items)
+        lexicon = [i for i, language in enumerate(languages) if language in ('amharic', 'bilingual')]
+        if lexicon:
+            for i, score in zip(lexicon, self.analyzer.lexicon_scorer.score([texts[i] for i in lexicon])):
+                scores[i] = float(score)
+        return list(zip(languages, scores))
+
+    def start(self):
+        self.batcher.start()
+        self.router.start()
+
+    async def stop(self):
+        await self.router.stop()
+        await self.batcher.stop()
+
+    async def score(self, review, language=None):
+        """Score one review; language is detected when not given."""
+        start = time.perf_counter()
+        # Same normalization as the preprocessor, so scores (and cache entries) match the batch pipeline
+        text = NON_TEXT_PATTERN.sub('', str(review or '').lower().strip())
+        lexicon_score = None
+        if language != 'english':
+            language, lexicon_score = await self.router.submit((text, language))
+
+        if language == 'english':
+            self.routes['english'] += 1
+            score = await self.batcher.submit(text)
+        elif language in ('amharic', 'bilingual'):
+            self.routes['amharic'] += 1
+            score = lexicon_score
+        else:
+            self.routes['other'] += 1
+            score = 0.0
+
+        elapsed = time.perf_counter() - start
+        self.latency.record(elapsed)
+        return {'label': sentiment_labels(np.array([score]))[0], 'score': score, 'language': language,
+                'latency_ms': round(elapsed * 1000, 3)}
+
+    def metrics(self):
+        return {'latency': self.latency.summary(), 'routes': dict(self.routes), 'batching': self.batcher.metrics(),
+                'routing': self.router.metrics()}
+
+
+class ScoringServer:
+    def __init__(self, service, host='127.0.0.1', port=8000):
+        """Minimal HTTP/1.1 JSON front end for a ScoringService.
+
+        POST /score {"review": ..., "language": optional} or {"reviews": [...], "languages": optional, one per
+        review}, GET /metrics, GET /health.
+        """
+        self.service = service
+        self.host = host
+        self.port = port
+        self.server = None
+
+    @property
+    def url(self):
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def start(self):
+        self.service.start()
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        print(f"Scoring server listening on {self.url}")
+        return self
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.service.stop()
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _route(self, method, path, body):
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/metrics':
+            return 200, self.service.metrics()
+        if path != '/score':
+            return 404, {'error': f"unknown path {path}"}
+        if method != 'POST':
+            return 405, {'error': "use POST"}
+        try:
+            request = json.loads(body or b'{}')
+        except json.JSONDecodeError as e:
+            return 400, {'error': f"invalid JSON: {e}"}
+        if 'reviews' in request:
+            languages = request.get('languages')
+            if languages is None:
+                languages = [None] * len(request['reviews'])
+            elif len(languages) != len(request['reviews']):
+                return 400, {'error': f"'languages' has {len(languages)} entries for {len(request['reviews'])} reviews"}
+            results = await asyncio.gather(*[
+                self.service.score(review, language) for review, language in zip(request['reviews'], languages)
+            ])
+            return 200, {'results': results}
+        if 'review' in request:
+            return 200, await self.service.score(request['review'], request.get('language'))
+        return 400, {'error': "expected 'review' or 'reviews'"}
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                try:
+                    status, payload = await self._route(method, path.split('?', 1)[0], body)
+                except Exception as e:
+                    status, payload = 500, {'error': str(e)}
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    .encode('latin-1') + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
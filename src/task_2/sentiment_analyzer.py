@@ -1,17 +1,77 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
 from transformers import pipeline
-from langdetect import detect, LangDetectException
 import torch
-import re
+from src.utils.language_detector import LanguageDetector, text_key
+from src.task_2.amharic_lexicon import LexiconScorer
+from src.task_2.inference_backends import TorchBackend, load_backend, softmax
+
+MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
+
+
+def sentiment_labels(scores):
+    """Map signed sentiment scores to positive / negative / neutral labels."""
+    return np.select([scores > 0.1, scores < -0.1], ['positive', 'negative'], 'neutral').astype(object)
+
+
+_worker_analyzer = None
+
+
+def _init_scoring_worker(spec, threads, batch_size, max_length):
+    """Load the model once per worker process, pinned to a fixed number of threads."""
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer(LanguageDetector(cache_path=None), batch_size, max_length,
+                                         backend=load_backend(spec, threads))
+
+
+def _score_shard(texts):
+    return _worker_analyzer._score_batched(texts)
+
 
 class SentimentAnalyzer:
-    def __init__(self):
-        """Initialize SentimentAnalyzer with DistilBERT model."""
-        self.sentiment_pipeline = pipeline(
-            "sentiment-analysis",
-            model="distilbert-base-uncased-finetuned-sst-2-english",
-            device=0 if torch.cuda.is_available() else -1
-        )
+    def __init__(self, language_detector=None, batch_size=32, max_length=512, sentiment_pipeline=None,
+                 sentiment_cache=None, backend=None, workers=1, threads_per_worker=None, shard_size=2000,
+                 lexicon_scorer=None, rollup=None, heavy_hitters=None):
+        """Initialize SentimentAnalyzer with DistilBERT model and a shared LanguageDetector (in-memory if None).
+
+        English reviews are scored batch_size at a time, truncated to max_length tokens, through backend
+        (a TorchBackend over the pipeline by default, or an OnnxBackend). With a SentimentCache, only
+        texts not yet scored by this exact model revision reach the model. With workers > 1, reviews are
+        split into shard_size shards scored by worker processes using threads_per_worker threads each.
+        Amharic and bilingual reviews are scored by lexicon_scorer (the bundled lexicon if None).
+        With a SentimentRollup, aggregates come from its persisted cube, which each run extends.
+        With HeavyHitterSketches, scored reviews also feed per-bank/label n-gram sketches.
+        """
+        self.language_detector = language_detector or LanguageDetector(cache_path=None)
+        self.lexicon_scorer = lexicon_scorer or LexiconScorer()
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+        self.shard_size = shard_size
+        if workers <= 1 and threads_per_worker:
+            torch.set_num_threads(threads_per_worker)
+        if backend is None:
+            backend = TorchBackend(sentiment_pipeline or pipeline(
+                "sentiment-analysis",
+                model=MODEL_NAME,
+                device=0 if torch.cuda.is_available() else -1
+            ))
+        self.backend = backend
+        self.sentiment_pipeline = getattr(backend, 'pipeline', None)
+        self.cache = sentiment_cache
+        if self.cache is not None:
+            self.cache.bind(backend.name, f"{backend.revision}:max_length={max_length}")
+        self.rollup = rollup
+        self.heavy_hitters = heavy_hitters
+        if self.rollup is not None:
+            # Amharic and bilingual scores come from the lexicon, so its fingerprint is part of the revision
+            self.rollup.bind(f"{backend.name}@{backend.revision}:max_length={max_length}"
+                             f":lexicon={self.lexicon_scorer.fingerprint}")
 
     def load_data(self, input_path='data/processed/bank_reviews_cleaned.csv'):
         """Load preprocessed review data from CSV."""
@@ -26,78 +86,147 @@ class SentimentAnalyzer:
             return pd.DataFrame()
 
     def detect_language(self, df):
-        """Detect language of each review, prioritizing Amharic for bilingual cases."""
-        def detect_lang(text):
-            try:
-                if not text or pd.isna(text) or text.strip() == '' or len(text.strip()) < 5:
-                    return 'unknown'
-                if re.search(r'[\u1200-\u137F]', text):
-                    return 'bilingual' if len(re.sub(r'[^\u1200-\u137F]', '', text)) < len(text) * 0.5 else 'amharic'
-                lang = detect(text)
-                if lang == 'en':
-                    return 'english'
-                return lang
-            except LangDetectException:
-                return 'unknown'
-
-        df['language'] = df['review'].apply(detect_lang)
+        """Detect language of each review, reusing the preprocessor's language column when present."""
+        if 'language' in df.columns and df['language'].notna().all():
+            print("Reusing existing language column.")
+            return df
+        df['language'] = self.language_detector.detect_series(df['review'])
         return df
 
-    def sentiment_analysis(self, df):
-        """Compute sentiment scores and categorize as positive, negative, or neutral."""
-        def get_sentiment(text):
-            if not text or pd.isna(text) or text.strip() == '':
-                return {'label': 'neutral', 'score': 0.0}
+    def score_english(self, texts):
+        """Signed transformer scores for texts, scoring each distinct text once and only on a cache miss."""
+        codes, uniques = pd.factorize(pd.Series(texts, dtype=object).fillna('').astype(str))
+        uniques = np.asarray(uniques, dtype=object)
+        unique_scores = np.full(len(uniques), np.nan)
+        missing = np.arange(len(uniques))
+
+        if self.cache is not None and len(uniques):
+            keys = [text_key(text) for text in uniques]
+            cached = self.cache.get_many(keys)
+            hit = np.fromiter((key in cached for key in keys), dtype=bool, count=len(keys))
+            unique_scores[hit] = [cached[key] for key, is_hit in zip(keys, hit) if is_hit]
+            missing = np.flatnonzero(~hit)
+
+        if self.workers > 1 and len(missing) > self.shard_size:
+            unique_scores[missing] = self._score_sharded(uniques[missing])
+        else:
+            unique_scores[missing] = self._score_batched(uniques[missing])
+
+        if self.cache is not None and len(missing):
+            # Batches that failed stay NaN and are retried next run
+            scored = missing[np.isfinite(unique_scores[missing])]
+            self.cache.put_many([keys[i] for i in scored], unique_scores[scored])
+        return np.nan_to_num(unique_scores[codes], nan=0.0)
+
+    def _score_sharded(self, texts):
+        """Score texts in shards across worker processes, reassembling results in input order."""
+        # Each shard is sorted by length on its own, so shards pad as tightly as the serial path
+        shards = [texts[i:i + self.shard_size] for i in range(0, len(texts), self.shard_size)]
+        print(f"Scoring {len(texts)} English reviews across {self.workers} processes "
+              f"x {self.threads_per_worker} threads ({len(shards)} shards)...")
+        scores = np.empty(len(texts), dtype=np.float64)
+        # spawn: forking a process whose torch thread pools are already running can deadlock
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_scoring_worker,
+                                 initargs=(self.backend.spec(), self.threads_per_worker, self.batch_size,
+                                           self.max_length)) as pool:
+            for i, shard_scores in enumerate(pool.map(_score_shard, shards)):
+                scores[i * self.shard_size:i * self.shard_size + len(shard_scores)] = shard_scores
+        return scores
+
+    def _score_batched(self, texts):
+        """Signed transformer scores for texts, computed in length-bucketed batches.
+
+        Reviews are tokenized once (truncated to max_length tokens), sorted by token length so each
+        batch pads to a similar length, and scored in batches of batch_size. Blank reviews score 0.0,
+        reviews in a batch that failed are NaN.
+        """
+        scores = np.zeros(len(texts), dtype=np.float64)
+        nonblank = np.flatnonzero([isinstance(text, str) and text.strip() != '' for text in texts])
+        if len(nonblank) == 0:
+            return scores
+
+        tokenizer = self.backend.tokenizer
+        input_ids = tokenizer([texts[i] for i in nonblank], truncation=True, max_length=self.max_length)['input_ids']
+        lengths = np.fromiter((len(ids) for ids in input_ids), dtype=np.int64, count=len(input_ids))
+        order = np.argsort(lengths, kind='stable')
+
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            # Pad the bucket into preallocated id/mask arrays sized to its longest review
+            ids = np.full((len(batch), lengths[batch[-1]]), tokenizer.pad_token_id, dtype=np.int64)
+            mask = np.zeros(ids.shape, dtype=np.int64)
+            for row, i in enumerate(batch):
+                ids[row, :lengths[i]] = input_ids[i]
+                mask[row, :lengths[i]] = 1
             try:
-                result = self.sentiment_pipeline(
-                    text[:512],
-                    clean_up_tokenization_spaces=False  # ✅ Fix for future transformers versions
-                )[0]
-                score = result['score'] if result['label'] == 'POSITIVE' else -result['score']
-                label = 'positive' if score > 0.1 else 'negative' if score < -0.1 else 'neutral'
-                return {'label': label, 'score': score}
+                probabilities = softmax(self.backend.logits(ids, mask).astype(np.float64))
             except Exception as e:
-                print(f"Sentiment error for English text '{text[:50]}...': {e}")
-                return {'label': 'neutral', 'score': 0.0}
-
-        def get_amharic_sentiment(text):
-            positive_words = ['ጥሩ', 'አሪፍ', 'በጣም ጥሩ', 'ተደሰትኩ', 'አመሰግናለሁ']
-            negative_words = ['መጥፎ', 'አይሰራም', 'ችግር', 'ተስፋ ቆሟል', 'ቅሬታ']
-            pos_count = sum(word in text for word in positive_words)
-            neg_count = sum(word in text for word in negative_words)
-
-            if pos_count > neg_count:
-                return {'label': 'positive', 'score': 0.7}
-            elif neg_count > pos_count:
-                return {'label': 'negative', 'score': -0.7}
-            else:
-                return {'label': 'neutral', 'score': 0.0}
-
-        df['sentiment_label'] = 'neutral'
-        df['sentiment_score'] = 0.0
-
-        english_mask = df['language'] == 'english'
-        if english_mask.any():
-            results = df.loc[english_mask, 'review'].apply(get_sentiment)
-            df.loc[english_mask, 'sentiment_label'] = results.apply(lambda x: x['label'])
-            df.loc[english_mask, 'sentiment_score'] = results.apply(lambda x: x['score'])
-            print(f"Processed sentiment for {english_mask.sum()} English reviews.")
-
-        amharic_mask = df['language'].isin(['amharic', 'bilingual'])
-        if amharic_mask.any():
-            results = df.loc[amharic_mask, 'review'].apply(get_amharic_sentiment)
-            df.loc[amharic_mask, 'sentiment_label'] = results.apply(lambda x: x['label'])
-            df.loc[amharic_mask, 'sentiment_score'] = results.apply(lambda x: x['score'])
-            print(f"Processed sentiment for {amharic_mask.sum()} Amharic/Bilingual reviews.")
+                print(f"Sentiment error for a batch of {len(batch)} English reviews: {e}")
+                scores[nonblank[batch]] = np.nan
+                continue
+            top = probabilities.argmax(axis=1)
+            top_score = probabilities[np.arange(len(batch)), top]
+            scores[nonblank[batch]] = np.where(top == self.backend.positive_id, top_score, -top_score)
+        return scores
+
+    def sentiment_analysis(self, df):
+        """Compute sentiment scores and categorize as positive, negative, or neutral."""
+        # Results are written into preallocated arrays and attached to the frame once
+        labels = np.full(len(df), 'neutral', dtype=object)
+        scores = np.zeros(len(df), dtype=np.float64)
+
+        # Near-duplicates flagged by the preprocessor reuse their group representative's score
+        if 'is_near_duplicate' in df.columns:
+            duplicate_mask = df['is_near_duplicate'].astype(bool).to_numpy()
+        else:
+            duplicate_mask = np.zeros(len(df), dtype=bool)
+
+        english = np.flatnonzero((df['language'] == 'english').to_numpy() & ~duplicate_mask)
+        if len(english):
+            scores[english] = self.score_english(df['review'].to_numpy()[english])
+            labels[english] = sentiment_labels(scores[english])
+            print(f"Processed sentiment for {len(english)} English reviews.")
+
+        amharic = np.flatnonzero(df['language'].isin(['amharic', 'bilingual']).to_numpy() & ~duplicate_mask)
+        if len(amharic):
+            scores[amharic] = self.lexicon_scorer.score(df['review'].to_numpy()[amharic])
+            labels[amharic] = sentiment_labels(scores[amharic])
+            print(f"Processed sentiment for {len(amharic)} Amharic/Bilingual reviews.")
+
+        df['sentiment_label'] = labels
+        df['sentiment_score'] = scores
+
+        if duplicate_mask.any():
+            df = self.propagate_near_duplicates(df, pd.Series(duplicate_mask, index=df.index))
 
         return df
 
+    def propagate_near_duplicates(self, df, duplicate_mask):
+        """Copy each near-duplicate group's representative sentiment onto the flagged rows."""
+        representatives = df.loc[~duplicate_mask].drop_duplicates('near_dup_group').set_index('near_dup_group')
+        groups = df.loc[duplicate_mask, 'near_dup_group']
+        found = groups.isin(representatives.index)
+        rows = groups.index[found]
+        df.loc[rows, 'sentiment_label'] = representatives['sentiment_label'].reindex(groups[found]).to_numpy()
+        df.loc[rows, 'sentiment_score'] = representatives['sentiment_score'].reindex(groups[found]).to_numpy()
+        print(f"Reused sentiment for {found.sum()} near-duplicate reviews.")
+        return df
+
     def aggregate_sentiment(self, df):
         """Aggregate sentiment scores by bank and rating."""
         if df.empty:
             print("Warning: No data to aggregate.")
             return pd.DataFrame()
 
+        if self.rollup is not None:
+            # Fold in new or re-scored reviews, then read bank x rating off the cube instead of rescanning rows
+            added = self.rollup.update(df)
+            print(f"Folded {added} new or re-scored reviews into the sentiment rollup ({len(self.rollup)} total).")
+            agg_df = self.rollup.query(['bank', 'rating'])[['bank', 'rating', 'mean', 'count']]
+            agg_df.columns = ['bank', 'rating', 'mean_sentiment_score', 'review_count']
+            return agg_df
+
         agg_df = df.groupby(['bank', 'rating']).agg({
             'sentiment_score': ['mean', 'count']
         }).reset_index()
@@ -134,6 +263,8 @@ class SentimentAnalyzer:
 
         print("Performing sentiment analysis...")
         df = self.sentiment_analysis(df)
+        if self.cache is not None:
+            print(f"Sentiment cache: {self.cache.hits} hits, {self.cache.misses} misses.")
 
         print("\nSample Sentiment Results (first 5 rows):\n")
         sample_df = df[['review', 'bank', 'rating', 'language', 'sentiment_label', 'sentiment_score']].head(5)
@@ -148,6 +279,12 @@ class SentimentAnalyzer:
 
         print(f"Total reviews processed: {len(df)}\n")
 
+        if self.heavy_hitters is not None:
+            added = self.heavy_hitters.update(df)
+            print(f"Fed {added} new reviews to the heavy-hitter sketches.")
+            self.heavy_hitters.save()
+            self.heavy_hitters.close()
+
         print("Saving results...")
         success = self.save_results(df, agg_df)
         if success:
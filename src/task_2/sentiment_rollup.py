@@ -0,0 +1,188 @@
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from src.task_1.preprocessor import dedupe_keys
+
+DIMENSIONS = ['bank', 'rating', 'language', 'sentiment_label', 'day']
+FREQUENCIES = ('D', 'W', 'M', 'Q', 'Y')
+# Each review's current contribution, so a re-score can be taken back out of its old cell
+REVIEW_SCHEMA = ("key INTEGER PRIMARY KEY, bank TEXT NOT NULL, rating INTEGER NOT NULL, language TEXT NOT NULL, "
+                 "sentiment_label TEXT NOT NULL, day TEXT NOT NULL, score REAL NOT NULL, digest INTEGER NOT NULL")
+
+
+def summarize(cells, by):
+    """Collapse (count, total, total_sq) cells over the columns in by into mean, std and a 95% CI."""
+    grouped = cells.groupby(by, sort=True, observed=True)[['count', 'total', 'total_sq']].sum().reset_index()
+    count = grouped['count'].to_numpy(dtype=np.float64)
+    mean = grouped['total'].to_numpy() / count
+    # Sample variance from the mergeable sums; clip the float error of near-constant groups
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = np.clip(grouped['total_sq'].to_numpy() - count * mean ** 2, 0, None) / (count - 1)
+        std = np.where(count > 1, np.sqrt(variance), np.nan)
+    grouped['count'] = grouped['count'].astype(np.int64)
+    grouped['mean'] = mean
+    grouped['std'] = std
+    grouped['ci95'] = 1.96 * std / np.sqrt(count)
+    return grouped.drop(columns=['total', 'total_sq'])
+
+
+class SentimentRollup:
+    def __init__(self, rollup_path='data/cache/sentiment_rollup.sqlite'):
+        """Persisted sentiment cube over bank x rating x language x sentiment_label x day.
+
+        Each cell holds the review count, score sum and sum of squared scores, which add across
+        batches and collapse to any coarser grouping (bank, month, ...) without the raw rows.
+        Reviews are keyed by (review, date, bank) and remember their cell and score, so re-feeding
+        history adds only new reviews and moves re-scored ones to their new cell.
+        """
+        self.rollup_path = rollup_path
+        if rollup_path != ':memory:':
+            os.makedirs(os.path.dirname(rollup_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(rollup_path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cells ("
+            "bank TEXT NOT NULL, rating INTEGER NOT NULL, language TEXT NOT NULL, sentiment_label TEXT NOT NULL, "
+            "day TEXT NOT NULL, count INTEGER NOT NULL, total REAL NOT NULL, total_sq REAL NOT NULL, "
+            "PRIMARY KEY (bank, rating, language, sentiment_label, day)) WITHOUT ROWID"
+        )
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(reviews)")]
+        if columns and 'digest' not in columns:
+            # Cubes from before per-review contributions were kept cannot take re-scores; start over
+            print("Sentiment rollup predates per-review scores; rebuilding.")
+            self.conn.execute("DROP TABLE reviews")
+            self.conn.execute("DELETE FROM cells")
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS reviews ({REVIEW_SCHEMA})")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.conn.execute("CREATE TEMP TABLE batch (key INTEGER PRIMARY KEY, digest INTEGER NOT NULL)")
+        self.conn.commit()
+
+    def bind(self, revision):
+        """Tie the cube to the scoring revision (model and lexicon); cells scored by another revision are discarded."""
+        row = self.conn.execute("SELECT value FROM meta WHERE name = 'revision'").fetchone()
+        if row is not None and row[0] != revision:
+            print(f"Sentiment rollup was built with {row[0]}; rebuilding for {revision}.")
+            self.reset()
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('revision', ?)", (revision,))
+        self.conn.commit()
+
+    def reset(self):
+        """Drop every cell and review."""
+        self.conn.execute("DELETE FROM cells")
+        self.conn.execute("DELETE FROM reviews")
+        self.conn.commit()
+
+    def _review_rows(self, df):
+        """One row per distinct (review, date, bank) key: key, cell dimensions, score and their digest."""
+        review = df['review'].fillna('').astype(str).to_numpy(dtype=object)
+        keys = dedupe_keys(review, df['date'].fillna(''), df['bank'].fillna('')).view(np.int64)
+        # Unparseable dates keep an empty day: they count in totals but not in trends
+        codes, dates = pd.factorize(df['date'].astype(str))
+        days = pd.to_datetime(pd.Series(dates), errors='coerce').dt.strftime('%Y-%m-%d').fillna('').to_numpy()[codes]
+        rows = pd.DataFrame({
+            'key': keys,
+            'bank': df['bank'].fillna('').astype(str).to_numpy(),
+            'rating': df['rating'].astype(np.int64).to_numpy(),
+            'language': df['language'].fillna('unknown').astype(str).to_numpy(),
+            'sentiment_label': df['sentiment_label'].fillna('neutral').astype(str).to_numpy(),
+            'day': days,
+            'score': df['sentiment_score'].astype(np.float64).to_numpy(),
+        })
+        rows['digest'] = pd.util.hash_pandas_object(rows.iloc[:, 1:], index=False).to_numpy().view(np.int64)
+        # Repeats inside one batch count once, like rows the preprocessor already deduplicated
+        return rows.drop_duplicates('key')
+
+    def _changed(self, rows):
+        """Keys of rows that are new or whose digest differs from the stored one; stages them in batch."""
+        self.conn.execute("DELETE FROM batch")
+        # Sorted, distinct keys append to the B-tree instead of splitting pages at random
+        self.conn.executemany("INSERT INTO batch VALUES (?, ?)",
+                              zip(rows['key'].tolist(), rows['digest'].tolist()))
+        self.conn.execute("DELETE FROM batch WHERE EXISTS "
+                          "(SELECT 1 FROM reviews r WHERE r.key = batch.key AND r.digest = batch.digest)")
+        return np.fromiter((row[0] for row in self.conn.execute("SELECT key FROM batch")), dtype=np.int64)
+
+    def update(self, df):
+        """Fold scored reviews (bank, rating, language, sentiment_label, date, sentiment_score) into the cube.
+
+        New reviews are added; a review seen before with a different score or cell (re-scored, or
+        first stored with a fallback) has its old contribution subtracted and the new one added.
+        Unchanged reviews cost only the lookup. Returns the number of reviews added or re-scored.
+        """
+        df = df[df['sentiment_score'].notna()]
+        if df.empty:
+            return 0
+        if 'date' not in df.columns:
+            df = df.assign(date='')
+        rows = self._review_rows(df).sort_values('key')
+        fresh = rows[np.isin(rows['key'].to_numpy(), self._changed(rows))]
+        if fresh.empty:
+            self.conn.commit()
+            return 0
+
+        # Contributions the changed reviews replace, taken back out of their old cells
+        stale = pd.read_sql_query(
+            f"SELECT {', '.join(DIMENSIONS)}, score FROM reviews WHERE key IN (SELECT key FROM batch)", self.conn
+        )
+        deltas = pd.concat([
+            pd.DataFrame({**{column: part[column] for column in DIMENSIONS}, 'count': sign,
+                          'total': sign * part['score'], 'total_sq': sign * part['score'] ** 2})
+            for part, sign in ((fresh, 1), (stale, -1)) if not part.empty
+        ], ignore_index=True)
+        cells = deltas.groupby(DIMENSIONS, sort=False)[['count', 'total', 'total_sq']].sum().reset_index()
+        self.conn.executemany(
+            "INSERT INTO cells VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (bank, rating, language, sentiment_label, day) DO UPDATE SET "
+            "count = count + excluded.count, total = total + excluded.total, total_sq = total_sq + excluded.total_sq",
+            zip(*(cells[column].tolist() for column in cells.columns))
+        )
+        self.conn.execute("DELETE FROM cells WHERE count = 0")
+        self.conn.executemany(f"INSERT OR REPLACE INTO reviews VALUES ({', '.join('?' * len(fresh.columns))})",
+                              zip(*(column.tolist() for _, column in fresh.items())))
+        self.conn.commit()
+        return len(fresh)
+
+    def cells(self, by, dated=False, **filters):
+        """Cells pre-aggregated in SQL over by (plus day when dated), optionally filtered by dimension values."""
+        group = list(by) + (['day'] if dated and 'day' not in by else [])
+        unknown = set(group) - set(DIMENSIONS) or set(filters) - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown rollup dimensions: {sorted(unknown)}")
+        where, params = ["day != ''"] if dated else [], []
+        for name, value in filters.items():
+            values = [value] if np.isscalar(value) else list(value)
+            where.append(f"{name} IN ({','.join('?' * len(values))})")
+            params.extend(values)
+        columns = ', '.join(group)
+        query = (f"SELECT {columns + ', ' if group else ''}SUM(count) AS count, SUM(total) AS total, "
+                 f"SUM(total_sq) AS total_sq FROM cells"
+                 f"{' WHERE ' + ' AND '.join(where) if where else ''}"
+                 f"{' GROUP BY ' + columns if group else ''}")
+        return pd.read_sql_query(query, self.conn, params=params).dropna(subset=['count'])
+
+    def query(self, by=('bank',), freq=None, **filters):
+        """Count, mean, std and 95% CI of sentiment_score grouped by dimensions in by.
+
+        freq ('D', 'W', 'M', 'Q' or 'Y') adds a 'period' column (period start) for trends; filters
+        restrict dimensions, e.g. language='english' or bank=['Dashen Bank', 'Bank of Abyssinia'].
+        """
+        by = list(by)
+        cells = self.cells(by, dated=freq is not None, **filters)
+        if freq is None:
+            return summarize(cells.assign(_all=0), by or ['_all']).drop(columns=['_all'], errors='ignore')
+        if freq not in FREQUENCIES:
+            raise ValueError(f"freq must be one of {sorted(FREQUENCIES)}, got {freq!r}")
+        cells['period'] = pd.to_datetime(cells.pop('day')).dt.to_period(freq).dt.start_time
+        return summarize(cells, by + ['period'])
+
+    def __len__(self):
+        """Number of reviews folded into the cube."""
+        return self.conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+
+    def close(self):
+        """Close the persistent cube."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,104 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer
+
+
+class StreamingKeywordExtractor:
+    def __init__(self, n_features=2 ** 20, ngram_range=(1, 3), stop_words='english', sample_per_chunk=2000,
+                 reverse_map_size=50000):
+        """Out-of-core TF-IDF keywords per group over a fixed-size hashed n-gram space.
+
+        Each chunk adds to global document frequencies and per-group sums of l2-normalized term
+        frequencies (n_features float32 values per group); IDF is applied when keywords are read, so
+        memory does not grow with the corpus. N-gram strings are recovered through an approximate
+        reverse map built from up to sample_per_chunk reviews spread over each chunk, keeping the
+        reverse_map_size features with the highest document frequency.
+        """
+        self.n_features = n_features
+        self.sample_per_chunk = sample_per_chunk
+        self.reverse_map_size = reverse_map_size
+        self.vectorizer = HashingVectorizer(n_features=n_features, ngram_range=ngram_range, stop_words=stop_words,
+                                            alternate_sign=False, norm='l2', dtype=np.float32)
+        self.analyzer = self.vectorizer.build_analyzer()
+        self.hasher = FeatureHasher(n_features, input_type='string', alternate_sign=False)
+        self.doc_freq = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+        self.groups = []
+        self.group_index = {}
+        self.tf_sums = np.zeros((0, n_features), dtype=np.float32)
+        self.reverse_map = {}
+
+    def partial_fit(self, reviews, groups):
+        """Fold one chunk of reviews (with their group labels, e.g. bank) into the running statistics."""
+        reviews = pd.Series(reviews).fillna('').astype(str).to_numpy(dtype=object)
+        groups = np.asarray(groups, dtype=object)
+        if len(reviews) == 0:
+            return self
+        X = self.vectorizer.transform(reviews)
+
+        self.doc_freq += np.bincount(X.indices, minlength=self.n_features)
+        self.n_docs += X.shape[0]
+
+        for group in pd.unique(groups):
+            if group not in self.group_index:
+                self.group_index[group] = len(self.groups)
+                self.groups.append(group)
+        if len(self.groups) > self.tf_sums.shape[0]:
+            grown = np.zeros((len(self.groups), self.n_features), dtype=np.float32)
+            grown[:self.tf_sums.shape[0]] = self.tf_sums
+            self.tf_sums = grown
+        codes = np.fromiter((self.group_index[group] for group in groups), dtype=np.int64, count=len(groups))
+        indicator = sparse.csr_matrix((np.ones(len(codes), dtype=np.float32), (codes, np.arange(len(codes)))),
+                                      shape=(len(self.groups), X.shape[0]))
+        sums = (indicator @ X).tocoo()
+        self.tf_sums[sums.row, sums.col] += sums.data
+
+        self._update_reverse_map(reviews[::max(1, len(reviews) // self.sample_per_chunk)][:self.sample_per_chunk])
+        return self
+
+    def _update_reverse_map(self, sample):
+        """Record which n-grams hash to each feature, for a sample of the chunk."""
+        ngrams = [ngram for review in sample for ngram in self.analyzer(review)]
+        if not ngrams:
+            return
+        features = self.hasher.transform([[ngram] for ngram in ngrams]).indices
+        for feature, ngram in zip(features.tolist(), ngrams):
+            self.reverse_map.setdefault(feature, Counter())[ngram] += 1
+        if len(self.reverse_map) > self.reverse_map_size:
+            mapped = np.fromiter(self.reverse_map, dtype=np.int64, count=len(self.reverse_map))
+            evict = mapped[np.argpartition(-self.doc_freq[mapped], self.reverse_map_size)[self.reverse_map_size:]]
+            for feature in evict.tolist():
+                del self.reverse_map[feature]
+
+    def keyword(self, feature):
+        """Most frequent sampled n-gram hashing to feature (None if it was never sampled or was evicted)."""
+        ngrams = self.reverse_map.get(feature)
+        return ngrams.most_common(1)[0][0] if ngrams else None
+
+    def idf(self):
+        """Smoothed IDF, as in TfidfTransformer."""
+        return np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1
+
+    def top_keywords(self, top_n=20):
+        """Top-n keywords per group with scores (summed tf x idf) and ranks, over reverse-mapped features only."""
+        idf = self.idf().astype(np.float32)
+        mapped = np.fromiter(self.reverse_map, dtype=np.int64, count=len(self.reverse_map))
+        rows = []
+        for g, group in enumerate(self.groups):
+            scores = self.tf_sums[g, mapped] * idf[mapped]
+            candidates = np.flatnonzero(scores > 0)
+            if len(candidates) > top_n:
+                candidates = candidates[np.argpartition(-scores[candidates], top_n - 1)[:top_n]]
+            candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+            for rank, i in enumerate(candidates, start=1):
+                rows.append((group, self.keyword(int(mapped[i])), float(scores[i]), rank))
+        return pd.DataFrame(rows, columns=['group', 'keyword', 'score', 'rank'])
+
+    @property
+    def memory_bytes(self):
+        """Size of the fixed-size statistics (excluding the bounded reverse map)."""
+        return self.doc_freq.nbytes + self.tf_sums.nbytes
@@ -1,11 +1,22 @@
+import numpy as np
 import pandas as pd
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 import os
+from src.task_2.complaint_trends import ComplaintTrends
+from src.task_2.streaming_keywords import StreamingKeywordExtractor
+from src.task_2.theme_discovery import ThemeDiscovery
+from src.task_2.theme_tagger import ThemeTagger
 
 class ThemeAnalyzer:
-    def __init__(self, input_path='data/processed/bank_reviews_cleaned.csv'):
+    def __init__(self, input_path='data/processed/bank_reviews_cleaned.csv', max_features=20000):
+        """Theme analysis over English/bilingual reviews; TF-IDF keeps the max_features most frequent n-grams."""
         self.input_path = input_path
+        self.max_features = max_features
         self.df = pd.DataFrame()
+        self.tfidf = None
+        self.tfidf_matrix = None
+        self.feature_names = None
 
         # Define keyword groups manually for now
         self.theme_keywords = {
@@ -22,29 +33,63 @@ class ThemeAnalyzer:
             df = df[df['language'].isin(['english', 'bilingual'])]
             print(f"Loaded {len(df)} reviews for Thematic Analysis.")
             self.df = df
+            self.tfidf_matrix = None
             return df
         except FileNotFoundError:
             print(f"Error: File {self.input_path} not found.")
             return pd.DataFrame()
 
+    def fit_tfidf(self):
+        """Vectorize all loaded reviews once over a shared vocabulary (and IDF), cached for every grouping."""
+        if self.tfidf_matrix is None:
+            self.tfidf = TfidfVectorizer(
+                max_features=self.max_features,
+                stop_words='english',
+                ngram_range=(1, 3),
+                dtype=np.float32
+            )
+            self.tfidf_matrix = self.tfidf.fit_transform(self.df['review'].fillna('').astype(str))
+            self.feature_names = self.tfidf.get_feature_names_out()
+            print(f"Vectorized {self.tfidf_matrix.shape[0]} reviews over {len(self.feature_names)} shared n-grams.")
+        return self.tfidf_matrix
+
+    def keyword_scores(self, group_columns=('bank',), top_n=20):
+        """Top-n TF-IDF keywords per group, from one sparse indicator-matrix product.
+
+        Scores are summed TF-IDF weights over a vocabulary and IDF shared by all groups, so they are
+        comparable across groups. Returns the group columns plus keyword, score and rank.
+        """
+        X = self.fit_tfidf()
+        group_columns = list(group_columns)
+        # Reviews missing a group value (e.g. an unparseable date) belong to no group
+        valid = np.flatnonzero(self.df[group_columns].notna().all(axis=1).to_numpy())
+        codes, groups = pd.MultiIndex.from_frame(self.df[group_columns].iloc[valid]).factorize()
+        # Row g of the indicator matrix selects group g's reviews; one product sums every group at once
+        indicator = sparse.csr_matrix(
+            (np.ones(len(valid), dtype=np.float32), (codes, valid)),
+            shape=(len(groups), X.shape[0])
+        )
+        sums = (indicator @ X).tocsr()
+        rows = []
+        for g in range(len(groups)):
+            row_scores = sums.data[sums.indptr[g]:sums.indptr[g + 1]]
+            row_features = sums.indices[sums.indptr[g]:sums.indptr[g + 1]]
+            top = np.arange(len(row_scores))
+            if len(row_scores) > top_n:
+                top = np.argpartition(-row_scores, top_n - 1)[:top_n]
+            # Only the top_n candidates are sorted: by score, ties by keyword
+            top = top[np.lexsort((self.feature_names[row_features[top]], -row_scores[top]))]
+            for rank, i in enumerate(top, start=1):
+                rows.append((*groups[g], self.feature_names[row_features[i]], float(row_scores[i]), rank))
+        return pd.DataFrame(rows, columns=group_columns + ['keyword', 'score', 'rank'])
+
     def extract_keywords_per_bank(self, top_n=20):
         """Extract and categorize TF-IDF keywords per bank."""
+        scores = self.keyword_scores(['bank'], top_n)
         results = {}
-        for bank in self.df['bank'].unique():
+        for bank, bank_scores in scores.groupby('bank', sort=False):
             print(f"\n--- Extracting keywords for {bank} ---\n")
-            bank_reviews = self.df[self.df['bank'] == bank]['review']
-
-            tfidf = TfidfVectorizer(
-                max_features=100,
-                stop_words='english',
-                ngram_range=(1, 3)
-            )
-            X = tfidf.fit_transform(bank_reviews)
-            feature_names = tfidf.get_feature_names_out()
-            scores = X.sum(axis=0).A1
-            sorted_items = sorted(zip(scores, feature_names), reverse=True)
-
-            top_keywords = [(word, round(score, 2)) for score, word in sorted_items[:top_n]]
+            top_keywords = [(word, round(score, 2)) for word, score in zip(bank_scores['keyword'], bank_scores['score'])]
             themed_keywords = self.group_keywords_by_theme(top_keywords)
 
             results[bank] = themed_keywords
@@ -57,6 +102,41 @@ class ThemeAnalyzer:
 
         return results
 
+    def extract_keywords_streaming(self, top_n=20, chunksize=100000, **extractor_options):
+        """Per-bank keywords read from input_path in chunks, with a fixed-memory hashed feature space.
+
+        For corpora too large for fit_tfidf; extractor_options go to StreamingKeywordExtractor.
+        """
+        extractor = StreamingKeywordExtractor(**extractor_options)
+        try:
+            chunks = pd.read_csv(self.input_path, encoding='utf-8', usecols=['review', 'bank', 'language'],
+                                 chunksize=chunksize)
+            for i, chunk in enumerate(chunks, start=1):
+                chunk = chunk[chunk['language'].isin(['english', 'bilingual'])]
+                extractor.partial_fit(chunk['review'], chunk['bank'])
+                print(f"Chunk {i}: {extractor.n_docs} reviews, {len(extractor.reverse_map)} n-grams mapped.")
+        except FileNotFoundError:
+            print(f"Error: File {self.input_path} not found.")
+            return {}
+
+        results = {}
+        for bank, bank_scores in extractor.top_keywords(top_n).groupby('group', sort=False):
+            top_keywords = [(word, round(score, 2)) for word, score in zip(bank_scores['keyword'], bank_scores['score'])]
+            results[bank] = self.group_keywords_by_theme(top_keywords)
+            print(f"Top keywords for {bank}: {', '.join(word for word, _ in top_keywords)}")
+        return results
+
+    def extract_keywords_per_month(self, top_n=20, output_path='data/analysis/monthly_keywords.csv'):
+        """Top TF-IDF keywords per bank and month, sharing the per-bank vectorization."""
+        months = pd.to_datetime(self.df['date'], errors='coerce').dt.to_period('M').astype(str)
+        self.df = self.df.assign(month=months.where(months != 'NaT'))
+        scores = self.keyword_scores(['bank', 'month'], top_n)
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        scores.to_csv(output_path, index=False, encoding='utf-8')
+        print(f"Saved monthly keywords for {scores[['bank', 'month']].drop_duplicates().shape[0]} bank-months "
+              f"to {output_path}")
+        return scores
+
     def group_keywords_by_theme(self, keywords):
         """Group keywords under predefined themes."""
         theme_map = {theme: [] for theme in self.theme_keywords.keys()}
@@ -73,6 +153,58 @@ class ThemeAnalyzer:
                 theme_map["Other"].append((word, score))
         return theme_map
 
+    def discover_themes(self, n_themes=8, output_path='data/analysis/discovered_themes.csv', **discovery_options):
+        """Cluster loaded reviews into n_themes data-driven themes (LSA + MiniBatchKMeans) and save their shares per bank.
+
+        Returns the fitted ThemeDiscovery, whose partial_fit folds in new reviews.
+        """
+        discovery = ThemeDiscovery(n_themes=n_themes, **discovery_options).fit(self.df['review'])
+        summary = discovery.summary(self.df['review'], self.df['bank']).rename(columns={'group': 'bank'})
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        summary.to_csv(output_path, index=False, encoding='utf-8')
+        for theme_id, label in enumerate(discovery.labels):
+            print(f"Theme {theme_id}: {label}")
+        print(f"Saved discovered themes to {output_path}")
+        return discovery
+
+    def detect_emerging_complaints(self, trends=None, output_path='data/analysis/emerging_complaints.csv', **options):
+        """Fold loaded reviews into the per-bank, per-day n-gram counts and save n-grams spiking above baseline.
+
+        options go to ComplaintTrends.emerging (window_days, baseline_days, min_docs, min_ratio, min_z).
+        """
+        trends = trends or ComplaintTrends()
+        added = trends.update(self.df)
+        print(f"Counted n-grams of {added} new reviews ({len(trends)} total).")
+        flagged = trends.emerging(**options)
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        flagged.to_csv(output_path, index=False, encoding='utf-8')
+        for bank, bank_flagged in flagged.groupby('bank'):
+            print(f"Emerging for {bank}: {', '.join(bank_flagged['ngram'].head(10))}")
+        print(f"Saved {len(flagged)} emerging n-grams to {output_path}")
+        return flagged
+
+    def tag_reviews(self, df):
+        """Tag every review with the themes whose keywords it mentions (whole words), in one pass.
+
+        Adds 'theme' (first matching theme, or 'Other') and 'themes' ('|'-joined matches).
+        """
+        tagger = ThemeTagger(self.theme_keywords)
+        df = tagger.tag(df)
+        print(f"Tagged {len(df)} reviews; {int((df['theme'] != tagger.other_label).sum())} mention a theme.")
+        return df
+
+    def tag_results(self, results_path='data/processed/sentiment_results.csv'):
+        """Add theme columns to the per-review sentiment results, for the database and visualizations."""
+        try:
+            df = pd.read_csv(results_path, encoding='utf-8')
+        except FileNotFoundError:
+            print(f"Skipping review tagging: {results_path} not found.")
+            return pd.DataFrame()
+        df = self.tag_reviews(df)
+        df.to_csv(results_path, index=False, encoding='utf-8')
+        print(f"Saved per-review themes to {results_path}")
+        return df
+
     def save_keywords(self, results, output_dir='data/analysis'):
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
@@ -88,7 +220,23 @@ class ThemeAnalyzer:
             df_keywords.to_csv(output_path, index=False, encoding='utf-8')
             print(f"Saved themed keywords for {bank} to {output_path}")
 
-    def run_pipeline(self):
+    def run_pipeline(self, streaming=False, discover=None, trends=False):
+        """Extract, group and save keywords, then tag reviews; streaming reads the input in chunks.
+
+        discover=N also clusters the reviews into N data-driven themes; trends updates the
+        incremental n-gram counts and reports emerging complaints.
+        """
+        if streaming:
+            print("Extracting keywords in streaming mode...")
+            grouped_results = self.extract_keywords_streaming()
+            if not grouped_results:
+                print("Error: No data to process.")
+                return False
+            print("Saving results...")
+            self.save_keywords(grouped_results)
+            print("\n--- Thematic Analysis completed. ---")
+            return True
+
         print("Loading data...")
         df = self.load_data()
         if df.empty:
@@ -101,5 +249,20 @@ class ThemeAnalyzer:
         print("Saving results...")
         self.save_keywords(grouped_results)
 
+        if 'date' in df.columns:
+            print("Extracting keywords per bank and month...")
+            self.extract_keywords_per_month()
+
+        if trends and 'date' in df.columns:
+            print("Detecting emerging complaints...")
+            self.detect_emerging_complaints()
+
+        if discover:
+            print(f"Discovering {discover} themes...")
+            self.discover_themes(discover)
+
+        print("Tagging reviews with themes...")
+        self.tag_results()
+
         print("\n--- Thematic Analysis completed. ---")
         return True
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+
+class ThemeDiscovery:
+    def __init__(self, n_themes=8, n_components=100, max_features=20000, batch_size=4096, n_epochs=2,
+                 svd_sample=200000, top_terms=6, random_state=42):
+        """Unsupervised themes: TF-IDF -> truncated SVD (LSA) -> MiniBatchKMeans, all on sparse input.
+
+        SVD is fitted on at most svd_sample reviews; reviews are then projected and clustered
+        batch_size rows at a time, so only one dense batch exists at once. Each theme is labelled
+        with the top_terms n-grams of its centroid mapped back to term space.
+        """
+        self.n_themes = n_themes
+        self.n_components = n_components
+        self.batch_size = batch_size
+        self.n_epochs = n_epochs
+        self.svd_sample = svd_sample
+        self.top_terms = top_terms
+        self.random_state = random_state
+        self.vectorizer = TfidfVectorizer(max_features=max_features, stop_words='english', ngram_range=(1, 2),
+                                          min_df=2, sublinear_tf=True, dtype=np.float32)
+        self.svd = None
+        self.kmeans = MiniBatchKMeans(n_clusters=n_themes, batch_size=batch_size, random_state=random_state,
+                                      n_init=3)
+        self.labels = []
+
+    def _project(self, X):
+        """Unit-length LSA coordinates for rows of a TF-IDF matrix."""
+        return normalize(self.svd.transform(X)).astype(np.float32)
+
+    def _batches(self, X):
+        for start in range(0, X.shape[0], self.batch_size):
+            yield self._project(X[start:start + self.batch_size])
+
+    def fit(self, reviews):
+        """Learn the vocabulary, LSA space and themes from reviews."""
+        X = self.vectorizer.fit_transform(pd.Series(reviews).fillna('').astype(str))
+        rng = np.random.default_rng(self.random_state)
+        sample = X
+        if X.shape[0] > self.svd_sample:
+            sample = X[np.sort(rng.choice(X.shape[0], self.svd_sample, replace=False))]
+        n_components = min(self.n_components, X.shape[1] - 1, sample.shape[0] - 1)
+        self.svd = TruncatedSVD(n_components=n_components, algorithm='randomized', random_state=self.random_state)
+        self.svd.fit(sample)
+        print(f"LSA: {X.shape[0]} reviews, {X.shape[1]} terms -> {n_components} components "
+              f"({self.svd.explained_variance_ratio_.sum():.1%} of variance).")
+
+        # Best of n_init k-means++ runs on a sample seeds the centroids, then shuffled mini-batch passes refine them
+        seed = rng.choice(X.shape[0], min(X.shape[0], max(4 * self.batch_size, self.n_themes * 10)), replace=False)
+        self.kmeans.fit(self._project(X[np.sort(seed)]))
+        for _ in range(self.n_epochs):
+            order = rng.permutation(X.shape[0])
+            for start in range(0, len(order), self.batch_size):
+                self.kmeans.partial_fit(self._project(X[np.sort(order[start:start + self.batch_size])]))
+        self._label_themes()
+        return self
+
+    def partial_fit(self, reviews):
+        """Update the themes with new reviews, keeping the fitted vocabulary and LSA space."""
+        X = self.vectorizer.transform(pd.Series(reviews).fillna('').astype(str))
+        for batch in self._batches(X):
+            self.kmeans.partial_fit(batch)
+        self._label_themes()
+        return self
+
+    def predict(self, reviews):
+        """Theme id per review."""
+        X = self.vectorizer.transform(pd.Series(reviews).fillna('').astype(str))
+        if X.shape[0] == 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([self.kmeans.predict(batch) for batch in self._batches(X)])
+
+    def _label_themes(self):
+        """Label each theme with the strongest terms of its centroid projected back to term space."""
+        terms = self.vectorizer.get_feature_names_out()
+        weights = self.svd.inverse_transform(self.kmeans.cluster_centers_)
+        k = min(self.top_terms, weights.shape[1])
+        top = np.argpartition(-weights, k - 1, axis=1)[:, :k]
+        top = np.take_along_axis(top, np.argsort(-np.take_along_axis(weights, top, axis=1), axis=1), axis=1)
+        self.labels = [', '.join(terms[row]) for row in top]
+        return self.labels
+
+    def summary(self, reviews, groups=None):
+        """Theme id, label and review count (per group when groups, e.g. banks, are given)."""
+        frame = pd.DataFrame({'theme_id': self.predict(reviews)})
+        frame['group'] = 'all' if groups is None else np.asarray(groups, dtype=object)
+        counts = frame.groupby(['group', 'theme_id']).size().rename('reviews').reset_index()
+        counts['label'] = [self.labels[theme] for theme in counts['theme_id']]
+        counts['share'] = counts['reviews'] / counts.groupby('group')['reviews'].transform('sum')
+        return counts
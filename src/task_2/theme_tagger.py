@@ -0,0 +1,83 @@
+import re
+from functools import reduce
+from operator import or_
+
+import numpy as np
+import pandas as pd
+
+from src.utils.trie_pattern import trie_pattern
+
+DOCUMENT_SEPARATOR = '\n'
+THEME_SEPARATOR = '|'
+MAX_THEMES = 64
+
+# Keywords match whole words only: 'app' tags "the app crashed" but not "happy" or "apply"
+WORD_BOUNDARY = r'(?<!\w){}(?!\w)'
+
+
+class ThemeTagger:
+    def __init__(self, theme_keywords, other_label='Other'):
+        """Multi-label review tagger compiled from {theme: [keywords]}.
+
+        All keywords share one trie-shaped regex, so a column of reviews is tagged in a single scan.
+        Each review gets a bitmask with bit i set when it mentions a keyword of the i-th theme.
+        """
+        if len(theme_keywords) > MAX_THEMES:
+            raise ValueError(f"At most {MAX_THEMES} themes fit in a bitmask, got {len(theme_keywords)}")
+        self.themes = list(theme_keywords)
+        self.other_label = other_label
+
+        term_masks = {}
+        for bit, keywords in enumerate(theme_keywords.values()):
+            for keyword in keywords:
+                term = ' '.join(keyword.lower().split())
+                if term:
+                    term_masks[term] = term_masks.get(term, 0) | (1 << bit)
+        # The lookahead reports the longest keyword at every word start; shorter keywords that start at the
+        # same place (or sit inside it) are folded into its mask, so every keyword occurrence is counted
+        self.term_masks = {
+            term: np.uint64(reduce(or_, [mask for other, mask in term_masks.items()
+                                         if re.search(WORD_BOUNDARY.format(re.escape(other)), term)]))
+            for term in term_masks
+        }
+        self.pattern = re.compile('(?=' + WORD_BOUNDARY.format('(' + trie_pattern(self.term_masks) + ')') + ')')
+
+    def bitmasks(self, texts):
+        """uint64 theme bitmask per text (0 when no keyword matches)."""
+        texts = [' '.join(text.lower().split()) if isinstance(text, str) else '' for text in texts]
+        masks = np.zeros(len(texts), dtype=np.uint64)
+        if not texts:
+            return masks
+
+        # One regex pass over the joined column; match offsets map back to reviews
+        lengths = np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=len(texts))
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        matches = [(m.start(), m[1]) for m in self.pattern.finditer(DOCUMENT_SEPARATOR.join(texts))]
+        if not matches:
+            return masks
+
+        starts = np.fromiter((start for start, _ in matches), dtype=np.int64, count=len(matches))
+        codes, terms = pd.factorize(np.array([term for _, term in matches], dtype=object))
+        term_masks = np.array([self.term_masks[term] for term in terms], dtype=np.uint64)[codes]
+        np.bitwise_or.at(masks, np.searchsorted(offsets, starts, side='right') - 1, term_masks)
+        return masks
+
+    def matrix(self, masks):
+        """Boolean (reviews x themes) matrix for bitmasks, columns in theme order."""
+        bits = np.uint64(1) << np.arange(len(self.themes), dtype=np.uint64)
+        return (np.asarray(masks, dtype=np.uint64)[:, None] & bits) != 0
+
+    def labels(self, masks):
+        """(primary theme, all themes joined by '|') per bitmask; the primary theme is the first in theme order."""
+        codes, uniques = pd.factorize(np.asarray(masks, dtype=np.uint64))
+        primary, joined = [], []
+        for row in self.matrix(uniques):
+            names = [theme for theme, hit in zip(self.themes, row) if hit] or [self.other_label]
+            primary.append(names[0])
+            joined.append(THEME_SEPARATOR.join(names))
+        return np.array(primary, dtype=object)[codes], np.array(joined, dtype=object)[codes]
+
+    def tag(self, df, column='review'):
+        """Add 'theme' (primary theme) and 'themes' (all matched themes) columns to df."""
+        df['theme'], df['themes'] = self.labels(self.bitmasks(df[column].tolist()))
+        return df
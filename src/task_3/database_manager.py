@@ -1,96 +1,177 @@
 # src/task_3/database_manager.py
 
-import psycopg2
+import time
+
+import numpy as np
 import pandas as pd
 
+from src.task_1.preprocessor import dedupe_keys
+from src.task_3.storage_backends import (REVIEW_COLUMNS, REVIEW_KEY_INDEX, REVIEW_KEY_INDEX_SQL, REVIEW_SOURCES,
+                                         UPDATABLE_COLUMNS, PostgresBackend, SQLiteBackend)
+
+
 class DatabaseManager:
-    def __init__(self, db_name, user, password, host='localhost', port=5432):
-        """Initialize DatabaseManager with connection parameters."""
-        self.conn = psycopg2.connect(
-            dbname=db_name,
-            user=user,
-            password=password,
-            host=host,
-            port=port
-        )
-        self.cursor = self.conn.cursor()
-        print("Connected to PostgreSQL database.")
+    def __init__(self, db_name=None, user=None, password=None, host='localhost', port=5432, backend=None):
+        """Schema, idempotent bulk loads and queries over a storage backend.
 
-    def create_tables(self):
-        """Create banks and reviews tables."""
-        banks_table_sql = """
-        CREATE TABLE IF NOT EXISTS banks (
-            bank_id SERIAL PRIMARY KEY,
-            bank_name VARCHAR(255) UNIQUE NOT NULL
-        );
+        Connects to PostgreSQL with the given parameters unless another backend (e.g. SQLiteBackend)
+        is passed; backends share the schema and differ only in dialect-specific statements.
         """
+        self.backend = backend or PostgresBackend(db_name, user, password, host, port)
+        self.conn = self.backend.conn
+        self.cursor = self.backend.cursor
 
-        reviews_table_sql = """
-        CREATE TABLE IF NOT EXISTS reviews (
-            review_id SERIAL PRIMARY KEY,
-            bank_id INT REFERENCES banks(bank_id),
-            review TEXT,
-            rating INT,
-            review_date DATE,
-            source VARCHAR(100),
-            sentiment_label VARCHAR(50),
-            sentiment_score FLOAT,
-            theme VARCHAR(100)
-        );
-        """
+    @classmethod
+    def sqlite(cls, path='data/database/bank_reviews.sqlite'):
+        """DatabaseManager over an embedded SQLite file (no server needed)."""
+        return cls(backend=SQLiteBackend(path))
 
-        self.cursor.execute(banks_table_sql)
-        self.cursor.execute(reviews_table_sql)
+    def create_tables(self):
+        """Create banks and reviews tables, keying any reviews loaded before review_key existed."""
+        for statement in self.backend.schema():
+            self.cursor.execute(statement)
+        self.backfill_review_keys()
+        self.cursor.execute(REVIEW_KEY_INDEX_SQL)
         self.conn.commit()
         print("Tables created (if not exist).")
 
+    def backfill_review_keys(self):
+        """Fill in review_key and row_hash for reviews stored without them, then drop duplicate reviews.
+
+        Such rows predate the natural key (or were written by an older loader); left NULL they would
+        be loaded again as new reviews. The unique index is dropped while keys are assigned, and of
+        each set of reviews sharing a key only the latest review_id (the most recent load) is kept.
+        Returns the number of duplicate reviews deleted.
+        """
+        legacy = self.query(
+            f"SELECT r.review_id, {', '.join('r.' + column for column in REVIEW_COLUMNS[1:8])}, b.bank_name AS bank "
+            "FROM reviews r LEFT JOIN banks b USING (bank_id) WHERE r.review_key IS NULL"
+        )
+        if legacy.empty:
+            return 0
+        print(f"Backfilling natural keys for {len(legacy)} reviews loaded before review_key existed...")
+        self.cursor.execute(f"DROP INDEX IF EXISTS {REVIEW_KEY_INDEX}")
+        rows = self._key_rows(legacy[REVIEW_COLUMNS[1:8]].copy(), legacy['bank'])
+        self.backend.set_review_keys(list(zip(legacy['review_id'].tolist(), rows['review_key'].tolist(),
+                                              rows['row_hash'].tolist())))
+        self.cursor.execute(
+            "DELETE FROM reviews WHERE review_id NOT IN (SELECT MAX(review_id) FROM reviews GROUP BY review_key)"
+        )
+        deleted = self.cursor.rowcount
+        print(f"Keyed {len(legacy)} reviews; deleted {deleted} duplicates.")
+        return deleted
+
     def insert_banks(self, bank_names):
-        """Insert banks and return bank_id mapping."""
-        bank_id_map = {}
-        for bank_name in bank_names:
-            self.cursor.execute("""
-                INSERT INTO banks (bank_name)
-                VALUES (%s)
-                ON CONFLICT (bank_name) DO NOTHING
-                RETURNING bank_id;
-            """, (bank_name,))
-            
-            result = self.cursor.fetchone()
-            if result is not None:
-                bank_id_map[bank_name] = result[0]
-            else:
-                self.cursor.execute("SELECT bank_id FROM banks WHERE bank_name = %s", (bank_name,))
-                bank_id_map[bank_name] = self.cursor.fetchone()[0]
+        """Insert missing banks and return the bank_id mapping, resolving all banks in one batch."""
+        bank_names = [str(name) for name in pd.unique(pd.Series(bank_names, dtype=object).dropna())]
+        bank_id_map = {bank_name: bank_id for bank_id, bank_name in self.backend.resolve_banks(bank_names)}
 
         self.conn.commit()
-        print("Banks inserted/verified.")
+        print(f"Banks inserted/verified ({len(bank_id_map)}).")
         return bank_id_map
 
-    def insert_reviews(self, df, bank_id_map):
-        """Insert reviews from DataFrame."""
-        inserted_count = 0
-        for _, row in df.iterrows():
-            self.cursor.execute("""
-                INSERT INTO reviews (
-                    bank_id, review, rating, review_date, source, sentiment_label, sentiment_score, theme
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                bank_id_map[row['bank']],
-                row['review'],
-                row['rating'],
-                row['date'],
-                row['source'],
-                row.get('sentiment_label', None),
-                row.get('sentiment_score', None),
-                row.get('theme', None)
-            ))
-            inserted_count += 1
+    def review_rows(self, df, bank_id_map):
+        """Reviews as a frame in REVIEW_COLUMNS order, with bank ids mapped in one vectorized pass."""
+        bank_ids = df['bank'].map(bank_id_map)
+        unknown = df.loc[bank_ids.isna(), 'bank'].unique()
+        if len(unknown):
+            raise ValueError(f"Banks missing from bank_id_map: {list(unknown)}")
+        rows = pd.DataFrame({'bank_id': bank_ids.astype('int64')}, index=df.index)
+        for column, source in zip(REVIEW_COLUMNS[1:], REVIEW_SOURCES):
+            rows[column] = df[source] if source in df.columns else None
+        rows = self._key_rows(rows, df['bank'])
+        # A key may appear once per merge statement; the last occurrence wins, as it would on a re-run
+        return rows.drop_duplicates('review_key', keep='last')
 
+    def _key_rows(self, rows, banks):
+        """Normalize rating and review_date in rows, then add review_key and row_hash (banks are bank names)."""
+        rows['rating'] = pd.to_numeric(rows['rating'], errors='coerce').astype('Int64')
+        # Parse each distinct date once; format='mixed' keeps one odd format from voiding the rest
+        codes, dates = pd.factorize(rows['review_date'])
+        days = pd.to_datetime(pd.Series(dates, dtype=object), errors='coerce', format='mixed').dt.strftime('%Y-%m-%d')
+        rows['review_date'] = np.where(codes >= 0, days.to_numpy(dtype=object)[codes], None)
+        rows['review_key'] = dedupe_keys(
+            rows['review'].fillna('').astype(str).to_numpy(dtype=object), rows['review_date'].fillna(''),
+            banks.astype(str)
+        ).view(np.int64)
+        rows['row_hash'] = pd.util.hash_pandas_object(rows[UPDATABLE_COLUMNS], index=False).to_numpy().view(np.int64)
+        return rows
+
+    def insert_reviews(self, df, bank_id_map, chunk_size=50000, method='copy'):
+        """Load reviews from DataFrame idempotently, committing every chunk_size rows.
+
+        Each chunk is staged, then merged on review_key: new reviews are inserted, reviews whose
+        rating, source, sentiment or theme changed are updated in place and the rest are left alone,
+        so re-running a load (or retrying a failed one) writes only the difference.
+
+        On PostgreSQL, method='copy' stages chunks through COPY FROM STDIN and switches to execute_values
+        if the server refuses COPY; method='values' uses execute_values throughout. Returns the number of
+        rows inserted or updated.
+        """
+        rows = self.review_rows(df, bank_id_map)
+        self.backend.create_staging()
         self.conn.commit()
-        print(f"{inserted_count} reviews inserted into reviews table.")
+        total = len(rows)
+        loaded = inserted_count = updated_count = 0
+        start = time.perf_counter()
+        for offset in range(0, total, chunk_size):
+            chunk = rows.iloc[offset:offset + chunk_size]
+            method = self.backend.stage(chunk, method)
+            inserted, updated = self.backend.merge_staging()
+            self.conn.commit()
+            loaded += len(chunk)
+            inserted_count += inserted
+            updated_count += updated
+            elapsed = time.perf_counter() - start
+            print(f"Merged {loaded}/{total} reviews ({loaded / max(elapsed, 1e-9):,.0f} rows/s): "
+                  f"{inserted_count} new, {updated_count} updated.")
+
+        print(f"{inserted_count} reviews inserted, {updated_count} updated, "
+              f"{total - inserted_count - updated_count} unchanged.")
+        return inserted_count + updated_count
+
+    def query(self, sql, params=()):
+        """Run a SELECT and return its rows as a DataFrame (placeholders in the backend's style)."""
+        self.cursor.execute(sql, params)
+        return pd.DataFrame(self.cursor.fetchall(), columns=[column[0] for column in self.cursor.description])
+
+    def fetch_reviews(self, bank=None):
+        """Stored reviews in the pipeline's CSV layout (review, rating, date, bank, ...), optionally for one bank."""
+        where, params = '', ()
+        if bank is not None:
+            where, params = f"WHERE b.bank_name = {self.backend.placeholder}", (bank,)
+        reviews = self.query(
+            "SELECT r.review, r.rating, r.review_date AS date, b.bank_name AS bank, r.source, "
+            "r.sentiment_label, r.sentiment_score, r.theme "
+            f"FROM reviews r JOIN banks b USING (bank_id) {where} ORDER BY r.review_id", params
+        )
+        reviews['date'] = pd.to_datetime(reviews['date']).dt.strftime('%Y-%m-%d')
+        return reviews
+
+    def sentiment_summary(self, by=('bank',)):
+        """Review count, mean rating, mean sentiment score and label shares per bank and/or month.
+
+        by is any of 'bank' and 'month'; the aggregation runs in the database.
+        """
+        expressions = {'bank': 'b.bank_name', 'month': self.backend.month('r.review_date')}
+        unknown = set(by) - set(expressions)
+        if unknown:
+            raise ValueError(f"Cannot group by {sorted(unknown)}; choose from {sorted(expressions)}")
+        keys = ', '.join(f"{expressions[column]} AS {column}" for column in by)
+        summary = self.query(
+            f"SELECT {keys}, COUNT(*) AS reviews, AVG(r.rating) AS mean_rating, "
+            "AVG(r.sentiment_score) AS mean_sentiment, "
+            "AVG(CASE WHEN r.sentiment_label = 'positive' THEN 1.0 ELSE 0.0 END) AS positive_share, "
+            "AVG(CASE WHEN r.sentiment_label = 'negative' THEN 1.0 ELSE 0.0 END) AS negative_share "
+            f"FROM reviews r JOIN banks b USING (bank_id) "
+            f"GROUP BY {', '.join(expressions[column] for column in by)} "
+            f"ORDER BY {', '.join(expressions[column] for column in by)}"
+        )
+        # PostgreSQL averages come back as Decimal
+        metrics = ['mean_rating', 'mean_sentiment', 'positive_share', 'negative_share']
+        summary[metrics] = summary[metrics].astype(float)
+        return summary
 
     def close(self):
         """Close DB connection."""
-        self.cursor.close()
-        self.conn.close()
-        print("PostgreSQL connection closed.")
+        self.backend.close()
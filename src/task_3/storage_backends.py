@@ -0,0 +1,268 @@
+# src/task_3/storage_backends.py
+
+import csv
+import io
+import os
+import sqlite3
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+REVIEW_COLUMNS = ['bank_id', 'review', 'rating', 'review_date', 'source', 'sentiment_label', 'sentiment_score', 'theme',
+                  'review_key', 'row_hash']
+# DataFrame column feeding each reviews column after bank_id (review_key and row_hash are derived)
+REVIEW_SOURCES = ['review', 'rating', 'date', 'source', 'sentiment_label', 'sentiment_score', 'theme']
+# Columns refreshed in place when a review is loaded again; row_hash fingerprints them
+UPDATABLE_COLUMNS = ['rating', 'source', 'sentiment_label', 'sentiment_score', 'theme']
+# COPY's NULL marker; the preprocessor strips backslashes, so no review text collides with it
+COPY_NULL = r'\N'
+# PostgreSQL's per-session staging table
+STAGING_TABLE = 'reviews_staging'
+# Unique index enforcing the natural key; created once rows loaded before it existed have their keys
+REVIEW_KEY_INDEX = 'reviews_review_key'
+REVIEW_KEY_INDEX_SQL = f"CREATE UNIQUE INDEX IF NOT EXISTS {REVIEW_KEY_INDEX} ON reviews (review_key);"
+
+
+def _rows(chunk):
+    """Chunk rows as tuples of Python values, with None for missing ones."""
+    columns = []
+    for _, column in chunk.items():
+        values = column.to_numpy(dtype=object)
+        values[column.isna().to_numpy()] = None
+        columns.append(values.tolist())
+    return list(zip(*columns))
+
+
+class PostgresBackend:
+    def __init__(self, db_name, user, password, host='localhost', port=5432):
+        """PostgreSQL storage: chunks are staged through COPY FROM STDIN and merged with one upsert."""
+        self.conn = psycopg2.connect(
+            dbname=db_name,
+            user=user,
+            password=password,
+            host=host,
+            port=port
+        )
+        self.cursor = self.conn.cursor()
+        self.placeholder = '%s'
+        print("Connected to PostgreSQL database.")
+
+    def schema(self):
+        """DDL statements creating (or upgrading) the banks and reviews tables."""
+        banks_table_sql = """
+        CREATE TABLE IF NOT EXISTS banks (
+            bank_id SERIAL PRIMARY KEY,
+            bank_name VARCHAR(255) UNIQUE NOT NULL
+        );
+        """
+
+        reviews_table_sql = """
+        CREATE TABLE IF NOT EXISTS reviews (
+            review_id SERIAL PRIMARY KEY,
+            bank_id INT REFERENCES banks(bank_id),
+            review TEXT,
+            rating INT,
+            review_date DATE,
+            source VARCHAR(100),
+            sentiment_label VARCHAR(50),
+            sentiment_score FLOAT,
+            theme VARCHAR(100)
+        );
+        """
+
+        # review_key is the natural key (hash of review text, date and bank name) that makes loads idempotent;
+        # ALTER ... IF NOT EXISTS upgrades tables created before it existed (DatabaseManager fills in their keys)
+        natural_key_sql = """
+        ALTER TABLE reviews ADD COLUMN IF NOT EXISTS review_key BIGINT;
+        ALTER TABLE reviews ADD COLUMN IF NOT EXISTS row_hash BIGINT;
+        """
+        return [banks_table_sql, reviews_table_sql, natural_key_sql]
+
+    def set_review_keys(self, rows, page_size=1000):
+        """Write (review_id, review_key, row_hash) rows onto existing reviews with batched UPDATE ... FROM VALUES."""
+        execute_values(
+            self.cursor,
+            "UPDATE reviews SET review_key = v.review_key, row_hash = v.row_hash "
+            "FROM (VALUES %s) AS v (review_id, review_key, row_hash) WHERE reviews.review_id = v.review_id",
+            rows, page_size=page_size
+        )
+
+    def resolve_banks(self, bank_names):
+        """[(bank_id, bank_name)] for bank_names, inserting missing banks, in one statement."""
+        # The outer SELECT reads the snapshot before the insert, so new banks come from RETURNING
+        self.cursor.execute("""
+            WITH input AS (SELECT unnest(%s::text[]) AS bank_name),
+            added AS (
+                INSERT INTO banks (bank_name) SELECT bank_name FROM input
+                ON CONFLICT (bank_name) DO NOTHING
+                RETURNING bank_id, bank_name
+            )
+            SELECT bank_id, bank_name FROM added
+            UNION ALL
+            SELECT bank_id, bank_name FROM banks JOIN input USING (bank_name);
+        """, (bank_names,))
+        return self.cursor.fetchall()
+
+    def create_staging(self):
+        """Session-local staging table with the reviews columns (no SERIAL default, no indexes)."""
+        self.cursor.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} AS "
+            f"SELECT {', '.join(REVIEW_COLUMNS)} FROM reviews WITH NO DATA"
+        )
+
+    def _copy_chunk(self, chunk):
+        """Stream one chunk into the staging table through COPY FROM STDIN as CSV; NULLs are written as \\N."""
+        buffer = io.StringIO()
+        chunk.to_csv(buffer, header=False, index=False, na_rep=COPY_NULL, quoting=csv.QUOTE_MINIMAL)
+        buffer.seek(0)
+        self.cursor.copy_expert(
+            f"COPY {STAGING_TABLE} ({', '.join(REVIEW_COLUMNS)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            buffer
+        )
+
+    def _insert_values_chunk(self, chunk, page_size=1000):
+        """Stage one chunk with multi-row INSERT statements (for servers or proxies that refuse COPY)."""
+        execute_values(
+            self.cursor, f"INSERT INTO {STAGING_TABLE} ({', '.join(REVIEW_COLUMNS)}) VALUES %s", _rows(chunk),
+            page_size=page_size
+        )
+
+    def stage(self, chunk, method='copy'):
+        """Stage one chunk; returns the method used, which drops to 'values' once the server refuses COPY."""
+        if method == 'copy':
+            try:
+                self._copy_chunk(chunk)
+                return method
+            except psycopg2.Error as e:
+                self.conn.rollback()
+                print(f"COPY failed ({e.__class__.__name__}: {str(e).strip()}); falling back to execute_values.")
+        self._insert_values_chunk(chunk)
+        return 'values'
+
+    def merge_staging(self):
+        """Upsert the staged rows into reviews by review_key, touching only new or changed rows.
+
+        Returns (inserted, updated); xmax = 0 marks a freshly inserted row version.
+        """
+        updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in UPDATABLE_COLUMNS + ['row_hash'])
+        self.cursor.execute(f"""
+            WITH merged AS (
+                INSERT INTO reviews ({', '.join(REVIEW_COLUMNS)})
+                SELECT {', '.join(REVIEW_COLUMNS)} FROM {STAGING_TABLE}
+                ON CONFLICT (review_key) DO UPDATE SET {updates}
+                WHERE reviews.row_hash IS DISTINCT FROM EXCLUDED.row_hash
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT COUNT(*) FILTER (WHERE inserted), COUNT(*) FILTER (WHERE NOT inserted) FROM merged;
+        """)
+        inserted, updated = self.cursor.fetchone()
+        self.cursor.execute(f"TRUNCATE {STAGING_TABLE}")
+        return inserted, updated
+
+    def month(self, column):
+        """SQL expression for a DATE column's 'YYYY-MM' month."""
+        return f"to_char({column}, 'YYYY-MM')"
+
+    def close(self):
+        """Close DB connection."""
+        self.cursor.close()
+        self.conn.close()
+        print("PostgreSQL connection closed.")
+
+
+class SQLiteBackend:
+    def __init__(self, path='data/database/bank_reviews.sqlite', cache_mb=256):
+        """Embedded SQLite storage with the PostgreSQL schema, for laptops and tests (no server needed).
+
+        Dates are stored as 'YYYY-MM-DD' text; path=':memory:' keeps the database in memory. cache_mb
+        bounds the page cache, which should hold the review_key index for fast merges.
+        """
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        # Negative cache_size is in KiB
+        self.conn.execute(f"PRAGMA cache_size = -{int(cache_mb * 1024)}")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.cursor = self.conn.cursor()
+        self.placeholder = '?'
+        print(f"Opened SQLite database at {path}.")
+
+    def schema(self):
+        """DDL statements creating the banks and reviews tables."""
+        banks_table_sql = """
+        CREATE TABLE IF NOT EXISTS banks (
+            bank_id INTEGER PRIMARY KEY,
+            bank_name TEXT UNIQUE NOT NULL
+        );
+        """
+
+        reviews_table_sql = """
+        CREATE TABLE IF NOT EXISTS reviews (
+            review_id INTEGER PRIMARY KEY,
+            bank_id INTEGER REFERENCES banks(bank_id),
+            review TEXT,
+            rating INTEGER,
+            review_date TEXT,
+            source TEXT,
+            sentiment_label TEXT,
+            sentiment_score REAL,
+            theme TEXT,
+            review_key INTEGER,
+            row_hash INTEGER
+        );
+        """
+        return [banks_table_sql, reviews_table_sql]
+
+    def set_review_keys(self, rows):
+        """Write (review_id, review_key, row_hash) rows onto existing reviews."""
+        self.cursor.executemany("UPDATE reviews SET review_key = ?, row_hash = ? WHERE review_id = ?",
+                                ((key, row_hash, review_id) for review_id, key, row_hash in rows))
+
+    def resolve_banks(self, bank_names):
+        """[(bank_id, bank_name)] for bank_names, inserting missing banks."""
+        self.cursor.executemany("INSERT INTO banks (bank_name) VALUES (?) ON CONFLICT (bank_name) DO NOTHING",
+                                ((name,) for name in bank_names))
+        self.cursor.execute(
+            f"SELECT bank_id, bank_name FROM banks WHERE bank_name IN ({', '.join('?' * len(bank_names))})",
+            bank_names
+        )
+        return self.cursor.fetchall()
+
+    def create_staging(self):
+        """Nothing to create: SQLite has no bulk path faster than executemany, so chunks are upserted directly."""
+        self.staged = None
+
+    def stage(self, chunk, method=None):
+        """Hold one chunk for merge_staging() (method is ignored)."""
+        self.staged = chunk
+        return method
+
+    def merge_staging(self):
+        """Upsert the staged chunk into reviews by review_key, touching only new or changed rows.
+
+        Returns (inserted, updated): new rows take review_ids above the previous maximum, and the
+        statement's row count covers both.
+        """
+        updates = ', '.join(f"{column} = excluded.{column}" for column in UPDATABLE_COLUMNS + ['row_hash'])
+        before = self.cursor.execute("SELECT COALESCE(MAX(review_id), 0) FROM reviews").fetchone()[0]
+        self.cursor.executemany(f"""
+            INSERT INTO reviews ({', '.join(REVIEW_COLUMNS)}) VALUES ({', '.join('?' * len(REVIEW_COLUMNS))})
+            ON CONFLICT (review_key) DO UPDATE SET {updates}
+            WHERE reviews.row_hash IS NOT excluded.row_hash
+        """, _rows(self.staged))
+        changed = self.cursor.rowcount
+        after = self.cursor.execute("SELECT COALESCE(MAX(review_id), 0) FROM reviews").fetchone()[0]
+        self.staged = None
+        return after - before, changed - (after - before)
+
+    def month(self, column):
+        """SQL expression for a 'YYYY-MM-DD' text column's 'YYYY-MM' month."""
+        return f"substr({column}, 1, 7)"
+
+    def close(self):
+        """Close DB connection."""
+        self.cursor.close()
+        self.conn.close()
+        print("SQLite connection closed.")
@@ -58,8 +58,12 @@ class Visualizer:
         print("✅ Rating distribution per bank plot saved.")
 
     def plot_theme_distribution_per_bank(self):
+        # Reviews tagged with several themes count once under each of them
+        themes = self.df
+        if 'themes' in self.df.columns:
+            themes = self.df.assign(theme=self.df['themes'].str.split('|')).explode('theme')
         plt.figure(figsize=(12, 8))
-        sns.countplot(data=self.df, x='theme', hue='bank')
+        sns.countplot(data=themes, x='theme', hue='bank')
         plt.title('Theme Distribution per Bank')
         plt.xlabel('Theme')
         plt.ylabel('Count')
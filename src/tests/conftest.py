@@ -0,0 +1,22 @@
+import pytest
+
+TINY_VOCAB = ['[PAD]', '[UNK]', '[CLS]', '[SEP]', '[MASK]', 'great', 'app', 'very', 'helpful', 'bad', 'service',
+              'not', 'happy', 'good', 'but', 'could', 'be', 'better', 'slow', 'crash', 'the', 'transfer', ',', '.', '!']
+
+
+# A tiny randomly initialized DistilBERT saved locally, so model code is tested without downloads
+@pytest.fixture(scope='session')
+def tiny_model_dir(tmp_path_factory):
+    import torch
+    from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast
+
+    path = tmp_path_factory.mktemp('tiny_distilbert')
+    (path / 'vocab.txt').write_text('\n'.join(TINY_VOCAB))
+    DistilBertTokenizerFast(vocab_file=str(path / 'vocab.txt')).save_pretrained(path)
+    config = DistilBertConfig(
+        vocab_size=len(TINY_VOCAB), dim=32, hidden_dim=64, n_layers=2, n_heads=2,
+        id2label={0: 'NEGATIVE', 1: 'POSITIVE'}, label2id={'NEGATIVE': 0, 'POSITIVE': 1}
+    )
+    torch.manual_seed(0)
+    DistilBertForSequenceClassification(config).save_pretrained(path)
+    return str(path)
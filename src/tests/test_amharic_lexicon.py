@@ -0,0 +1,77 @@
+import re
+import numpy as np
+import pytest
+from src.task_2.amharic_lexicon import LexiconScorer
+from src.utils.trie_pattern import trie_pattern
+
+
+@pytest.fixture(scope='module')
+def scorer():
+    return LexiconScorer()
+
+
+def test_trie_pattern_matches_longest_term():
+    pattern = re.compile(trie_pattern(['ጥሩ', 'በጣም ጥሩ', 'no', 'not']))
+    assert [m.group() for m in pattern.finditer('በጣም ጥሩ ነው not ጥሩ')] == ['በጣም ጥሩ', 'not', 'ጥሩ']
+    assert re.compile(trie_pattern([])).search('anything') is None
+
+
+def test_scores_weighted_terms(scorer):
+    totals = scorer.score_totals(['ጥሩ መተግበሪያ ነው።', 'ችግር አለ። አልተሳካም።', 'በጣም ጥሩ', 'ሰላም', None])
+    np.testing.assert_allclose(totals, [1.0, -2.0, 1.5, 0.0, 0.0])
+
+
+def test_affixed_amharic_terms_match_inside_words(scorer):
+    assert scorer.score_totals(['የችግር ምንጭ'])[0] == -1.0
+
+
+def test_negation_flips_polarity(scorer):
+    totals = scorer.score_totals(['ጥሩ አይደለም', 'this app is not good', 'no ችግር', 'good ጥሩ'])
+    np.testing.assert_allclose(totals, [-1.0, -1.0, 1.0, 2.0])
+
+
+def test_negation_stops_at_clause_boundaries(scorer):
+    totals = scorer.score_totals(['no problem, good', 'not bad. good app', 'not slow but bad', 'ጥሩ። አይደለም'])
+    np.testing.assert_allclose(totals, [1.0, 2.0, 0.5 - 1.0, 1.0])
+
+
+def test_negator_flips_only_the_nearest_term(scorer):
+    totals = scorer.score_totals(['not bad good', 'good bad አይደለም'])
+    np.testing.assert_allclose(totals, [2.0, 2.0])
+
+
+def test_negation_does_not_cross_reviews(scorer):
+    totals = scorer.score_totals(['ጥሩ', 'አይደለም', 'not', 'good'])
+    np.testing.assert_allclose(totals, [1.0, 0.0, 0.0, 1.0])
+
+
+def test_latin_terms_need_whole_words(scorer):
+    assert scorer.score_totals(['badge notification goodness'])[0] == 0.0
+
+
+def test_large_external_lexicon_matches_naive_counts(tmp_path):
+    rng = np.random.default_rng(0)
+    letters = [chr(c) for c in range(0x1200, 0x1248)]
+    terms = sorted({''.join(rng.choice(letters, size=rng.integers(3, 6))) for _ in range(3000)})
+    weights = rng.choice([-1.0, 1.0], size=len(terms))
+    path = tmp_path / 'lexicon.csv'
+    path.write_text('term,weight,type\n' + ''.join(f'{t},{w},sentiment\n' for t, w in zip(terms, weights)),
+                    encoding='utf-8')
+    scorer = LexiconScorer(str(path))
+
+    texts = [' '.join(rng.choice(terms, size=5)) for _ in range(200)]
+    # Space-separated terms never overlap, so a naive per-term count gives the same totals
+    naive = [sum(w * text.split().count(t) for t, w in zip(terms, weights)) for text in texts]
+    np.testing.assert_allclose(scorer.score_totals(texts), naive)
+    np.testing.assert_allclose(scorer.score(texts), np.tanh(naive))
+
+
+def test_fingerprint_tracks_lexicon_contents(tmp_path, scorer):
+    path = tmp_path / 'lexicon.csv'
+    path.write_text('term,weight,type\ngood,1.0,sentiment\nnot,,negation_precedes\n', encoding='utf-8')
+    fingerprint = LexiconScorer(str(path)).fingerprint
+    assert LexiconScorer(str(path)).fingerprint == fingerprint
+    assert LexiconScorer(str(path), negation_window=20).fingerprint != fingerprint
+    path.write_text('term,weight,type\ngood,2.0,sentiment\nnot,,negation_precedes\n', encoding='utf-8')
+    assert LexiconScorer(str(path)).fingerprint != fingerprint
+    assert scorer.fingerprint != fingerprint
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import pytest
+from src.task_1.async_scraper import AsyncScraper, RateLimiter, parse_review_page
+from src.utils.config import Config
+from src.utils.playstore_stub import PlayStoreStub, SyntheticCorpus, encode_review_page as encode_page
+
+REVIEWS_PER_STREAM = 5
+
+
+@pytest.fixture
+def stub_server():
+    # Each stream's first request fails once to exercise the retry path
+    with PlayStoreStub(corpus_size=REVIEWS_PER_STREAM, fail_first=True) as stub:
+        yield stub
+
+
+def test_parse_review_page():
+    items = [["id-1", ["user", None], 4, None, "Nice", [1717632000], 3, None, None, None, "2.1"]]
+    reviews, token = parse_review_page(encode_page(items, "next"))
+    assert token == "next"
+    assert reviews[0]['reviewId'] == "id-1"
+    assert reviews[0]['content'] == "Nice"
+    assert reviews[0]['score'] == 4
+    assert reviews[0]['thumbsUpCount'] == 3
+
+    _, token = parse_review_page(encode_page(items, None))
+    assert token is None
+
+
+def test_scrape_all_banks_concurrent(stub_server):
+    """Concurrent mode pages through every (app, language) stream and keeps the sequential shape."""
+    scraper = AsyncScraper(Config(), base_url=stub_server.url, page_size=2, backoff=0.01, rate_per_host=0)
+    df = scraper.scrape_all_banks(num_reviews=10)
+
+    assert list(df.columns) == ['review', 'rating', 'date', 'bank', 'source']
+    assert list(df['bank'].unique()) == list(scraper.app_ids.keys())
+    assert len(df) == REVIEWS_PER_STREAM * len(scraper.languages) * len(scraper.app_ids)
+    assert (df['source'] == 'Google Play').all()
+    assert stub_server.stats['errors'] == len(scraper.languages) * len(scraper.app_ids)
+
+
+def test_scrape_reviews_respects_num_reviews(stub_server):
+    scraper = AsyncScraper(Config(), base_url=stub_server.url, page_size=2, backoff=0.01, rate_per_host=0)
+    df = scraper.scrape_reviews('test.app.id', 'Test Bank', num_reviews=3)
+    assert len(df) == 3 * len(scraper.languages)
+    assert df.iloc[0]['review'] == SyntheticCorpus(REVIEWS_PER_STREAM).review_row('test.app.id', 'en', 0)[4]
+
+
+def test_rate_limiter_spaces_requests():
+    async def run():
+        limiter = RateLimiter(rate=50.0, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            await limiter.acquire('example.com')
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 5 / 50.0 * 0.9
+
+
+def test_scrape_against_playstore_stub_with_errors():
+    """Retries absorb the stand-in's injected 503s and gateway errors."""
+    with PlayStoreStub(corpus_size=30, error_rate=0.15, gateway_error_rate=0.05, seed=7) as stub:
+        scraper = AsyncScraper(Config(), base_url=stub.url, page_size=7, backoff=0.001,
+                               max_retries=12, rate_per_host=0)
+        df = scraper.scrape_all_banks(num_reviews=25)
+        stats = stub.stats
+
+    assert len(df) == 25 * len(scraper.languages) * len(scraper.app_ids)
+    assert stats['reviews'] == len(df)
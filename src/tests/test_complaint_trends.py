@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.task_2.complaint_trends import ComplaintTrends
+from src.task_2.theme_analyzer import ThemeAnalyzer
+
+BACKGROUND = ['app works fine', 'slow transfer today', 'good service', 'balance check is easy',
+              'login takes long', 'nice update', 'customer support helpful']
+
+
+def make_days(start, days, per_day, seed=0, bank='Dashen Bank'):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=days).strftime('%Y-%m-%d')
+    return pd.DataFrame({
+        'review': [f"{rng.choice(BACKGROUND)} {i}" for i in range(days * per_day)],
+        'bank': bank,
+        'date': np.repeat(dates, per_day),
+    })
+
+
+@pytest.fixture
+def trends(tmp_path):
+    trends = ComplaintTrends(str(tmp_path / 'trends.sqlite'))
+    yield trends
+    trends.close()
+
+
+def test_outage_ngram_is_flagged_only_for_its_bank(trends):
+    history = pd.concat([make_days('2024-03-01', 28, 40), make_days('2024-03-01', 28, 40, seed=1, bank='BOA')])
+    assert trends.update(history) == len(history)
+
+    dashen_today = make_days('2024-03-29', 1, 40, seed=2)
+    dashen_today.loc[:14, 'review'] = [f"otp not received again {i}" for i in range(15)]
+    trends.update(pd.concat([dashen_today, make_days('2024-03-29', 1, 40, seed=3, bank='BOA')]))
+
+    flagged = trends.emerging(baseline_days=28)
+    assert set(flagged['bank']) == {'Dashen Bank'}
+    assert {'otp', 'otp received', 'received'} <= set(flagged['ngram'])
+    # Everyday n-grams are not flagged
+    assert not set(flagged['ngram']) & {'slow', 'transfer', 'app'}
+    top = flagged.iloc[0]
+    assert top['window_docs'] == 15 and top['baseline_docs'] == 0
+
+
+def test_updates_only_count_new_reviews(trends):
+    first = make_days('2024-01-01', 3, 10)
+    second = make_days('2024-01-04', 2, 10, seed=1)
+    trends.update(first)
+    assert trends.update(pd.concat([first, second])) == len(second)
+    assert len(trends) == 50
+
+    docs = trends.conn.execute("SELECT SUM(docs) FROM day_docs").fetchone()[0]
+    assert docs == 50
+    slow = trends.conn.execute("SELECT SUM(docs) FROM ngram_docs WHERE ngram = 'slow'").fetchone()[0]
+    all_reviews = pd.concat([first, second])['review']
+    assert slow == all_reviews.str.contains(r'\bslow\b').sum()
+
+
+def test_prune_and_empty_store(trends):
+    assert trends.emerging().empty
+    trends.update(make_days('2023-01-01', 400, 1))
+    assert trends.prune(keep_days=30) > 0
+    assert trends.conn.execute("SELECT MIN(day) FROM day_docs").fetchone()[0] >= '2024-01-05'
+
+
+def test_theme_analyzer_saves_emerging_complaints(trends, tmp_path):
+    history = make_days('2024-03-01', 14, 30)
+    spike = make_days('2024-03-15', 1, 30, seed=4)
+    spike.loc[:9, 'review'] = [f"card blocked after update {i}" for i in range(10)]
+    analyzer = ThemeAnalyzer()
+    analyzer.df = pd.concat([history, spike])
+    output_path = tmp_path / 'emerging.csv'
+    flagged = analyzer.detect_emerging_complaints(trends, output_path=str(output_path), baseline_days=14)
+    assert 'card blocked' in set(flagged['ngram'])
+    assert len(pd.read_csv(output_path)) == len(flagged)
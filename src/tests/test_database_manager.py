@@ -0,0 +1,282 @@
+import csv
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import psycopg2
+from src.task_3 import storage_backends
+from src.task_3.database_manager import REVIEW_COLUMNS, DatabaseManager
+from src.task_3.storage_backends import SQLiteBackend
+
+
+class FakeCursor:
+    """Records what reaches the server (rows parsed back out of COPY streams, and statements) and
+    plays the staging merge against an in-memory review_key -> row_hash table."""
+
+    def __init__(self, refuse_copy=False, banks=None):
+        self.refuse_copy = refuse_copy
+        self.banks = dict(banks or {})
+        self.copied = []
+        self.staged = []
+        self.stored = {}
+        self.statements = []
+        self.result = None
+
+    def copy_expert(self, sql, file):
+        if self.refuse_copy:
+            raise psycopg2.errors.InsufficientPrivilege("permission denied for COPY")
+        self.statements.append(sql)
+        for row in csv.reader(io.StringIO(file.read())):
+            row = [None if value == r'\N' else value for value in row]
+            self.copied.append(row)
+            self.staged.append(row)
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+        if 'INSERT INTO reviews' in sql:
+            key, row_hash = REVIEW_COLUMNS.index('review_key'), REVIEW_COLUMNS.index('row_hash')
+            inserted = updated = 0
+            for row in self.staged:
+                previous = self.stored.get(str(row[key]))
+                inserted += previous is None
+                updated += previous is not None and previous != str(row[row_hash])
+                self.stored[str(row[key])] = str(row[row_hash])
+            self.result = [(inserted, updated)]
+        elif sql.startswith('TRUNCATE'):
+            self.staged = []
+        elif 'INSERT INTO banks' in sql:
+            for name in params[0]:
+                self.banks.setdefault(name, len(self.banks) + 1)
+            self.result = [(self.banks[name], name) for name in params[0]]
+
+    def fetchone(self):
+        return self.result[0]
+
+    def fetchall(self):
+        return self.result
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+
+def make_reviews(n):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'review': [f'review, "quoted" {i}' for i in range(n)],
+        'rating': rng.integers(1, 6, n),
+        'date': '2024-05-01',
+        'bank': rng.choice(['Dashen Bank', 'Bank of Abyssinia'], n),
+        'source': 'Google Play',
+        'sentiment_score': rng.uniform(-1, 1, n),
+    })
+
+
+class TestInsertReviews(unittest.TestCase):
+
+    def connect(self, cursor):
+        with mock.patch('psycopg2.connect', return_value=FakeConnection(cursor)):
+            return DatabaseManager('db', 'user', 'password')
+
+    def test_copy_streams_chunks_and_commits_each(self):
+        cursor = FakeCursor()
+        manager = self.connect(cursor)
+        df = make_reviews(25)
+        df.loc[3, 'review'] = ''
+        inserted = manager.insert_reviews(df, {'Dashen Bank': 1, 'Bank of Abyssinia': 2}, chunk_size=10)
+
+        self.assertEqual(inserted, 25)
+        # One commit creating the staging table, then one per chunk
+        self.assertEqual(manager.conn.commits, 4)
+        self.assertEqual(len(cursor.copied), 25)
+        copies = [sql for sql in cursor.statements if sql.startswith('COPY')]
+        self.assertEqual(len(copies), 3)
+        self.assertTrue(all(sql.startswith(f"COPY reviews_staging ({', '.join(REVIEW_COLUMNS)})") for sql in copies))
+        first = dict(zip(REVIEW_COLUMNS, cursor.copied[0]))
+        self.assertEqual(first['review'], 'review, "quoted" 0')
+        self.assertEqual(first['bank_id'], str({'Dashen Bank': 1, 'Bank of Abyssinia': 2}[df.loc[0, 'bank']]))
+        self.assertEqual(first['review_date'], '2024-05-01')
+        self.assertAlmostEqual(float(first['sentiment_score']), df.loc[0, 'sentiment_score'])
+        # Missing columns load as NULL; empty text stays an empty string
+        self.assertIsNone(first['theme'])
+        self.assertEqual(cursor.copied[3][1], '')
+
+    def test_falls_back_to_execute_values_when_copy_is_refused(self):
+        cursor = FakeCursor(refuse_copy=True)
+        manager = self.connect(cursor)
+        batches = []
+
+        def stage(cur, sql, rows, page_size):
+            batches.append(rows)
+            cur.staged.extend(rows)
+
+        with mock.patch.object(storage_backends, 'execute_values', side_effect=stage):
+            inserted = manager.insert_reviews(make_reviews(25), {'Dashen Bank': 1, 'Bank of Abyssinia': 2},
+                                              chunk_size=10)
+        self.assertEqual(inserted, 25)
+        self.assertEqual(manager.conn.rollbacks, 1)
+        self.assertEqual([len(rows) for rows in batches], [10, 10, 5])
+        row = batches[0][0]
+        self.assertIsInstance(row[0], int)
+        self.assertIsNone(row[REVIEW_COLUMNS.index('theme')])
+
+    def test_reloading_writes_only_new_or_changed_rows(self):
+        cursor = FakeCursor()
+        manager = self.connect(cursor)
+        bank_id_map = {'Dashen Bank': 1, 'Bank of Abyssinia': 2}
+        df = make_reviews(20)
+        self.assertEqual(manager.insert_reviews(df, bank_id_map, chunk_size=8), 20)
+        self.assertEqual(manager.insert_reviews(df, bank_id_map, chunk_size=8), 0)
+
+        # Re-scored sentiment and assigned themes update in place; new reviews are added
+        rescored = df.copy()
+        rescored.loc[:2, 'sentiment_label'] = 'negative'
+        rescored['theme'] = 'Other'
+        rescored.loc[:4, 'theme'] = None
+        more = pd.concat([rescored, make_reviews(25).iloc[20:]], ignore_index=True)
+        self.assertEqual(manager.insert_reviews(more, bank_id_map, chunk_size=8), 15 + 3 + 5)
+        self.assertEqual(len(cursor.stored), 25)
+        self.assertEqual(manager.insert_reviews(more, bank_id_map), 0)
+
+    def test_review_key_is_the_natural_key(self):
+        manager = self.connect(FakeCursor())
+        df = make_reviews(4)
+        df.loc[1] = df.loc[0]
+        df.loc[1, 'sentiment_score'] = 0.5
+        df.loc[2, 'date'] = '2024-05-01 00:00:00'
+        df.loc[3, ['review', 'bank']] = [df.loc[0, 'review'], 'Other Bank']
+        rows = manager.review_rows(df, {'Dashen Bank': 1, 'Bank of Abyssinia': 2, 'Other Bank': 3})
+        # Duplicate (review, date, bank) rows collapse to the last one; the date format does not matter
+        self.assertEqual(list(rows.index), [1, 2, 3])
+        self.assertEqual(rows.loc[1, 'sentiment_score'], 0.5)
+        self.assertEqual(rows['review_key'].dtype, np.int64)
+        again = manager.review_rows(make_reviews(3).assign(date='2024-05-01T00:00'),
+                                    {'Dashen Bank': 1, 'Bank of Abyssinia': 2})
+        self.assertEqual(rows.loc[2, 'review_key'], again.loc[2, 'review_key'])
+        self.assertNotEqual(rows.loc[1, 'row_hash'], again.loc[0, 'row_hash'])
+
+    def test_banks_resolve_in_one_statement(self):
+        cursor = FakeCursor(banks={'Dashen Bank': 1})
+        manager = self.connect(cursor)
+        bank_id_map = manager.insert_banks(np.array(['Dashen Bank', 'Bank of Abyssinia', 'Dashen Bank']))
+        self.assertEqual(bank_id_map, {'Dashen Bank': 1, 'Bank of Abyssinia': 2})
+        self.assertEqual(len(cursor.statements), 1)
+        self.assertEqual(manager.conn.commits, 1)
+
+    def test_unknown_bank_is_rejected_before_loading(self):
+        cursor = FakeCursor()
+        manager = self.connect(cursor)
+        with self.assertRaises(ValueError):
+            manager.insert_reviews(make_reviews(5), {'Dashen Bank': 1})
+        self.assertEqual(cursor.copied, [])
+
+
+class TestSQLiteBackend(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = DatabaseManager(backend=SQLiteBackend(':memory:'))
+        self.manager.create_tables()
+
+    def tearDown(self):
+        self.manager.close()
+
+    def load(self, df, chunk_size=50000):
+        return self.manager.insert_reviews(df, self.manager.insert_banks(df['bank'].unique()), chunk_size=chunk_size)
+
+    def test_loads_are_idempotent_and_update_in_place(self):
+        df = make_reviews(30).assign(sentiment_label='positive')
+        self.assertEqual(self.load(df, chunk_size=7), 30)
+        self.assertEqual(self.load(df, chunk_size=7), 0)
+        # Re-running create_tables and insert_banks is harmless too
+        self.manager.create_tables()
+        self.assertEqual(self.manager.insert_banks(['Dashen Bank', 'Bank of Abyssinia']),
+                         self.manager.insert_banks(['Bank of Abyssinia', 'Dashen Bank']))
+
+        df.loc[:4, 'sentiment_label'] = 'negative'
+        df['theme'] = 'Account Access'
+        self.assertEqual(self.load(pd.concat([df, make_reviews(33).iloc[30:]], ignore_index=True)), 33)
+        stored = self.manager.fetch_reviews()
+        self.assertEqual(len(stored), 33)
+        self.assertEqual((stored['sentiment_label'] == 'negative').sum(), 5)
+        self.assertEqual(stored.loc[0, 'review'], 'review, "quoted" 0')
+        self.assertEqual(stored.loc[0, 'date'], '2024-05-01')
+        self.assertEqual(set(stored['bank']), {'Dashen Bank', 'Bank of Abyssinia'})
+
+    def test_create_tables_keys_reviews_loaded_before_review_key(self):
+        df = make_reviews(30)
+        bank_id_map = self.manager.insert_banks(df['bank'].unique())
+        # Ten reviews stored by the old loader (no review_key), one of them twice
+        legacy = self.manager.review_rows(df.iloc[[*range(10), 3]], bank_id_map)
+        legacy = pd.concat([legacy, legacy.iloc[[3]]])
+        self.manager.cursor.executemany(
+            f"INSERT INTO reviews ({', '.join(REVIEW_COLUMNS[:8])}) VALUES ({', '.join('?' * 8)})",
+            storage_backends._rows(legacy[REVIEW_COLUMNS[:8]])
+        )
+
+        self.manager.create_tables()
+        keys = self.manager.query("SELECT review_key, row_hash FROM reviews")
+        self.assertEqual(len(keys), 10)
+        self.assertFalse(keys.isna().any().any())
+        # The legacy reviews are recognised: only the other twenty are new, and nothing needs updating
+        self.assertEqual(self.load(df), 20)
+        self.assertEqual(len(self.manager.fetch_reviews()), 30)
+        self.assertEqual(self.manager.backfill_review_keys(), 0)
+
+    def test_sentiment_summary_aggregates_in_the_database(self):
+        df = make_reviews(40)
+        df['date'] = np.where(np.arange(40) < 10, '2024-04-15', '2024-05-01')
+        df['sentiment_label'] = np.where(df['sentiment_score'] > 0, 'positive', 'negative')
+        self.load(df)
+
+        by_bank = self.manager.sentiment_summary()
+        expected = df.groupby('bank').agg(reviews=('rating', 'size'), mean_rating=('rating', 'mean'),
+                                          mean_sentiment=('sentiment_score', 'mean'))
+        self.assertEqual(list(by_bank['bank']), sorted(expected.index))
+        for column in expected.columns:
+            np.testing.assert_allclose(by_bank[column], expected[column])
+        np.testing.assert_allclose(by_bank['positive_share'] + by_bank['negative_share'], 1.0)
+
+        by_month = self.manager.sentiment_summary(by=('bank', 'month'))
+        self.assertEqual(by_month['reviews'].sum(), 40)
+        self.assertEqual(sorted(by_month['month'].unique()), ['2024-04', '2024-05'])
+        self.assertEqual(len(self.manager.fetch_reviews(bank='Dashen Bank')), (df['bank'] == 'Dashen Bank').sum())
+        with self.assertRaises(ValueError):
+            self.manager.sentiment_summary(by=('theme',))
+
+    def test_file_database_persists_between_connections(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'reviews.sqlite')
+            manager = DatabaseManager.sqlite(path)
+            manager.create_tables()
+            manager.insert_reviews(make_reviews(12), manager.insert_banks(['Dashen Bank', 'Bank of Abyssinia']))
+            manager.close()
+
+            manager = DatabaseManager.sqlite(path)
+            self.assertEqual(len(manager.fetch_reviews()), 12)
+            manager.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
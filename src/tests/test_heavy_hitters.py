@@ -0,0 +1,119 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.task_2.heavy_hitters import HeavyHitterSketches
+from src.utils.sketches import CountMinSketch, SpaceSaving
+
+
+def zipf_items(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.array([f"w{x}" for x in rng.zipf(1.5, n)], dtype=object)
+
+
+def test_count_min_never_undercounts_and_merges():
+    items = zipf_items(20000)
+    whole = CountMinSketch(width=2 ** 10)
+    whole.add(items)
+    halves = CountMinSketch(width=2 ** 10)
+    halves.add(items[:10000])
+    other = CountMinSketch(width=2 ** 10)
+    other.add(items[10000:])
+    halves.merge(other)
+    np.testing.assert_array_equal(halves.table, whole.table)
+
+    true = Counter(items)
+    keys = list(true)
+    estimates = whole.estimate(np.array(keys, dtype=object))
+    assert (estimates >= [true[key] for key in keys]).all()
+    assert (estimates - [true[key] for key in keys]).max() <= np.e / 2 ** 10 * len(items) * 2
+    with pytest.raises(ValueError):
+        whole.merge(CountMinSketch(width=2 ** 11))
+
+
+def test_space_saving_bounds_hold_across_batches_and_merges():
+    items = zipf_items(30000, seed=1)
+    true = Counter(items)
+    left, right = SpaceSaving(50), SpaceSaving(50)
+    for start in range(0, 30000, 3000):
+        target = left if start < 15000 else right
+        batch = Counter(items[start:start + 3000])
+        target.add_counts(list(batch), list(batch.values()))
+    merged = left.merge(right)
+
+    top = merged.top(10)
+    assert [item for item, _, _ in top[:3]] == [item for item, _ in true.most_common(3)]
+    for item, count, error in merged.top(50):
+        assert count - error <= true[item] <= count
+
+
+@pytest.fixture
+def scored_reviews():
+    rng = np.random.default_rng(2)
+    # Distinct texts: reviews repeating (review, date, bank) are fed once
+    reviews = ([f"otp not received {i}" for i in range(30)] + [f"app keeps crashing {i}" for i in range(20)]
+               + [f"great service {i}" for i in range(40)] + [f"slow transfer {i}" for i in range(10)])
+    return pd.DataFrame({
+        'review': reviews,
+        'bank': rng.choice(['Dashen Bank', 'BOA'], len(reviews)),
+        'sentiment_label': ['negative'] * 50 + ['positive'] * 40 + ['negative'] * 10,
+        'date': rng.choice(['2024-07-03', '2024-08-15', '2024-11-20'], len(reviews)),
+    })
+
+
+def test_top_ngrams_per_bank_label_and_quarter(tmp_path, scored_reviews):
+    sketches = HeavyHitterSketches(str(tmp_path / 'hh.npz'), capacity=20)
+    assert sketches.update(scored_reviews) == len(scored_reviews)
+    assert sketches.update(scored_reviews) == 0
+    sketches.save()
+    sketches.close()
+
+    reloaded = HeavyHitterSketches.from_file(str(tmp_path / 'hh.npz'))
+    top = reloaded.top(3, bank='Dashen Bank', label='negative', start='2024-07', end='2024-09')
+    quarter = scored_reviews[(scored_reviews['bank'] == 'Dashen Bank') & (scored_reviews['sentiment_label'] == 'negative')
+                             & (scored_reviews['date'] < '2024-10')]
+    expected = Counter(ngram for review in quarter['review'] for ngram in reloaded.analyzer(review))
+    assert top['ngram'].iloc[0] in {'otp', 'received', 'otp received'}
+    for ngram, count, error in top.itertuples(index=False):
+        assert count - error <= expected[ngram] <= count
+    assert set(reloaded.top(3, label='positive')['ngram']) == {'great', 'service', 'great service'}
+
+
+def test_worker_sketches_merge_to_the_single_process_result(tmp_path, scored_reviews):
+    single = HeavyHitterSketches(None)
+    single.update(scored_reviews)
+    workers = [HeavyHitterSketches(None), HeavyHitterSketches(None)]
+    workers[0].update(scored_reviews.iloc[:50])
+    workers[1].update(scored_reviews.iloc[50:])
+    workers[1].save(str(tmp_path / 'worker.npz'))
+    merged = workers[0].merge(HeavyHitterSketches.from_file(str(tmp_path / 'worker.npz')))
+    pd.testing.assert_frame_equal(merged.top(10, label='negative'), single.top(10, label='negative'))
+    for sketches in [single, *workers]:
+        sketches.close()
+
+
+def test_bank_names_match_the_preprocessed_spelling(tmp_path, scored_reviews):
+    sketches = HeavyHitterSketches(None)
+    # The preprocessor lowercases bank names; the documented query uses the display name
+    sketches.update(scored_reviews.assign(bank=scored_reviews['bank'].str.lower()))
+    assert not sketches.top(3, bank='Dashen Bank').empty
+    pd.testing.assert_frame_equal(sketches.top(3, bank='Dashen Bank'), sketches.top(3, bank=' dashen bank'))
+    sketches.close()
+
+
+def test_reviews_fed_but_never_saved_are_counted_again(tmp_path, scored_reviews):
+    path = str(tmp_path / 'hh.npz')
+    crashed = HeavyHitterSketches(path)
+    crashed.update(scored_reviews)
+    crashed.close()  # Gone before save(): neither the sketch nor the seen keys persist
+
+    sketches = HeavyHitterSketches(path)
+    assert sketches.update(scored_reviews) == len(scored_reviews)
+    sketches.save()
+    sketches.close()
+
+    reopened = HeavyHitterSketches(path)
+    assert reopened.update(scored_reviews) == 0
+    assert reopened.top(1, label='positive')['count'].iloc[0] == 40
+    reopened.close()
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from transformers import pipeline
+from src.task_2.inference_backends import TorchBackend, accuracy_drift, softmax
+from src.task_2.sentiment_analyzer import SentimentAnalyzer
+
+TEXTS = np.array(['great app', 'bad service , not happy .', 'good but could be better !',
+                  'the app is very slow', 'crash ' * 600, ''], dtype=object)
+
+
+@pytest.fixture
+def torch_analyzer(tiny_model_dir):
+    return SentimentAnalyzer(backend=TorchBackend(pipeline('sentiment-analysis', model=tiny_model_dir)))
+
+
+def test_softmax_rows_sum_to_one():
+    probabilities = softmax(np.array([[1.0, 2.0], [1000.0, -1000.0]]))
+    np.testing.assert_allclose(probabilities.sum(axis=1), 1.0)
+    assert probabilities[1, 0] == 1.0
+
+
+def test_drift_of_identical_backends_is_zero(torch_analyzer):
+    report = accuracy_drift(torch_analyzer, torch_analyzer, TEXTS,
+                            labels=['positive', 'negative', 'neutral', 'negative', 'negative', 'neutral'])
+    assert report['label_agreement'] == 1.0
+    assert report['max_score_diff'] == 0.0
+    assert report['reference_accuracy'] == report['candidate_accuracy']
+
+
+@pytest.mark.parametrize('quantize', [False, True])
+def test_onnx_backend_matches_torch(torch_analyzer, tmp_path, quantize):
+    pytest.importorskip('onnxruntime')
+    from src.task_2.inference_backends import OnnxBackend, export_onnx
+
+    export_onnx(torch_analyzer.sentiment_pipeline, str(tmp_path), quantize=quantize)
+    backend = OnnxBackend(str(tmp_path), threads=1)
+    onnx_analyzer = SentimentAnalyzer(backend=backend)
+
+    assert backend.revision.endswith(':onnx-int8' if quantize else ':onnx')
+    report = accuracy_drift(torch_analyzer, onnx_analyzer, TEXTS)
+    assert report['max_score_diff'] < (0.05 if quantize else 1e-4)
+    assert onnx_analyzer.score_english(TEXTS[-1:])[0] == 0.0
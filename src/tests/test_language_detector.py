@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from src.utils.language_detector import LanguageDetector, detect_language
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'language_cache.sqlite')
+
+
+def test_series_detects_each_distinct_text_once():
+    detector = LanguageDetector(cache_path=None)
+    reviews = pd.Series(['This app is good', 'this app is good ', 'THIS APP IS GOOD', 'በጣም ጥሩ ነው', None], index=[10, 11, 12, 13, 14])
+
+    with patch('src.utils.language_detector.detect_language', wraps=detect_language) as spy:
+        languages = detector.detect_series(reviews)
+
+    assert languages.index.tolist() == [10, 11, 12, 13, 14]
+    assert languages.tolist() == ['english', 'english', 'english', 'amharic', 'unknown']
+    assert spy.call_count == 3  # The English text, the Amharic review and the empty string
+
+
+def test_matches_uncached_detection():
+    texts = ['This app is good.', 'This is በጣም good.', 'Hi', '', 'Transfer keeps failing since update']
+    detector = LanguageDetector(cache_path=None)
+    assert detector.detect_series(pd.Series(texts)).tolist() == [detect_language(t) for t in texts]
+
+
+def test_persistent_cache_survives_restart(cache_path):
+    first = LanguageDetector(cache_path=cache_path)
+    first.detect_series(pd.Series(['The transfer page is very slow']))
+    first.close()
+
+    second = LanguageDetector(cache_path=cache_path)
+    with patch('src.utils.language_detector.detect_language', side_effect=AssertionError("cache miss")):
+        assert second.detect('The transfer page is very slow') == 'english'
+    assert second.hits == 1 and second.misses == 0
+
+
+def test_seed_change_invalidates_cache(cache_path):
+    LanguageDetector(cache_path=cache_path).detect('The transfer page is very slow')
+    reseeded = LanguageDetector(cache_path=cache_path, seed=1)
+    reseeded.detect('The transfer page is very slow')
+    assert reseeded.misses == 1
+
+
+def test_memory_tier_is_bounded():
+    detector = LanguageDetector(cache_path=None, max_memory_entries=2)
+    detector.detect_series(pd.Series(['first review text', 'second review text', 'third review text']))
+    assert len(detector.memory) == 2
+
+
+def test_process_pool_matches_serial():
+    texts = pd.Series([
+        f"{opener} {verdict} {i}"
+        for i, (opener, verdict) in enumerate(
+            (o, v) for o in ['The app', 'Transfer', 'Login page', 'Customer support', 'ይህ መተግበሪያ']
+            for v in ['works great', 'is very slow', 'keeps crashing', 'ጥሩ ነው', 'fails every time']
+        )
+    ])
+    serial = LanguageDetector(cache_path=None).detect_series(texts)
+    parallel = LanguageDetector(cache_path=None, workers=2, chunk_size=4).detect_series(texts)
+    pd.testing.assert_series_equal(serial, parallel)
@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.task_1.near_duplicates import NearDuplicateDetector, optimal_bands
+
+
+class TestNearDuplicateDetector(unittest.TestCase):
+    def setUp(self):
+        self.reviews = pd.DataFrame({
+            'review': [
+                'the app keeps crashing every time i try to send money to my family',
+                'the app keeps crashing every time i try to send money to my family please fix',
+                'great app very easy to use for paying bills and airtime',
+                'the app keeps crashing every time i try to send money to my family',
+                'ok',
+                'ok',
+            ],
+            'bank': ['cbe', 'cbe', 'cbe', 'boa', 'cbe', 'cbe'],
+        })
+
+    def test_optimal_bands_fit_signature(self):
+        bands, rows = optimal_bands(0.8, 128)
+        self.assertLessEqual(bands * rows, 128)
+        # The LSH S-curve should switch on close to the threshold
+        self.assertAlmostEqual((1 / bands) ** (1 / rows), 0.8, delta=0.1)
+
+    def test_signatures_are_deterministic_and_estimate_similarity(self):
+        detector = NearDuplicateDetector()
+        texts = self.reviews['review'].tolist()
+        signatures = detector.signatures(texts)
+        np.testing.assert_array_equal(signatures, NearDuplicateDetector().signatures(texts))
+        np.testing.assert_array_equal(signatures[0], signatures[3])
+        self.assertGreater((signatures[0] == signatures[1]).mean(), 0.7)
+        self.assertLess((signatures[0] == signatures[2]).mean(), 0.2)
+
+    def test_flag_groups_within_bank(self):
+        flagged = NearDuplicateDetector(threshold=0.7).apply(self.reviews)
+        self.assertEqual(flagged['is_near_duplicate'].tolist(), [False, True, False, False, False, False])
+        self.assertEqual(flagged['near_dup_group'].iloc[0], flagged['near_dup_group'].iloc[1])
+        # Same text under another bank is its own group representative
+        self.assertFalse(flagged['is_near_duplicate'].iloc[3])
+
+    def test_short_reviews_are_never_grouped(self):
+        flagged = NearDuplicateDetector(threshold=0.7).apply(self.reviews)
+        self.assertFalse(flagged['is_near_duplicate'].iloc[4:].any())
+
+    def test_collapse_keeps_first_of_each_group(self):
+        collapsed = NearDuplicateDetector(threshold=0.7, mode='collapse').apply(self.reviews)
+        self.assertEqual(collapsed.index.tolist(), [0, 2, 3, 4, 5])
+
+    def test_empty_frame_and_invalid_mode(self):
+        flagged = NearDuplicateDetector().apply(self.reviews.iloc[:0])
+        self.assertIn('is_near_duplicate', flagged.columns)
+        with self.assertRaises(ValueError):
+            NearDuplicateDetector(mode='drop')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+from google_play_scraper import reviews, Sort
+from google_play_scraper.constants.request import Formats
+from src.utils.playstore_stub import PlayStoreStub, SyntheticCorpus
+
+
+def test_corpus_is_deterministic_and_newest_first():
+    corpus = SyntheticCorpus(size=10 ** 7, seed=3)
+    assert corpus.review_row('app', 'en', 123) == SyntheticCorpus(size=10 ** 7, seed=3).review_row('app', 'en', 123)
+    rows, token = corpus.page('app', 'en', 10 ** 7 - 2, 5)
+    assert len(rows) == 2 and token is None
+    assert corpus.review_row('app', 'en', 0)[5][0] > corpus.review_row('app', 'en', 1)[5][0]
+
+
+def test_google_play_scraper_pages_through_stub():
+    """The stand-in speaks the batchexecute format google-play-scraper parses."""
+    url_format = Formats.Reviews.URL_FORMAT
+    with PlayStoreStub(corpus_size=1000, max_page_size=40) as stub, stub.redirect_google_play_scraper():
+        first, token = reviews('com.bench.app', lang='en', country='et', sort=Sort.NEWEST, count=100)
+        second, _ = reviews('com.bench.app', continuation_token=token)
+        stats = stub.stats
+
+    assert len(first) == 100 and len(second) == 100
+    assert first[0]['reviewId'] == 'com.bench.app-en-0'
+    assert second[0]['reviewId'] == 'com.bench.app-en-100'
+    assert first[0]['content'] and first[0]['appVersion'].startswith('5.')
+    assert stats['requests'] == 6  # 40 + 40 + 20 per call
+    assert Formats.Reviews.URL_FORMAT == url_format
@@ -1,7 +1,13 @@
+import os
+import tempfile
 import unittest
+import numpy as np
 import pandas as pd
 from unittest.mock import MagicMock
 from src.task_1.preprocessor import Preprocessor, detect_language
+from src.task_1.near_duplicates import NearDuplicateDetector
+from src.utils.data_handler import DataHandler
+from src.utils.seen_keys import SeenKeyStore
 
 
 class TestLanguageDetection(unittest.TestCase):
@@ -48,6 +54,67 @@ class TestPreprocessor(unittest.TestCase):
         self.assertIn('english', languages)
         self.assertIn('amharic', languages)
 
+    def test_normalize_reviews_dedupes_normalized_text(self):
+        sample_data = pd.DataFrame({
+            'review': ['Great app!', 'great app', 'Great app', 'ጥሩ ነው።'],
+            'rating': [5, 4, 3, 0],
+            'date': ['2024-01-01', '2024-01-01', '2024-01-02', '2024-01-01'],
+            'bank': ['CBE', ' cbe', 'CBE', 'BOA'],
+            'source': ['Google Play', None, None, None]
+        })
+
+        cleaned_df = self.preprocessor.normalize_reviews(sample_data)
+
+        # Second row duplicates the first after normalization, last row has an invalid rating
+        self.assertEqual(cleaned_df.index.tolist(), [0, 2])
+        self.assertEqual(cleaned_df['review'].tolist(), ['great app', 'great app'])
+        self.assertEqual(cleaned_df['bank'].tolist(), ['cbe', 'cbe'])
+        self.assertEqual(cleaned_df['date'].tolist(), ['2024-01-01', '2024-01-02'])
+        self.assertEqual(cleaned_df['source'].tolist(), ['Google Play', 'Google Play'])
+
+    def test_clean_data_flags_near_duplicates(self):
+        preprocessor = Preprocessor(self.mock_data_handler, near_duplicates=NearDuplicateDetector(threshold=0.7))
+        sample_data = pd.DataFrame({
+            'review': ['The app keeps crashing every time I try to send money!',
+                       'the app keeps crashing every time i try to send money please fix',
+                       'Great app, very easy to use for paying bills.'],
+            'rating': [1, 1, 5],
+            'date': ['2024-01-01', '2024-01-02', '2024-01-03'],
+            'bank': ['CBE', 'CBE', 'CBE'],
+            'source': ['Google Play'] * 3
+        })
+
+        cleaned_df = preprocessor.clean_data(sample_data, verbose=False)
+
+        self.assertEqual(cleaned_df['is_near_duplicate'].tolist(), [False, True, False])
+        self.assertEqual(cleaned_df['near_dup_group'].iloc[0], cleaned_df['near_dup_group'].iloc[1])
+
+    def test_near_duplicate_groups_keep_a_representative_after_language_filter(self):
+        # The first review of the group is in an unsupported language and is filtered out
+        detector = MagicMock()
+        detector.detect_series.side_effect = lambda reviews: pd.Series(['unknown', 'english', 'english'],
+                                                                       index=reviews.index)
+        sample_data = pd.DataFrame({
+            'review': ['The app keeps crashing every time I try to send money!',
+                       'the app keeps crashing every time i try to send money please fix',
+                       'the app keeps crashing every time i try to send money again'],
+            'rating': [1, 1, 1],
+            'date': ['2024-01-01', '2024-01-02', '2024-01-03'],
+            'bank': ['CBE', 'CBE', 'CBE'],
+            'source': ['Google Play'] * 3
+        })
+
+        flagged = Preprocessor(self.mock_data_handler, language_detector=detector,
+                               near_duplicates=NearDuplicateDetector(threshold=0.7)).clean_data(sample_data,
+                                                                                                verbose=False)
+        self.assertEqual(flagged.index.tolist(), [1, 2])
+        self.assertEqual(flagged['is_near_duplicate'].tolist(), [False, True])
+        self.assertEqual(flagged['near_dup_group'].nunique(), 1)
+
+        collapsed = Preprocessor(self.mock_data_handler, language_detector=detector,
+                                 near_duplicates=NearDuplicateDetector(threshold=0.7, mode='collapse'))
+        self.assertEqual(collapsed.clean_data(sample_data, verbose=False).index.tolist(), [1])
+
     def test_load_data_combines_files(self):
         df1 = pd.DataFrame({'review': ['Great'], 'rating': [5], 'date': ['2024-01-01'], 'bank': ['CBE'], 'source': ['Google Play']})
         df2 = pd.DataFrame({'review': ['Poor'], 'rating': [1], 'date': ['2024-01-02'], 'bank': ['BOA'], 'source': ['App Store']})
@@ -67,5 +134,57 @@ class TestPreprocessor(unittest.TestCase):
         self.assertTrue(result)
 
 
+class TestStreamingPreprocessor(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.preprocessor = Preprocessor(DataHandler())
+        reviews = ['Great app!', 'The transfer keeps failing', 'great app', 'በጣም ጥሩ ነው',
+                   'Login is very slow today', 'Great app!!', 'The transfer keeps failing']
+        self.raw = pd.DataFrame({
+            'review': reviews * 3,
+            'rating': [5, 1, 4, 5, 2, 5, 1] * 3,
+            'date': ['2024-01-01'] * 7 + ['2024-01-02'] * 7 + ['2024-01-01'] * 7,
+            'bank': ['CBE', 'BOA', 'CBE', 'Dashen', 'BOA', 'CBE', 'BOA'] * 3,
+            'source': ['Google Play'] * 21
+        })
+        self.paths = []
+        for i, part in enumerate([self.raw.iloc[:10], self.raw.iloc[10:]]):
+            path = os.path.join(self.tmp_dir.name, f'raw_{i}.csv')
+            part.to_csv(path, index=False)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_streaming_matches_in_memory(self):
+        expected = self.preprocessor.clean_data(self.raw.copy(), verbose=False)
+        output_path = os.path.join(self.tmp_dir.name, 'cleaned.csv')
+
+        chunks = (chunk for path in self.paths for chunk in DataHandler().iter_csv(path, 4))
+        rows_in, rows_out, languages = self.preprocessor.clean_stream(chunks, output_path)
+
+        streamed = pd.read_csv(output_path)
+        self.assertEqual(rows_in, len(self.raw))
+        self.assertEqual(rows_out, len(expected))
+        self.assertEqual(streamed['review'].tolist(), expected['review'].tolist())
+        self.assertEqual(streamed['date'].tolist(), expected['date'].tolist())
+        self.assertEqual(languages.sum(), len(expected))
+
+    def test_preprocess_streaming_with_budget(self):
+        output_path = os.path.join(self.tmp_dir.name, 'cleaned.csv')
+        expected = self.preprocessor.clean_data(self.raw.copy(), verbose=False)
+        self.assertTrue(self.preprocessor.preprocess_streaming(self.paths, output_path, memory_budget_mb=1))
+        self.assertEqual(len(pd.read_csv(output_path)), len(expected))
+
+    def test_seen_key_store_tracks_keys_across_calls(self):
+        seen = SeenKeyStore()
+        first = seen.add_new(np.array([1, 2, 2 ** 63 + 5], dtype=np.uint64))
+        second = seen.add_new(np.array([2, 3, 2 ** 63 + 5], dtype=np.uint64))
+        self.assertEqual(first.tolist(), [True, True, True])
+        self.assertEqual(second.tolist(), [False, True, False])
+        self.assertEqual(len(seen), 4)
+        seen.close()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,82 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+from src.task_1.preprocessor import Preprocessor
+from src.utils.raw_archive import RawArchive
+
+
+def make_payload(i, content=None):
+    return {
+        'reviewId': f'id-{i}',
+        'userName': 'user',
+        'content': content if content is not None else f'This banking app works well {i}',
+        'score': 1 + i % 5,
+        'thumbsUpCount': i,
+        'reviewCreatedVersion': '5.1',
+        'at': datetime(2025, 6, 1 + i % 28, 12, 0),
+        'replyContent': None,
+        'repliedAt': None,
+        'appVersion': '5.1',
+    }
+
+
+@pytest.fixture
+def archive_dir(tmp_path):
+    return str(tmp_path / 'archive')
+
+
+def test_append_and_replay_keeps_full_payload(archive_dir):
+    with RawArchive(archive_dir) as archive:
+        archive.append('app.one', 'Bank One', 'en', [make_payload(i) for i in range(3)])
+        archive.append('app.one', 'Bank One', 'am', [make_payload(3, content='  ')])
+
+    records = list(RawArchive(archive_dir).iter_records())
+    assert len(records) == 4
+    assert records[0]['reviewId'] == 'id-0'
+    assert records[1]['thumbsUpCount'] == 1
+    assert records[0]['appVersion'] == '5.1'
+    assert records[0]['bank'] == 'Bank One'
+
+    chunks = list(RawArchive(archive_dir).replay(chunk_size=2, include_metadata=True))
+    df = pd.concat(chunks, ignore_index=True)
+    assert [len(c) for c in chunks] == [2, 1]  # The blank review is skipped like in the scraper
+    assert list(df.columns[:5]) == ['review', 'rating', 'date', 'bank', 'source']
+    assert df.iloc[0]['date'] == '2025-06-01'
+    assert df.iloc[2]['review_id'] == 'id-2'
+
+
+def test_each_run_writes_new_segments_and_rotates(archive_dir):
+    with RawArchive(archive_dir) as archive:
+        archive.append('app.one', 'Bank One', 'en', [make_payload(0)])
+    archive = RawArchive(archive_dir, max_segment_bytes=1)
+    for i in range(3):
+        archive.append('app.one', 'Bank One', 'en', [make_payload(i)])
+    archive.close()
+
+    assert len(archive.segments()) == 4
+    assert len(list(archive.iter_records())) == 4
+
+
+def test_truncated_segment_keeps_complete_records(archive_dir):
+    with RawArchive(archive_dir) as archive:
+        archive.append('app.one', 'Bank One', 'en', [make_payload(i) for i in range(200)])
+    path = archive.segments()[0]
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:len(data) // 2])
+
+    records = list(RawArchive(archive_dir).iter_records())
+    assert 0 < len(records) < 200
+
+
+def test_preprocessor_replays_archive(archive_dir):
+    with RawArchive(archive_dir) as archive:
+        archive.append('app.one', 'Bank One', 'en', [make_payload(i) for i in range(3)])
+
+    preprocessor = Preprocessor(MagicMock())
+    df = preprocessor.load_archive(RawArchive(archive_dir))
+    assert len(df) == 3
+    assert set(df['bank']) == {'Bank One'}
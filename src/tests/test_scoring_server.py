@@ -0,0 +1,180 @@
+import asyncio
+import json
+import time
+import numpy as np
+import pytest
+from src.task_2.scoring_server import LatencyTracker, MicroBatcher, ScoringServer, ScoringService
+from src.task_2.sentiment_analyzer import SentimentAnalyzer
+
+
+def test_concurrent_submissions_share_batches():
+    batch_sizes = []
+
+    def score_batch(items):
+        batch_sizes.append(len(items))
+        return [item * 2 for item in items]
+
+    async def run():
+        batcher = MicroBatcher(score_batch, max_batch_size=4, max_wait_ms=50)
+        batcher.start()
+        results = await asyncio.gather(*[batcher.submit(i) for i in range(10)])
+        metrics = batcher.metrics()
+        await batcher.stop()
+        return results, metrics
+
+    results, metrics = asyncio.run(run())
+    assert results == [i * 2 for i in range(10)]
+    assert batch_sizes == [4, 4, 2]
+    assert metrics['batches'] == 3 and metrics['max_queue_depth'] == 10 and metrics['queue_depth'] == 0
+
+
+def test_lone_request_waits_at_most_max_wait():
+    async def run():
+        batcher = MicroBatcher(lambda items: items, max_batch_size=32, max_wait_ms=20)
+        batcher.start()
+        start = time.perf_counter()
+        result = await batcher.submit('only')
+        elapsed = time.perf_counter() - start
+        await batcher.stop()
+        return result, elapsed
+
+    result, elapsed = asyncio.run(run())
+    assert result == 'only'
+    assert 0.015 <= elapsed < 0.5
+
+
+def test_batch_errors_reach_every_caller():
+    def score_batch(items):
+        raise RuntimeError("model failed")
+
+    async def run():
+        batcher = MicroBatcher(score_batch, max_batch_size=2, max_wait_ms=5)
+        batcher.start()
+        results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+        await batcher.stop()
+        return results
+
+    assert all(isinstance(r, RuntimeError) for r in asyncio.run(run()))
+
+
+def test_detection_and_lexicon_run_off_the_event_loop():
+    import threading
+
+    class RecordingDetector:
+        def __init__(self):
+            self.calls = []
+
+        def detect_many(self, texts):
+            self.calls.append((threading.current_thread().name, list(texts)))
+            return ['amharic' if 'ጥሩ' in text else 'spanish' for text in texts]
+
+    class RecordingLexicon:
+        def __init__(self):
+            self.threads = []
+
+        def score(self, texts):
+            self.threads.append(threading.current_thread().name)
+            return np.full(len(texts), 0.5)
+
+    class StubAnalyzer:
+        language_detector = RecordingDetector()
+        lexicon_scorer = RecordingLexicon()
+
+    analyzer = StubAnalyzer()
+
+    async def run():
+        service = ScoringService(analyzer, max_batch_size=8)
+        service.start()
+        results = await asyncio.gather(*[service.score(review) for review in ['ጥሩ ነው', 'hola', 'ጥሩ', '   ']])
+        await service.stop()
+        return results, service.metrics()
+
+    results, metrics = asyncio.run(run())
+    assert [r['language'] for r in results] == ['amharic', 'spanish', 'amharic', 'unknown']
+    assert [r['score'] for r in results] == [0.5, 0.0, 0.5, 0.0]
+    # Concurrent cache misses share one detection call, on the routing thread
+    assert len(analyzer.language_detector.calls) == 1
+    assert all(name.startswith('routing') for name, _ in analyzer.language_detector.calls)
+    assert all(name.startswith('routing') for name in analyzer.lexicon_scorer.threads)
+    assert metrics['routing']['batches'] == 1
+
+
+def test_latency_tracker_percentiles():
+    tracker = LatencyTracker(window=100)
+    for ms in range(1, 101):
+        tracker.record(ms / 1000)
+    summary = tracker.summary()
+    assert summary['count'] == 100 and summary['max_ms'] == 100.0
+    assert 49 <= summary['p50_ms'] <= 51 and summary['p99_ms'] >= 99
+
+
+async def http_request(url, method, path, payload=None):
+    host, port = url[len('http://'):].split(':')
+    reader, writer = await asyncio.open_connection(host, int(port))
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n"
+                 f"Connection: close\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, data = response.partition(b'\r\n\r\n')
+    return int(head.split(b' ')[1]), json.loads(data)
+
+
+def test_server_routes_languages_and_reports_metrics(tiny_model_dir):
+    from transformers import pipeline
+
+    analyzer = SentimentAnalyzer(sentiment_pipeline=pipeline('sentiment-analysis', model=tiny_model_dir))
+    expected_english = analyzer.score_english(np.array(['great app'], dtype=object))[0]
+
+    async def run():
+        server = await ScoringServer(ScoringService(analyzer, max_batch_size=8, max_wait_ms=10), port=0).start()
+        try:
+            single = await http_request(server.url, 'POST', '/score', {'review': 'Great app!!', 'language': 'english'})
+            many = await http_request(server.url, 'POST', '/score', {
+                'reviews': ['great app', 'ጥሩ አይደለም', 'hola'],
+                'languages': ['english', 'amharic', 'spanish']
+            })
+            metrics = await http_request(server.url, 'GET', '/metrics')
+            missing = await http_request(server.url, 'GET', '/nowhere')
+            invalid = await http_request(server.url, 'POST', '/score', {'text': 'x'})
+        finally:
+            await server.stop()
+        return single, many, metrics, missing, invalid
+
+    single, many, metrics, missing, invalid = asyncio.run(run())
+    assert single[0] == 200 and single[1]['score'] == pytest.approx(expected_english)
+    results = many[1]['results']
+    assert [r['language'] for r in results] == ['english', 'amharic', 'spanish']
+    assert results[1]['label'] == 'negative'  # Negated 'ጥሩ'
+    assert results[2] == {**results[2], 'label': 'neutral', 'score': 0.0}
+    assert metrics[1]['routes'] == {'english': 2, 'amharic': 1, 'other': 1}
+    assert metrics[1]['latency']['count'] == 4 and metrics[1]['batching']['batches'] >= 1
+    assert missing[0] == 404 and invalid[0] == 400
+
+
+class EchoService:
+    """Stands in for ScoringService: echoes each review's language without a model."""
+
+    def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def score(self, review, language=None):
+        return {'review': review, 'language': language}
+
+
+def test_server_rejects_languages_of_the_wrong_length():
+    async def run():
+        server = await ScoringServer(EchoService(), port=0).start()
+        try:
+            return [await http_request(server.url, 'POST', '/score', {'reviews': ['a', 'b'], 'languages': languages})
+                    for languages in (['english'], ['english', 'amharic', 'english'], ['english', None])]
+        finally:
+            await server.stop()
+
+    short, long, matching = asyncio.run(run())
+    assert short[0] == 400 and long[0] == 400
+    assert matching[0] == 200 and [r['language'] for r in matching[1]['results']] == ['english', None]
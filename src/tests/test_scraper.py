@@ -70,3 +70,115 @@ def test_scrape_all_banks(mock_reviews, scraper, sample_reviews):
     # Check total rows
     expected_rows = len(sample_reviews) * len(banks_in_config)
     assert len(df) == expected_rows
+
+
+def make_feed(count):
+    """Newest-first fake review feed with stable ids."""
+    return [
+        {
+            'reviewId': f'r{i}',
+            'content': f'Review number {i}',
+            'score': 1 + i % 5,
+            'at': pd.Timestamp('2025-06-01') + pd.Timedelta(days=i),
+        }
+        for i in range(count - 1, -1, -1)
+    ]
+
+
+def paged_reviews(feed, calls=None, fail_on_call=None, error=KeyboardInterrupt):
+    """Build a fetch_review_page() stand-in that pages through feed via string offsets as tokens."""
+
+    def fake_fetch(app_id, lang, count, token=None, country='et'):
+        if calls is not None:
+            calls.append(token)
+            if fail_on_call is not None and len(calls) == fail_on_call:
+                raise error
+        offset = int(token) if token is not None else 0
+        page = feed[offset:offset + count]
+        next_token = str(offset + count) if offset + count < len(feed) else None
+        return page, next_token
+
+    return fake_fetch
+
+
+@patch('src.task_1.scraper.fetch_review_page')
+def test_incremental_scrape_stops_at_watermark(mock_reviews, scraper, tmp_path):
+    """A second delta run pages only until it reaches already-seen reviews."""
+    from src.utils.watermark_store import WatermarkStore
+
+    store = WatermarkStore(str(tmp_path / 'scrape_state.json'))
+    mock_reviews.side_effect = paged_reviews(make_feed(5))
+    df = scraper.scrape_reviews_incremental('test.app.id', 'Test Bank', store, page_size=2)
+    assert len(df) == 5  # EN and AM share the fake feed, dedup leaves 5
+    store.commit()
+
+    calls = []
+    mock_reviews.side_effect = paged_reviews(make_feed(7), calls)
+    df = scraper.scrape_reviews_incremental('test.app.id', 'Test Bank', store, page_size=2)
+    assert sorted(df['review']) == ['Review number 5', 'Review number 6']
+    assert len(calls) == 4  # Two pages per language, the second one hits the watermark
+
+
+@patch('src.task_1.scraper.fetch_review_page')
+def test_incremental_scrape_resumes_after_interrupt(mock_reviews, scraper, tmp_path):
+    """An interrupted delta run resumes from the saved continuation token."""
+    from src.utils.watermark_store import WatermarkStore
+
+    store = WatermarkStore(str(tmp_path / 'scrape_state.json'))
+    calls = []
+    mock_reviews.side_effect = paged_reviews(make_feed(6), calls, fail_on_call=2)
+    with pytest.raises(KeyboardInterrupt):
+        scraper.scrape_reviews_incremental('test.app.id', 'Test Bank', store, page_size=2)
+
+    calls = []
+    store = WatermarkStore(str(tmp_path / 'scrape_state.json'))
+    mock_reviews.side_effect = paged_reviews(make_feed(6), calls)
+    df = scraper.scrape_reviews_incremental('test.app.id', 'Test Bank', store, page_size=2)
+    assert calls[0] == '2'  # Picked up after the first EN page
+    assert len(df) == 6
+
+
+@patch('src.task_1.scraper.fetch_review_page')
+def test_incremental_scrape_failed_fetch_keeps_checkpoint(mock_reviews, scraper, tmp_path):
+    """A fetch error mid-stream raises and never moves the watermark, even if commit() runs."""
+    from src.utils.watermark_store import WatermarkStore
+
+    store = WatermarkStore(str(tmp_path / 'scrape_state.json'))
+    calls = []
+    mock_reviews.side_effect = paged_reviews(make_feed(6), calls, fail_on_call=2, error=ConnectionError('reset'))
+    with pytest.raises(ConnectionError):
+        scraper.scrape_reviews_incremental('test.app.id', 'Test Bank', store, page_size=2)
+    store.commit()
+    assert store.get_watermark('test.app.id', 'en') is None
+    assert store.get_checkpoint('test.app.id', 'en')['token'] == '2'
+
+    calls = []
+    mock_reviews.side_effect = paged_reviews(make_feed(6), calls)
+    df = scraper.scrape_reviews_incremental('test.app.id', 'Test Bank', store, page_size=2)
+    assert calls[0] == '2'
+    assert len(df) == 6
+    store.commit()
+    assert store.get_watermark('test.app.id', 'en')['review_id'] == 'r5'
+
+
+@patch('src.task_1.scraper.fetch_review_page')
+def test_incremental_scrape_cap_pauses_without_gap(mock_reviews, scraper, tmp_path):
+    """Stopping at max_reviews keeps the token; later runs backfill the rest before advancing the watermark."""
+    from src.utils.watermark_store import WatermarkStore
+
+    store = WatermarkStore(str(tmp_path / 'scrape_state.json'))
+    mock_reviews.side_effect = paged_reviews(make_feed(6))
+    seen = []
+    for _ in range(3):
+        df = scraper.scrape_reviews_incremental('test.app.id', 'Test Bank', store, page_size=2, max_reviews=2)
+        assert len(df) == 2
+        seen += list(df['review'])
+        if len(seen) < 6:
+            assert store.get_watermark('test.app.id', 'en') is None
+        store.commit()
+    assert sorted(seen) == sorted(f'Review number {i}' for i in range(6))
+    assert store.get_watermark('test.app.id', 'en')['review_id'] == 'r5'
+
+    mock_reviews.side_effect = paged_reviews(make_feed(8))
+    df = scraper.scrape_reviews_incremental('test.app.id', 'Test Bank', store, page_size=2, max_reviews=2)
+    assert sorted(df['review']) == ['Review number 6', 'Review number 7']
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 import pandas as pd
 from src.task_2.sentiment_analyzer import SentimentAnalyzer
 
@@ -49,3 +50,91 @@ def test_aggregation(sample_df):
     print("\nAggregation passed.\n")
     print(agg_df)
 
+
+# --------------------------------
+# Batched inference, checked offline against a tiny randomly initialized DistilBERT
+# --------------------------------
+
+@pytest.fixture
+def tiny_analyzer(tiny_model_dir):
+    from transformers import pipeline
+    return SentimentAnalyzer(batch_size=2, sentiment_pipeline=pipeline('sentiment-analysis', model=tiny_model_dir))
+
+
+def test_batched_scores_match_per_row_pipeline(tiny_analyzer):
+    texts = ['great app', 'bad service , not happy .', 'good but could be better !',
+             'the app is very slow', '', 'crash ' * 600]
+    scores = tiny_analyzer.score_english(np.array(texts, dtype=object))
+
+    for text, score in zip(texts, scores):
+        if not text.strip():
+            assert score == 0.0
+            continue
+        result = tiny_analyzer.sentiment_pipeline(text, truncation=True, max_length=512)[0]
+        expected = result['score'] if result['label'] == 'POSITIVE' else -result['score']
+        assert score == pytest.approx(expected, abs=1e-5)
+
+
+def test_language_routing_in_sentiment_analysis(tiny_analyzer, sample_df):
+    df = sample_df.assign(language=['english', 'english', 'amharic', 'amharic', 'english', 'amharic'])
+    df = tiny_analyzer.sentiment_analysis(df)
+
+    assert df['sentiment_label'].isin(['positive', 'neutral', 'negative']).all()
+    assert df.loc[3, 'sentiment_label'] == 'negative' and df.loc[3, 'sentiment_score'] == pytest.approx(np.tanh(-2))
+    english = df['language'] == 'english'
+    assert (df.loc[english, 'sentiment_score'].abs() > 0).all()
+
+
+def test_cache_scores_each_text_once_across_runs(tiny_model_dir, tmp_path):
+    from unittest.mock import patch
+    from transformers import pipeline
+    from src.utils.sentiment_cache import SentimentCache
+
+    cache = SentimentCache(str(tmp_path / 'sentiment_cache.sqlite'))
+    analyzer = SentimentAnalyzer(sentiment_pipeline=pipeline('sentiment-analysis', model=tiny_model_dir),
+                                 sentiment_cache=cache)
+    texts = np.array(['great app', 'bad service', 'great app', 'the app is very slow'], dtype=object)
+
+    with patch.object(analyzer, '_score_batched', wraps=analyzer._score_batched) as spy:
+        first = analyzer.score_english(texts)
+        assert len(spy.call_args[0][0]) == 3  # Identical texts are scored once
+        second = analyzer.score_english(texts)
+        assert len(spy.call_args[0][0]) == 0  # Second run is served from the cache
+
+    np.testing.assert_allclose(first, second)
+    assert first[0] == first[2]
+    assert cache.hits == 3 and cache.misses == 3
+    cache.close()
+
+
+def test_sharded_scoring_matches_serial_order(tiny_model_dir):
+    from transformers import pipeline
+
+    texts = np.array([' '.join(['great app'] * (i % 7 + 1) + ['bad service'] * (i % 3)) + f' {i}'
+                      for i in range(50)], dtype=object)
+    serial = SentimentAnalyzer(sentiment_pipeline=pipeline('sentiment-analysis', model=tiny_model_dir))
+    sharded = SentimentAnalyzer(backend=serial.backend, workers=2, threads_per_worker=1, shard_size=8)
+
+    np.testing.assert_allclose(sharded.score_english(texts), serial.score_english(texts), atol=1e-6)
+
+
+def test_aggregate_sentiment_reads_rollup(tiny_model_dir, tmp_path):
+    from transformers import pipeline
+    from src.task_2.sentiment_rollup import SentimentRollup
+    df = pd.DataFrame({
+        'review': ['great app', 'slow app', 'works well', 'keeps crashing'],
+        'bank': ['Dashen Bank', 'Dashen Bank', 'Bank of Abyssinia', 'Bank of Abyssinia'],
+        'rating': [5, 5, 4, 1],
+        'date': ['2024-01-01', '2024-01-02', '2024-02-01', '2024-02-03'],
+        'language': 'english',
+        'sentiment_label': ['positive', 'negative', 'positive', 'negative'],
+        'sentiment_score': [0.9, -0.5, 0.4, -0.8],
+    })
+    plain = SentimentAnalyzer(sentiment_pipeline=pipeline('sentiment-analysis', model=tiny_model_dir))
+    cubed = SentimentAnalyzer(sentiment_pipeline=plain.sentiment_pipeline,
+                              rollup=SentimentRollup(str(tmp_path / 'rollup.sqlite')))
+
+    expected = plain.aggregate_sentiment(df)
+    pd.testing.assert_frame_equal(cubed.aggregate_sentiment(df), expected, check_dtype=False)
+    # A rerun over the same reviews leaves the cube unchanged
+    pd.testing.assert_frame_equal(cubed.aggregate_sentiment(df), expected, check_dtype=False)
@@ -0,0 +1,44 @@
+import pytest
+from src.utils.sentiment_cache import SentimentCache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'sentiment_cache.sqlite')
+
+
+def test_scores_round_trip_per_model_revision(cache_path):
+    cache = SentimentCache(cache_path)
+    cache.bind('model-a', 'rev1')
+    cache.put_many([1, 2], [0.9, -0.8])
+    assert cache.get_many([1, 2, 3]) == {1: 0.9, 2: -0.8}
+    assert cache.hits == 2 and cache.misses == 1
+
+    # Another model shares the file but not the entries
+    cache.bind('model-b', 'rev1')
+    assert cache.get_many([1, 2]) == {}
+    cache.close()
+
+
+def test_new_revision_invalidates_old_scores(cache_path):
+    cache = SentimentCache(cache_path)
+    cache.bind('model-a', 'rev1')
+    cache.put_many([1], [0.9])
+    cache.bind('model-b', 'rev1')
+    cache.put_many([1], [0.5])
+    cache.close()
+
+    reopened = SentimentCache(cache_path)
+    reopened.bind('model-a', 'rev2')
+    assert reopened.get_many([1]) == {}
+    assert len(reopened) == 1  # model-b's entry is kept
+    reopened.close()
+
+
+def test_lookup_handles_large_key_batches(cache_path):
+    cache = SentimentCache(cache_path)
+    cache.bind('model-a', 'rev1')
+    keys = list(range(-1200, 1200))
+    cache.put_many(keys, [k / 10000 for k in keys])
+    assert len(cache.get_many(keys)) == len(keys)
+    cache.close()
@@ -0,0 +1,106 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.task_2.sentiment_rollup import SentimentRollup
+
+
+def make_scored(n, seed=0, start='2024-01-01'):
+    rng = np.random.default_rng(seed)
+    scores = rng.uniform(-1, 1, n)
+    return pd.DataFrame({
+        'review': [f"review number {seed}-{i}" for i in range(n)],
+        'bank': rng.choice(['Dashen Bank', 'Bank of Abyssinia', 'Commercial Bank of Ethiopia'], n),
+        'rating': rng.integers(1, 6, n),
+        'language': rng.choice(['english', 'amharic'], n),
+        'sentiment_label': np.select([scores > 0.1, scores < -0.1], ['positive', 'negative'], 'neutral'),
+        'sentiment_score': scores,
+        'date': (pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, 120, n), unit='D')).strftime('%Y-%m-%d'),
+    })
+
+
+@pytest.fixture
+def rollup(tmp_path):
+    rollup = SentimentRollup(str(tmp_path / 'rollup.sqlite'))
+    yield rollup
+    rollup.close()
+
+
+def test_incremental_updates_match_full_groupby(rollup):
+    first, second = make_scored(500, seed=1), make_scored(300, seed=2)
+    assert rollup.update(first) == 500
+    # Re-feeding history together with new reviews only adds the new ones
+    assert rollup.update(pd.concat([first, second])) == 300
+    assert len(rollup) == 800
+
+    expected = pd.concat([first, second]).groupby(['bank', 'rating'])['sentiment_score'].agg(['count', 'mean', 'std'])
+    result = rollup.query(['bank', 'rating']).set_index(['bank', 'rating'])
+    np.testing.assert_array_equal(result['count'], expected['count'])
+    np.testing.assert_allclose(result['mean'], expected['mean'])
+    np.testing.assert_allclose(result['std'], expected['std'])
+
+
+def test_monthly_trend_and_filters(rollup, tmp_path):
+    df = make_scored(400, seed=3)
+    rollup.update(df)
+    rollup.close()
+
+    reopened = SentimentRollup(str(tmp_path / 'rollup.sqlite'))
+    trend = reopened.query(['bank'], freq='M', language='english')
+    english = df[df['language'] == 'english'].assign(period=pd.to_datetime(df['date']).dt.to_period('M').dt.start_time)
+    expected = english.groupby(['bank', 'period'])['sentiment_score'].agg(['count', 'mean'])
+    result = trend.set_index(['bank', 'period'])
+    np.testing.assert_array_equal(result['count'], expected['count'])
+    np.testing.assert_allclose(result['mean'], expected['mean'])
+    assert (result['ci95'].dropna() > 0).all()
+
+    overall = reopened.query([])
+    assert overall['count'].iloc[0] == 400
+    reopened.close()
+
+
+def test_new_revision_rebuilds_cube(rollup):
+    rollup.bind('model@rev1')
+    rollup.update(make_scored(50))
+    rollup.bind('model@rev1')
+    assert len(rollup) == 50
+    rollup.bind('model@rev2')
+    assert len(rollup) == 0 and rollup.query(['bank']).empty
+
+
+def test_rescored_reviews_move_to_their_new_cells(rollup):
+    df = make_scored(300, seed=4)
+    rollup.update(df)
+    # Some reviews are re-scored (e.g. a fallback score replaced by the model's), flipping label and score
+    rescored = df.copy()
+    rescored.loc[:49, 'sentiment_score'] = -rescored.loc[:49, 'sentiment_score']
+    rescored.loc[:49, 'sentiment_label'] = 'rescored'
+    assert rollup.update(rescored) == 50
+    assert rollup.update(rescored) == 0
+    assert len(rollup) == 300
+
+    expected = rescored.groupby(['bank', 'sentiment_label'])['sentiment_score'].agg(['count', 'mean', 'std'])
+    result = rollup.query(['bank', 'sentiment_label']).set_index(['bank', 'sentiment_label'])
+    np.testing.assert_array_equal(result['count'], expected['count'])
+    np.testing.assert_allclose(result['mean'], expected['mean'])
+    np.testing.assert_allclose(result['std'], expected['std'])
+
+
+def test_cube_without_review_scores_is_rebuilt(tmp_path):
+    path = str(tmp_path / 'old.sqlite')
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE reviews (key INTEGER PRIMARY KEY)")
+    conn.execute("INSERT INTO reviews VALUES (1)")
+    conn.commit()
+    conn.close()
+
+    rollup = SentimentRollup(path)
+    assert len(rollup) == 0
+    assert rollup.update(make_scored(20)) == 20
+    rollup.close()
+
+
+def test_unknown_dimension_is_rejected(rollup):
+    with pytest.raises(ValueError):
+        rollup.query(['theme'])
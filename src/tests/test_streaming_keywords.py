@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from src.task_2.streaming_keywords import StreamingKeywordExtractor
+from src.task_2.theme_analyzer import ThemeAnalyzer
+
+WORDS = ['login', 'failed', 'transfer', 'slow', 'app', 'great', 'support', 'otp', 'crash', 'update', 'balance']
+
+
+def make_corpus(n, seed=0):
+    rng = np.random.default_rng(seed)
+    reviews = [' '.join(rng.choice(WORDS, rng.integers(1, 7))) for _ in range(n)]
+    banks = rng.choice(['Dashen Bank', 'Bank of Abyssinia'], n)
+    return reviews, banks
+
+
+def exact_scores(reviews, banks, bank):
+    """Summed l2-normalized term frequencies of one bank times the smoothed corpus IDF."""
+    tf = TfidfVectorizer(ngram_range=(1, 3), stop_words='english', use_idf=False)
+    X = tf.fit_transform(reviews)
+    doc_freq = (CountVectorizer(ngram_range=(1, 3), stop_words='english', vocabulary=tf.vocabulary_, binary=True)
+                .transform(reviews).sum(axis=0).A1)
+    idf = np.log((1 + len(reviews)) / (1 + doc_freq)) + 1
+    scores = X[np.asarray(banks) == bank].sum(axis=0).A1 * idf
+    return dict(zip(tf.get_feature_names_out(), scores))
+
+
+def test_streaming_scores_match_exact_tfidf_sums():
+    reviews, banks = make_corpus(600)
+    extractor = StreamingKeywordExtractor(sample_per_chunk=1000)
+    for start in range(0, 600, 200):
+        extractor.partial_fit(reviews[start:start + 200], banks[start:start + 200])
+
+    top = extractor.top_keywords(top_n=10)
+    for bank in ['Dashen Bank', 'Bank of Abyssinia']:
+        expected = exact_scores(reviews, banks, bank)
+        bank_top = top[top['group'] == bank]
+        assert bank_top['rank'].tolist() == list(range(1, 11))
+        for keyword, score in zip(bank_top['keyword'], bank_top['score']):
+            assert np.isclose(score, expected[keyword], rtol=1e-4)
+        best = sorted(expected.values(), reverse=True)[:10]
+        np.testing.assert_allclose(bank_top['score'], best, rtol=1e-4)
+
+
+def test_chunking_does_not_change_results():
+    reviews, banks = make_corpus(400, seed=1)
+    single = StreamingKeywordExtractor(sample_per_chunk=400).partial_fit(reviews, banks)
+    chunked = StreamingKeywordExtractor(sample_per_chunk=400)
+    for start in range(0, 400, 64):
+        chunked.partial_fit(reviews[start:start + 64], banks[start:start + 64])
+    pd.testing.assert_frame_equal(chunked.top_keywords(5), single.top_keywords(5), rtol=1e-5)
+
+
+def test_memory_stays_fixed_and_reverse_map_bounded():
+    extractor = StreamingKeywordExtractor(n_features=2 ** 12, reverse_map_size=50)
+    reviews, banks = make_corpus(200, seed=2)
+    extractor.partial_fit(reviews, banks)
+    size = extractor.memory_bytes
+    extractor.partial_fit(*make_corpus(2000, seed=3))
+    assert extractor.memory_bytes == size
+    assert len(extractor.reverse_map) <= 50
+
+
+def test_theme_analyzer_streaming_mode(tmp_path):
+    reviews, banks = make_corpus(300, seed=4)
+    path = tmp_path / 'reviews.csv'
+    pd.DataFrame({'review': reviews, 'bank': banks, 'language': 'english'}).to_csv(path, index=False)
+    results = ThemeAnalyzer(input_path=str(path)).extract_keywords_streaming(top_n=5, chunksize=70)
+    assert set(results) == {'Dashen Bank', 'Bank of Abyssinia'}
+    assert any(keywords for keywords in results['Dashen Bank'].values())
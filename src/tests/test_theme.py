@@ -54,5 +54,23 @@ class TestThemeAnalyzer(unittest.TestCase):
         self.assertIn("Other", grouped)
         self.assertEqual(len(grouped["Other"]), 1)
 
+    def test_tag_reviews(self):
+        df = self.analyzer.tag_reviews(self.analyzer.load_data().copy())
+        self.assertEqual(df['theme'].tolist(),
+                         ["Account Access Issues", "Transaction Performance", "User Interface & Experience"])
+        self.assertEqual(df['themes'].iloc[0], "Account Access Issues|User Interface & Experience")
+
+    def test_keyword_scores_share_one_vocabulary(self):
+        self.analyzer.load_data()
+        scores = self.analyzer.keyword_scores(['bank'], top_n=3)
+        X = self.analyzer.tfidf_matrix.toarray()
+        features = list(self.analyzer.feature_names)
+        for bank, bank_scores in scores.groupby('bank'):
+            sums = X[(self.analyzer.df['bank'] == bank).to_numpy()].sum(axis=0)
+            self.assertEqual(bank_scores['rank'].tolist(), [1, 2, 3])
+            for keyword, score in zip(bank_scores['keyword'], bank_scores['score']):
+                self.assertAlmostEqual(score, sums[features.index(keyword)], places=5)
+            self.assertAlmostEqual(bank_scores['score'].iloc[0], sums.max(), places=5)
+
 if __name__ == '__main__':
     unittest.main()
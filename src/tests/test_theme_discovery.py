@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+from sklearn.metrics import adjusted_rand_score
+from src.task_2.theme_analyzer import ThemeAnalyzer
+from src.task_2.theme_discovery import ThemeDiscovery
+
+TOPICS = [
+    ['login', 'password', 'otp', 'locked', 'account'],
+    ['transfer', 'money', 'send', 'deposit', 'transaction'],
+    ['support', 'agent', 'call', 'response', 'help'],
+]
+FILLER = ['the', 'very', 'my', 'again', 'today']
+
+
+def make_reviews(n, seed=0):
+    rng = np.random.default_rng(seed)
+    topics = rng.integers(0, len(TOPICS), n)
+    reviews = [' '.join(rng.permutation(list(rng.choice(TOPICS[t], 3)) + list(rng.choice(FILLER, 2))))
+               for t in topics]
+    return reviews, topics
+
+
+def test_discovers_planted_themes():
+    reviews, topics = make_reviews(3000)
+    discovery = ThemeDiscovery(n_themes=3, n_components=10, batch_size=500).fit(reviews)
+    assert adjusted_rand_score(topics, discovery.predict(reviews)) > 0.95
+    # Each label is made of one topic's words
+    for label in discovery.labels:
+        terms = label.split(', ')
+        assert any(sum(term in topic for term in terms) >= 3 for topic in TOPICS)
+
+
+def test_partial_fit_keeps_themes_and_vocabulary():
+    reviews, _ = make_reviews(2000, seed=1)
+    discovery = ThemeDiscovery(n_themes=3, n_components=10, batch_size=500).fit(reviews)
+    vocabulary = dict(discovery.vectorizer.vocabulary_)
+    before = discovery.predict(reviews)
+    new_reviews, _ = make_reviews(500, seed=2)
+    discovery.partial_fit(new_reviews)
+    assert discovery.vectorizer.vocabulary_ == vocabulary
+    assert adjusted_rand_score(before, discovery.predict(reviews)) > 0.95
+
+
+def test_theme_analyzer_saves_shares_per_bank(tmp_path):
+    reviews, _ = make_reviews(600, seed=3)
+    analyzer = ThemeAnalyzer()
+    analyzer.df = pd.DataFrame({'review': reviews, 'bank': ['Dashen Bank', 'Bank of Abyssinia'] * 300})
+    output_path = tmp_path / 'discovered.csv'
+    analyzer.discover_themes(3, output_path=str(output_path), n_components=10, batch_size=200)
+    summary = pd.read_csv(output_path)
+    assert set(summary.columns) == {'bank', 'theme_id', 'reviews', 'label', 'share'}
+    assert summary['reviews'].sum() == 600
+    np.testing.assert_allclose(summary.groupby('bank')['share'].sum(), 1.0)
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.task_2.theme_tagger import ThemeTagger
+
+THEMES = {
+    "Account Access": ["login", "log in", "login failed", "password"],
+    "Transactions": ["transfer", "failed transfer", "send money"],
+    "Experience": ["app", "crash", "slow"],
+}
+
+
+@pytest.fixture
+def tagger():
+    return ThemeTagger(THEMES)
+
+
+def test_keywords_match_whole_words_only(tagger):
+    masks = tagger.bitmasks(["happy with it", "the app works", "my password", "passwords everywhere"])
+    assert masks.tolist() == [0, 0b100, 0b001, 0]
+
+
+def test_overlapping_keywords_tag_every_theme(tagger):
+    # 'login failed' and 'failed transfer' share a word; 'log in' also starts like 'login'
+    masks = tagger.bitmasks(["Login failed transfer", "cannot LOG  IN", "send money now, slow"])
+    assert tagger.matrix(masks).tolist() == [
+        [True, True, False],
+        [True, False, False],
+        [False, True, True],
+    ]
+
+
+def test_tag_adds_primary_and_all_themes(tagger):
+    df = pd.DataFrame({'review': ["app crash after login", "nothing to report", None]})
+    df = tagger.tag(df)
+    assert df['theme'].tolist() == ["Account Access", "Other", "Other"]
+    assert df['themes'].tolist() == ["Account Access|Experience", "Other", "Other"]
+
+
+def test_matches_per_review_substring_scan_on_random_reviews(tagger):
+    rng = np.random.default_rng(0)
+    words = ['login', 'log', 'in', 'failed', 'transfer', 'send', 'money', 'app', 'apps', 'slow', 'crash', 'ok']
+    texts = [' '.join(rng.choice(words, rng.integers(0, 8))) for _ in range(500)]
+    expected = [
+        sum(1 << bit for bit, keywords in enumerate(THEMES.values())
+            if any(f" {keyword} " in f" {text} " for keyword in keywords))
+        for text in texts
+    ]
+    assert tagger.bitmasks(texts).tolist() == expected
+
+
+def test_too_many_themes_for_a_bitmask():
+    with pytest.raises(ValueError):
+        ThemeTagger({f"theme {i}": [f"word{i}"] for i in range(65)})
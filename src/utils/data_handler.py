@@ -16,6 +16,20 @@ class DataHandler:
             print(f"Error reading {path}: {e}")
             return pd.DataFrame(columns=['review', 'rating', 'date', 'bank', 'source'])
 
+    def iter_csv(self, path, chunksize):
+        """Yield a CSV file as DataFrames of at most chunksize rows."""
+        try:
+            for chunk in pd.read_csv(path, encoding='utf-8', chunksize=chunksize):
+                yield chunk
+        except FileNotFoundError:
+            print(f"Error reading {path}: file not found")
+
+    def append_csv(self, df, path, header):
+        """Append DataFrame rows to a CSV file, writing the header only when asked."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        df.to_csv(path, mode='w' if header else 'a', header=header, index=False, encoding='utf-8')
+        return True
+
     def write_csv(self, df, path):
         """Write DataFrame to CSV file."""
         try:
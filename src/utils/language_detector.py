@@ -0,0 +1,196 @@
+import hashlib
+import os
+import re
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from langdetect import DetectorFactory, detect, LangDetectException
+from langdetect.detector_factory import init_factory
+
+DETECTOR_VERSION = '1'
+
+# Expand this list based on your real-world dataset
+KNOWN_SENTIMENT_WORDS = {
+    'good', 'bad', 'great', 'nice', 'love', 'hate', 'ok', 'perfect', 'poor', 'worst',
+    'Top', 'best', 'cool', 'sweet', 'fast', 'week', 'slow', 'buggy', 'fake', 'messy', 'Fine',
+    'Fair', 'Basic', 'አሪፍ', 'ጥሩ', 'በጣም ጥሩ', 'መልካም', 'መጥፎ', 'በጣም መጥፎ', 'ከፍተኛ', 'ምርጥ',
+    'አሪፍ', 'ቀርፋፋ', 'ደካማ', 'የውሸት', 'እሺ', 'ፍትሃዊ', 'መሠረታዊ'
+}
+
+
+def detect_language(text):
+    try:
+        if not text or pd.isna(text):
+            return 'unknown'
+
+        text_clean = text.strip().lower()
+        if not text_clean:
+            return 'unknown'
+
+        # If very short and not known sentiment word, ignore
+        if len(text_clean) < 5 and text_clean not in KNOWN_SENTIMENT_WORDS:
+            return 'unknown'
+
+        # Check for Amharic script
+        if re.search(r'[\u1200-\u137F]', text_clean):
+            amharic_chars = len(re.findall(r'[\u1200-\u137F]', text_clean))
+            if amharic_chars / len(text_clean) > 0.5:
+                return 'amharic'
+            else:
+                return 'bilingual'
+
+        # Fallback to langdetect
+        lang = detect(text_clean)
+        if lang == 'en':
+            return 'english'
+        return lang
+    except LangDetectException:
+        return 'unknown'
+
+
+def text_key(text_clean):
+    """Signed 64-bit hash of normalized text, usable as an SQLite INTEGER key."""
+    return int.from_bytes(hashlib.blake2b(text_clean.encode('utf-8'), digest_size=8).digest(), 'little', signed=True)
+
+
+def _init_worker(seed):
+    """Load the langdetect profiles once per worker process."""
+    DetectorFactory.seed = seed
+    init_factory()
+
+
+def _detect_chunk(texts):
+    return [detect_language(text) for text in texts]
+
+
+class LanguageDetector:
+    def __init__(self, cache_path='data/cache/language_cache.sqlite', max_memory_entries=100000, seed=0,
+                 workers=1, chunk_size=2000):
+        """Memoized language identification with a bounded LRU and an optional persistent SQLite cache.
+
+        With workers > 1, cache misses are split into chunk_size batches across a process pool.
+        """
+        self.cache_path = cache_path
+        self.max_memory_entries = max_memory_entries
+        self.seed = seed
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        # A fixed seed makes langdetect's sampling, and therefore the cache, deterministic
+        DetectorFactory.seed = seed
+
+        self.conn = None
+        if cache_path:
+            os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+            # The scoring server queries the cache from its routing thread (one at a time)
+            self.conn = sqlite3.connect(cache_path, check_same_thread=False)
+            self._init_db()
+
+    def _init_db(self):
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS languages (text_hash INTEGER PRIMARY KEY, language TEXT NOT NULL)")
+        fingerprint = f"{DETECTOR_VERSION}:{self.seed}"
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        if row is None or row[0] != fingerprint:
+            # Results from another detector version or seed are not reusable
+            self.conn.execute("DELETE FROM languages")
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (fingerprint,))
+        self.conn.commit()
+
+    def _remember(self, key, language):
+        self.memory[key] = language
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+
+    def _lookup_disk(self, keys):
+        found = {}
+        if self.conn is None:
+            return found
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT text_hash, language FROM languages WHERE text_hash IN ({placeholders})", chunk
+            ).fetchall()
+            found.update(rows)
+        return found
+
+    def _detect_uncached(self, texts):
+        """Run detection for texts missing from both cache tiers."""
+        if self.workers <= 1 or len(texts) <= self.chunk_size:
+            return [detect_language(text) for text in texts]
+
+        # langdetect reseeds per text, so chunk results do not depend on worker or order
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        print(f"Detecting {len(texts)} languages across {self.workers} processes ({len(chunks)} chunks)...")
+        results = []
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.seed,)) as pool:
+            for chunk_result in pool.map(_detect_chunk, chunks):
+                results.extend(chunk_result)
+        return results
+
+    def detect_many(self, texts):
+        """Detect languages for distinct normalized texts, consulting memory, then disk, then langdetect."""
+        keys = [text_key(text) for text in texts]
+        results = [None] * len(texts)
+
+        pending = []
+        for i, key in enumerate(keys):
+            language = self.memory.get(key)
+            if language is not None:
+                self.memory.move_to_end(key)
+                results[i] = language
+            else:
+                pending.append(i)
+
+        on_disk = self._lookup_disk([keys[i] for i in pending])
+        missing = []
+        for i in pending:
+            language = on_disk.get(keys[i])
+            if language is not None:
+                results[i] = language
+                self._remember(keys[i], language)
+            else:
+                missing.append(i)
+
+        detected = self._detect_uncached([texts[i] for i in missing])
+        for i, language in zip(missing, detected):
+            results[i] = language
+            self._remember(keys[i], language)
+        if self.conn is not None and missing:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO languages VALUES (?, ?)",
+                [(keys[i], results[i]) for i in missing]
+            )
+            self.conn.commit()
+
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        return results
+
+    def detect(self, text):
+        """Detect the language of a single review."""
+        if not text or pd.isna(text):
+            return 'unknown'
+        return self.detect_many([text.strip().lower()])[0]
+
+    def detect_series(self, reviews):
+        """Detect languages for a review column, running detection once per distinct normalized text."""
+        cleaned = reviews.fillna('').astype(str).str.strip().str.lower()
+        codes, uniques = pd.factorize(cleaned)
+        languages = np.asarray(self.detect_many(list(uniques)), dtype=object)
+        return pd.Series(languages[codes], index=reviews.index, name='language')
+
+    def close(self):
+        """Close the persistent cache."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,191 @@
+import json
+import random
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from google_play_scraper.constants.request import Formats
+
+REVIEWS_PATH = "/_/PlayStoreUi/data/batchexecute"
+NEWEST_TIMESTAMP = int(datetime(2025, 6, 30, tzinfo=timezone.utc).timestamp())
+
+_OPENERS = ["The app", "This application", "Mobile banking", "The new update", "Transfer", "Login"]
+_VERDICTS = ["works great", "is very slow", "keeps crashing", "is easy to use", "fails every time",
+             "needs a dark mode", "is the best", "asks for OTP twice"]
+_AMHARIC = ["በጣም ጥሩ ነው", "አይሰራም", "ችግር አለ", "አሪፍ መተግበሪያ", "ቀርፋፋ ነው"]
+
+
+def encode_review_page(items, token):
+    """Wrap review rows in the batchexecute envelope google-play-scraper parses."""
+    payload = [items, [None, token] if token else None, None]
+    envelope = [["wrb.fr", "oCPfdb", json.dumps(payload, ensure_ascii=False), None, None, None, "generic"]]
+    return ")]}'\n\n" + json.dumps(envelope, ensure_ascii=False)
+
+
+class SyntheticCorpus:
+    def __init__(self, size=1000000, seed=0):
+        """Deterministic, newest-first review stream per (app, language), generated on demand in O(1) memory."""
+        self.size = size
+        self.seed = seed
+
+    def review_row(self, app_id, lang, index):
+        """Build the raw review array at position index (0 is newest)."""
+        rng = random.Random(zlib.crc32(f"{self.seed}:{app_id}:{lang}:{index}".encode()))
+        if lang == 'am':
+            content = f"{rng.choice(_AMHARIC)} {index}"
+        else:
+            content = f"{rng.choice(_OPENERS)} {rng.choice(_VERDICTS)} #{index}"
+        timestamp = NEWEST_TIMESTAMP - index * 37
+        version = f"5.{rng.randint(0, 9)}"
+        return [
+            f"{app_id}-{lang}-{index}",
+            [f"user{rng.randint(1, 10 ** 6)}", [None, 2, None, [None, None, "https://example.invalid/a.png"]]],
+            rng.randint(1, 5),
+            None,
+            content,
+            [timestamp, 0],
+            rng.randint(0, 50),
+            None,
+            None,
+            None,
+            version,
+        ]
+
+    def page(self, app_id, lang, offset, count):
+        """Return (rows, next token) for one page starting at offset."""
+        end = min(offset + count, self.size)
+        rows = [self.review_row(app_id, lang, i) for i in range(offset, end)]
+        return rows, (str(end) if end < self.size else None)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length).decode('utf-8')
+        parts = urlsplit(self.path)
+        if parts.path != REVIEWS_PATH:
+            self._send(404, b'')
+            return
+
+        delay = server.latency + (server.rng.uniform(0, server.latency_jitter) if server.latency_jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        roll = server.rng.random()
+        if roll < server.error_rate:
+            server.record(error=True)
+            self._send(503, b'')
+            return
+        if roll < server.error_rate + server.gateway_error_rate:
+            server.record(error=True)
+            self._send(200, b")]}'\n\ncom.google.play.gateway.proto.PlayGatewayError")
+            return
+
+        request = json.loads(json.loads(parse_qs(body)['f.req'][0])[0][0][1])
+        page_spec, app_id = request[1][2], request[2][0]
+        count = min(int(page_spec[0]), server.max_page_size)
+        offset = int(page_spec[2]) if len(page_spec) > 2 and page_spec[2] else 0
+        lang = parse_qs(parts.query).get('hl', ['en'])[0]
+        if server.fail_first and offset == 0 and server.first_failure(app_id, lang):
+            self._send(503, b'')
+            return
+
+        rows, token = server.corpus.page(app_id, lang, offset, count)
+        server.record(reviews=len(rows))
+        self._send(200, encode_review_page(rows, token).encode('utf-8'))
+
+    def _send(self, status, data):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def record(self, reviews=0, error=False):
+        with self.stats_lock:
+            self.stats['requests'] += 1
+            self.stats['reviews'] += reviews
+            self.stats['errors'] += int(error)
+
+    def first_failure(self, app_id, lang):
+        """True the first time a stream's first page is requested (and records the error)."""
+        with self.stats_lock:
+            if (app_id, lang) in self.failed_streams:
+                return False
+            self.failed_streams.add((app_id, lang))
+        self.record(error=True)
+        return True
+
+
+class PlayStoreStub:
+    def __init__(self, corpus_size=1000000, latency=0.0, latency_jitter=0.0, error_rate=0.0,
+                 gateway_error_rate=0.0, max_page_size=200, seed=0, host='127.0.0.1', port=0, fail_first=False):
+        """Local stand-in for the Play Store reviews endpoint serving a synthetic paginated corpus.
+
+        fail_first answers the first request of every (app, language) stream with a 503, once, so
+        retries can be exercised deterministically.
+        """
+        self.server = _StubHTTPServer((host, port), _StubHandler)
+        self.server.corpus = SyntheticCorpus(corpus_size, seed)
+        self.server.latency = latency
+        self.server.latency_jitter = latency_jitter
+        self.server.error_rate = error_rate
+        self.server.gateway_error_rate = gateway_error_rate
+        self.server.max_page_size = max_page_size
+        self.server.rng = random.Random(seed)
+        self.server.stats = {'requests': 0, 'reviews': 0, 'errors': 0}
+        self.server.stats_lock = threading.Lock()
+        self.server.fail_first = fail_first
+        self.server.failed_streams = set()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self):
+        with self.server.stats_lock:
+            return dict(self.server.stats)
+
+    def start(self):
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @contextmanager
+    def redirect_google_play_scraper(self):
+        """Point google-play-scraper's reviews() at this stub for the duration of the block."""
+        previous = Formats.Reviews.URL_FORMAT
+        Formats.Reviews.URL_FORMAT = self.url + REVIEWS_PATH + "?hl={lang}&gl={country}"
+        try:
+            yield
+        finally:
+            Formats.Reviews.URL_FORMAT = previous
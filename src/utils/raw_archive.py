@@ -0,0 +1,117 @@
+import glob
+import gzip
+import json
+import os
+import zlib
+from datetime import datetime, timezone
+
+import pandas as pd
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class RawArchive:
+    def __init__(self, archive_dir='data/raw/archive', max_segment_bytes=64 * 1024 * 1024):
+        """Append-only archive of full reviews() payloads in gzip-compressed, rotated JSONL segments."""
+        self.archive_dir = archive_dir
+        self.max_segment_bytes = max_segment_bytes
+        self.run_id = None
+        self._segment_seq = 0
+        self._raw_file = None
+        self._gzip_file = None
+
+    # ------------------------
+    # Writing
+    # ------------------------
+
+    def _open_segment(self):
+        os.makedirs(self.archive_dir, exist_ok=True)
+        if self.run_id is None:
+            self.run_id = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+        path = os.path.join(self.archive_dir, f"{self.run_id}-{self._segment_seq:04d}.jsonl.gz")
+        self._segment_seq += 1
+        self._raw_file = open(path, 'xb')
+        self._gzip_file = gzip.GzipFile(fileobj=self._raw_file, mode='wb')
+        print(f"Opened raw archive segment {path}")
+
+    def _close_segment(self):
+        if self._gzip_file is not None:
+            self._gzip_file.close()
+            self._raw_file.close()
+            self._gzip_file = None
+            self._raw_file = None
+
+    def append(self, app_id, bank, lang, raw_reviews):
+        """Append raw review dicts from one reviews() call, rotating to a new segment when full."""
+        if not raw_reviews:
+            return 0
+        if self._gzip_file is None:
+            self._open_segment()
+
+        scraped_at = datetime.now(timezone.utc).isoformat()
+        for review in raw_reviews:
+            record = dict(review, app_id=app_id, bank=bank, lang=lang, scraped_at=scraped_at)
+            self._gzip_file.write((json.dumps(record, default=_json_default, ensure_ascii=False) + '\n').encode('utf-8'))
+
+        # tell() on the underlying file counts compressed bytes flushed so far
+        if self._raw_file.tell() >= self.max_segment_bytes:
+            self._close_segment()
+        return len(raw_reviews)
+
+    def close(self):
+        """Finish the current segment so it is a complete gzip file."""
+        self._close_segment()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------
+    # Reading
+    # ------------------------
+
+    def segments(self):
+        """Return segment paths oldest first."""
+        return sorted(glob.glob(os.path.join(self.archive_dir, '*.jsonl.gz')))
+
+    def iter_records(self):
+        """Stream every archived payload record in write order."""
+        for path in self.segments():
+            with gzip.open(path, 'rb') as f:
+                try:
+                    for line in f:
+                        yield json.loads(line)
+                except (EOFError, gzip.BadGzipFile, zlib.error, json.JSONDecodeError):
+                    # A segment cut short by a crash keeps every complete record before the damage
+                    print(f"Warning: segment {path} is truncated, skipping its tail.")
+
+    def replay(self, chunk_size=100000, include_metadata=False):
+        """Yield archived reviews as raw-schema DataFrames of up to chunk_size rows, without network access."""
+        rows = []
+        for record in self.iter_records():
+            content = record.get('content')
+            if not content or not content.strip():
+                continue
+            row = {
+                'review': content,
+                'rating': record['score'],
+                'date': (record.get('at') or '')[:10],
+                'bank': record['bank'],
+                'source': 'Google Play'
+            }
+            if include_metadata:
+                row['review_id'] = record.get('reviewId')
+                row['thumbs_up_count'] = record.get('thumbsUpCount')
+                row['app_version'] = record.get('appVersion')
+            rows.append(row)
+            if len(rows) >= chunk_size:
+                yield pd.DataFrame(rows)
+                rows = []
+        if rows:
+            yield pd.DataFrame(rows)
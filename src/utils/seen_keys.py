@@ -0,0 +1,64 @@
+import os
+import sqlite3
+import tempfile
+
+import numpy as np
+
+
+class SeenKeyStore:
+    def __init__(self, path=None, cache_mb=64):
+        """Exact, disk-backed set of 64-bit row keys for deduplicating across chunks.
+
+        With path=None the set lives in a temporary file removed on close().
+        """
+        self._temp_path = None
+        if path is None:
+            fd, path = tempfile.mkstemp(suffix='.sqlite', prefix='seen_keys_')
+            os.close(fd)
+            self._temp_path = path
+        else:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        # Negative cache_size is in KiB: this bounds the page cache, the rest stays on disk
+        self.conn.execute(f"PRAGMA cache_size = -{int(cache_mb * 1024)}")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS seen (key INTEGER PRIMARY KEY)")
+        self.conn.execute("CREATE TEMP TABLE batch (key INTEGER PRIMARY KEY)")
+        self.conn.commit()
+
+    def add_new(self, keys, commit=True):
+        """Record keys (unique within the call) and return a mask of those not seen before.
+
+        With commit=False the keys stay in an open transaction until commit(), and are discarded
+        if the store is closed first.
+        """
+        signed = np.ascontiguousarray(keys, dtype=np.uint64).view(np.int64)
+        if len(signed) == 0:
+            return np.zeros(0, dtype=bool)
+
+        self.conn.execute("DELETE FROM batch")
+        self.conn.executemany("INSERT INTO batch VALUES (?)", ((key,) for key in signed.tolist()))
+        existing = np.fromiter(
+            (row[0] for row in self.conn.execute("SELECT key FROM batch JOIN seen USING (key)")),
+            dtype=np.int64
+        )
+        self.conn.execute("INSERT OR IGNORE INTO seen SELECT key FROM batch")
+        if commit:
+            self.conn.commit()
+        return ~np.isin(signed, existing)
+
+    def commit(self):
+        """Make keys recorded with commit=False permanent."""
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self):
+        """Close the store, deleting it if it was temporary."""
+        self.conn.close()
+        if self._temp_path is not None:
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(self._temp_path + suffix):
+                    os.remove(self._temp_path + suffix)
@@ -0,0 +1,84 @@
+import hashlib
+import os
+import sqlite3
+
+
+def model_revision(model):
+    """Identify the exact weights of a transformers model.
+
+    Hub models report their commit hash; local directories are fingerprinted by file names, sizes and mtimes.
+    """
+    commit = getattr(model.config, '_commit_hash', None)
+    if commit:
+        return commit
+    path = getattr(model, 'name_or_path', '')
+    if path and os.path.isdir(path):
+        digest = hashlib.blake2b(digest_size=8)
+        for name in sorted(os.listdir(path)):
+            stat = os.stat(os.path.join(path, name))
+            digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns};".encode('utf-8'))
+        return f"local-{digest.hexdigest()}"
+    return 'unknown'
+
+
+class SentimentCache:
+    def __init__(self, cache_path='data/cache/sentiment_cache.sqlite'):
+        """Persistent sentiment scores keyed by (text hash, model name, model revision)."""
+        self.cache_path = cache_path
+        self.model = None
+        self.revision = None
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        # The scoring server uses the cache from its single scoring thread, not the creating thread
+        self.conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            "text_hash INTEGER NOT NULL, model TEXT NOT NULL, revision TEXT NOT NULL, score REAL NOT NULL, "
+            "PRIMARY KEY (text_hash, model, revision)) WITHOUT ROWID"
+        )
+        self.conn.commit()
+
+    def bind(self, model, revision):
+        """Select the model whose scores are read and written, dropping entries from its other revisions."""
+        self.model = model
+        self.revision = revision
+        deleted = self.conn.execute(
+            "DELETE FROM scores WHERE model = ? AND revision != ?", (model, revision)
+        ).rowcount
+        self.conn.commit()
+        if deleted:
+            print(f"Invalidated {deleted} cached sentiment scores from other revisions of {model}.")
+
+    def get_many(self, keys):
+        """Return {text_hash: score} for the keys cached under the bound model and revision."""
+        found = {}
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT text_hash, score FROM scores WHERE model = ? AND revision = ? "
+                f"AND text_hash IN ({placeholders})",
+                [self.model, self.revision, *chunk]
+            ).fetchall()
+            found.update(rows)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, keys, scores):
+        """Store scores for keys under the bound model and revision."""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?)",
+            ((key, self.model, self.revision, float(score)) for key, score in zip(keys, scores))
+        )
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def close(self):
+        """Close the persistent cache."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+from pandas.util import hash_array
+
+
+def item_hashes(items):
+    """Stable uint64 hash per string item."""
+    return hash_array(np.asarray(items, dtype=object), categorize=False)
+
+
+class CountMinSketch:
+    def __init__(self, width=2 ** 14, depth=4, seed=7, table=None):
+        """Count-Min sketch over string items: estimates never undercount and overcount by at most
+        e / width of the total with probability 1 - exp(-depth).
+
+        width must be a power of two. Sketches built with the same width, depth and seed merge by addition.
+        """
+        if width & (width - 1):
+            raise ValueError(f"width must be a power of two, got {width}")
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: odd multipliers, top log2(width) bits of the 64-bit product
+        self.multipliers = rng.integers(1, 2 ** 63, depth, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.increments = rng.integers(0, 2 ** 63, depth, dtype=np.uint64)
+        self.shift = np.uint64(64 - int(width).bit_length() + 1)
+        self.table = np.zeros((depth, width), dtype=np.int64) if table is None else table
+
+    def _columns(self, hashes):
+        return (hashes[None, :] * self.multipliers[:, None] + self.increments[:, None]) >> self.shift
+
+    def add(self, items, counts=None):
+        """Add counts (1 each by default) for items."""
+        hashes = item_hashes(items)
+        counts = np.ones(len(hashes), dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+        for row, columns in enumerate(self._columns(hashes)):
+            np.add.at(self.table[row], columns.astype(np.int64), counts)
+
+    def estimate(self, items):
+        """Upper-bound count per item."""
+        hashes = item_hashes(items)
+        if len(hashes) == 0:
+            return np.zeros(0, dtype=np.int64)
+        columns = self._columns(hashes).astype(np.int64)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    @property
+    def total(self):
+        return int(self.table[0].sum())
+
+    def compatible(self, other):
+        return (self.width, self.depth, self.seed) == (other.width, other.depth, other.seed)
+
+    def merge(self, other):
+        """Add another sketch's counts into this one."""
+        if not self.compatible(other):
+            raise ValueError("Count-Min sketches need the same width, depth and seed to merge")
+        self.table += other.table
+        return self
+
+
+class SpaceSaving:
+    def __init__(self, capacity=1000, counts=None, errors=None):
+        """Space-Saving top-k summary: at most capacity items, each with an overestimated count and
+        the maximum overestimate (error). Any item with a true count above total / capacity is kept.
+        """
+        self.capacity = capacity
+        self.counts = dict(counts or {})
+        self.errors = dict(errors or {})
+
+    @property
+    def floor(self):
+        """Upper bound on the count of any item not in the summary."""
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def _trim(self, counts, errors):
+        if len(counts) > self.capacity:
+            keep = pd.Series(counts).nlargest(self.capacity, keep='first').index
+            counts = {item: counts[item] for item in keep}
+            errors = {item: errors[item] for item in keep}
+        self.counts, self.errors = counts, errors
+
+    def merge(self, other):
+        """Combine two summaries; an item missing from one side is charged that side's floor."""
+        sides = [(self, self.floor), (other, other.floor)]
+        counts, errors = {}, {}
+        for item in self.counts.keys() | other.counts.keys():
+            counts[item] = errors[item] = 0
+            for summary, floor in sides:
+                if item in summary.counts:
+                    counts[item] += summary.counts[item]
+                    errors[item] += summary.errors[item]
+                else:
+                    counts[item] += floor
+                    errors[item] += floor
+        self._trim(counts, errors)
+        return self
+
+    def add_counts(self, items, counts):
+        """Fold exact counts for a batch of distinct items into the summary."""
+        batch = pd.Series(np.asarray(counts, dtype=np.int64), index=pd.Index(items, dtype=object))
+        # The batch's top counts are an exact Space-Saving summary: dropped items never exceed its floor
+        top = batch.nlargest(self.capacity, keep='first')
+        summary = SpaceSaving(self.capacity, {item: int(count) for item, count in top.items()},
+                              dict.fromkeys(top.index, 0))
+        return self.merge(summary)
+
+    def top(self, k):
+        """[(item, count, error)] for the k largest counts."""
+        items = sorted(self.counts.items(), key=lambda pair: (-pair[1], pair[0]))[:k]
+        return [(item, count, self.errors[item]) for item, count in items]
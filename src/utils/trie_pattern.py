@@ -0,0 +1,42 @@
+import re
+
+
+def _build_trie(terms):
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return trie
+
+
+def _node_pattern(node):
+    """Regex for the suffixes below a trie node; alternatives never share a first character."""
+    terminal = '' in node
+    alternatives, single_chars = [], []
+    for char in sorted(key for key in node if key):
+        suffix = _node_pattern(node[char])
+        if suffix:
+            alternatives.append(re.escape(char) + suffix)
+        else:
+            single_chars.append(re.escape(char))
+    if single_chars:
+        alternatives.append(single_chars[0] if len(single_chars) == 1 else '[' + ''.join(single_chars) + ']')
+    if not alternatives:
+        return ''
+    pattern = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+    # Greedy optional suffix: the longest term sharing this prefix wins
+    return f'(?:{pattern})?' if terminal else pattern
+
+
+def trie_pattern(terms):
+    """Regex source matching any of terms, factored as a prefix trie.
+
+    The regex engine walks the trie instead of trying every term at each position, so matching
+    cost grows with term length rather than lexicon size. Overlapping terms match leftmost-longest.
+    """
+    terms = [term for term in terms if term]
+    if not terms:
+        return '(?!)'
+    return _node_pattern(_build_trie(terms))
@@ -0,0 +1,97 @@
+import json
+import os
+from datetime import datetime
+
+
+class WatermarkStore:
+    def __init__(self, path='data/raw/scrape_state.json'):
+        """Persist per-(app, language) scrape watermarks, resume checkpoints and pending pages."""
+        self.path = path
+        self.pending_dir = os.path.join(os.path.dirname(path) or '.', 'pending')
+        self.state = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.path)  # Atomic, so a crash never leaves a half-written state file
+
+    @staticmethod
+    def _key(app_id, lang):
+        return f"{app_id}:{lang}"
+
+    def _pending_path(self, app_id, lang):
+        return os.path.join(self.pending_dir, f"{app_id}_{lang}.jsonl")
+
+    def get_watermark(self, app_id, lang):
+        """Return {'review_id', 'at'} of the newest committed review, or None."""
+        watermark = self.state.get(self._key(app_id, lang), {}).get('watermark')
+        if watermark is None:
+            return None
+        return {'review_id': watermark['review_id'], 'at': datetime.fromisoformat(watermark['at'])}
+
+    def get_checkpoint(self, app_id, lang):
+        """Return the in-progress checkpoint {'token', 'head', 'done', 'paused'} of an unfinished stream, or None."""
+        return self.state.get(self._key(app_id, lang), {}).get('checkpoint')
+
+    def checkpoint(self, app_id, lang, token, head, done, reviews, paused=False):
+        """Spool one page of new reviews and record where the next page starts.
+
+        done marks a stream read up to its watermark or last page; paused marks one stopped early
+        (e.g. at a review cap) whose spooled reviews are returned now but whose token is kept.
+        """
+        os.makedirs(self.pending_dir, exist_ok=True)
+        with open(self._pending_path(app_id, lang), 'a', encoding='utf-8') as f:
+            for review in reviews:
+                f.write(json.dumps({
+                    'reviewId': review['reviewId'],
+                    'content': review['content'],
+                    'score': review['score'],
+                    'at': review['at'].isoformat()
+                }, ensure_ascii=False) + '\n')
+
+        entry = self.state.setdefault(self._key(app_id, lang), {})
+        entry['checkpoint'] = {'token': token, 'head': head, 'done': done, 'paused': paused}
+        self._save()
+
+    def read_pending(self, app_id, lang):
+        """Return the reviews spooled for a stream since its last commit."""
+        path = self._pending_path(app_id, lang)
+        if not os.path.exists(path):
+            return []
+        pending = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                review = json.loads(line)
+                review['at'] = datetime.fromisoformat(review['at'])
+                pending.append(review)
+        return pending
+
+    def commit(self):
+        """Call once the reviews returned by a scrape are saved.
+
+        Done checkpoints become watermarks; paused ones keep their token and head for the next run.
+        Both drop their spooled pages. Interrupted or failed streams are left untouched.
+        """
+        for key, entry in self.state.items():
+            checkpoint = entry.get('checkpoint')
+            if not checkpoint or not (checkpoint['done'] or checkpoint.get('paused')):
+                continue
+            if checkpoint['done']:
+                if checkpoint['head'] is not None:
+                    entry['watermark'] = checkpoint['head']
+                del entry['checkpoint']
+            else:
+                checkpoint['paused'] = False
+            app_id, lang = key.rsplit(':', 1)
+            path = self._pending_path(app_id, lang)
+            if os.path.exists(path):
+                os.remove(path)
+        self._save()